@@ -0,0 +1,6 @@
+"""
+Benchmarks of open_oas on synthetic flask apps.
+
+    python -m benchmarks --routes 200 --output results.json
+    python -m benchmarks --compare results.json
+"""
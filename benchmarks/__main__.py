@@ -0,0 +1,134 @@
+import json
+import sys
+
+import click
+
+from .bench import DEFAULT_PARAMS, compare, run, run_build_scaling
+
+
+def _format_results(results: dict) -> str:
+    lines = [
+        "{0:<36} {1:>6} {2:>12} {3:>12} {4:>12} {5:>12}".format(
+            "benchmark", "n", "mean (ms)", "p50 (ms)", "p95 (ms)", "ops/s"
+        )
+    ]
+    for name, item in results.items():
+        lines.append(
+            "{0:<36} {1:>6} {2:>12.4f} {3:>12.4f} {4:>12.4f} {5:>12.1f}".format(
+                name,
+                item["n"],
+                item["mean"] * 1000,
+                item["p50"] * 1000,
+                item["p95"] * 1000,
+                item["ops_per_sec"] or 0,
+            )
+        )
+    return "\n".join(lines)
+
+
+def _format_comparison(rows: list) -> str:
+    lines = [
+        "{0:<36} {1:>14} {2:>14} {3:>8}".format(
+            "benchmark", "baseline (ms)", "current (ms)", "ratio"
+        )
+    ]
+    for row in rows:
+        lines.append(
+            "{0:<36} {1:>14.4f} {2:>14.4f} {3:>8.2f}{4}".format(
+                row["name"],
+                row["baseline"] * 1000,
+                row["current"] * 1000,
+                row["ratio"],
+                "  REGRESSION" if row["regression"] else "",
+            )
+        )
+    return "\n".join(lines)
+
+
+@click.command(help="Benchmark open_oas on a synthetic flask app.")
+@click.option("--routes", type=int, default=DEFAULT_PARAMS["routes"])
+@click.option(
+    "--methods",
+    default=",".join(DEFAULT_PARAMS["methods"]),
+    help="Comma separated methods of each route.",
+)
+@click.option("--schemas", type=int, default=DEFAULT_PARAMS["schemas"])
+@click.option(
+    "--depth",
+    type=int,
+    default=DEFAULT_PARAMS["depth"],
+    help="Nesting depth of the schemas.",
+)
+@click.option(
+    "--security-schemes", type=int, default=DEFAULT_PARAMS["security_schemes"]
+)
+@click.option(
+    "--validate-on-build",
+    is_flag=True,
+    default=DEFAULT_PARAMS["validate_on_build"],
+)
+@click.option(
+    "--build-repeat", type=int, default=DEFAULT_PARAMS["build_repeat"]
+)
+@click.option(
+    "--requests",
+    type=int,
+    default=DEFAULT_PARAMS["requests"],
+    help="Requests sent for each method.",
+)
+@click.option(
+    "--import-repeat",
+    type=int,
+    default=DEFAULT_PARAMS["import_repeat"],
+    help="New interpreters timing `import open_oas`.",
+)
+@click.option(
+    "--build-scaling",
+    default=None,
+    help="Comma separated numbers of build workers (e.g. 1,2,4,8): only "
+    "measure the build, with the schemas in components.schemas.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Write the results to this JSON file.",
+)
+@click.option(
+    "--compare",
+    "baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Compare with the results of a previous run, exit 1 on regression.",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.1,
+    help="Slowdown ratio above the baseline reported as a regression.",
+)
+def main(methods, build_scaling, output, baseline, threshold, **params):
+    params["methods"] = [
+        m.strip().lower() for m in methods.split(",") if m.strip()
+    ]
+    if build_scaling:
+        current = run_build_scaling(
+            [int(w) for w in build_scaling.split(",")], **params
+        )
+    else:
+        current = run(**params)
+    click.echo(_format_results(current["results"]))
+    if output:
+        with open(output, "w") as f:
+            json.dump(current, f, indent=2)
+    if baseline:
+        with open(baseline) as f:
+            rows = compare(json.load(f), current, threshold)
+        click.echo("")
+        click.echo(_format_comparison(rows))
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
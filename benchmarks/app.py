@@ -0,0 +1,164 @@
+"""
+Synthetic flask apps for the benchmarks.
+
+The schema classes are created at runtime and set as attributes of this
+module, so their `x-schema` qualnames can be imported back like the ones of
+a real app.
+"""
+from typing import Callable, Dict, List, Sequence, Tuple, Type
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from open_oas import OpenOas
+
+
+def _schema_class(name: str, nested: Type[Schema] = None) -> Type[Schema]:
+    attrs = {
+        "id": fields.Int(required=True),
+        "name": fields.Str(required=True),
+        "tags": fields.List(fields.Str()),
+        "score": fields.Float(),
+    }
+    if nested is not None:
+        attrs["child"] = fields.Nested(nested)
+    klass = type(name, (Schema,), attrs)
+    klass.__module__ = __name__
+    globals()[name] = klass
+    return klass
+
+
+def make_schemas(count: int, depth: int) -> List[Type[Schema]]:
+    """`count` schema classes, each nesting `depth` levels of schemas."""
+    schemas = []
+    for i in range(count):
+        nested = None
+        for level in range(depth, 0, -1):
+            nested = _schema_class(
+                "BenchSchema{0}Level{1}".format(i, level), nested
+            )
+        schemas.append(_schema_class("BenchSchema{0}".format(i), nested))
+    return schemas
+
+
+def make_payload(depth: int) -> dict:
+    payload = {"id": 1, "name": "name", "tags": ["a", "b"], "score": 1.5}
+    if depth:
+        payload["child"] = make_payload(depth - 1)
+    return payload
+
+
+def allow_all(scheme, info):
+    return True
+
+
+def make_oas_data(
+    routes: int,
+    methods: Sequence[str],
+    schemas: List[Type[Schema]],
+    security_schemes: int,
+    component_schemas: bool = False,
+) -> dict:
+    paths: Dict[str, dict] = {}
+    for i in range(routes):
+        schema = schemas[i % len(schemas)]
+        path_item = {}
+        for method in methods:
+            operation: dict = {
+                "responses": {
+                    "200": {
+                        "description": "",
+                        "content": {"application/json": {"schema": schema}},
+                    }
+                }
+            }
+            if method not in ["get", "delete", "head"]:
+                operation["requestBody"] = {
+                    "required": True,
+                    "content": {"application/json": {"schema": schema}},
+                }
+            path_item[method] = operation
+        paths["/items{0}/{{id}}".format(i)] = path_item
+
+    data: dict = {"paths": paths, "components": {}}
+    if component_schemas:
+        data["components"]["schemas"] = {
+            schema.__name__: schema for schema in schemas
+        }
+    if security_schemes:
+        data["components"]["securitySchemes"] = {
+            "Key{0}".format(k): {
+                "type": "apiKey",
+                "in": "header",
+                "name": "X-Key-{0}".format(k),
+            }
+            for k in range(security_schemes)
+        }
+        # any of the schemes authenticates a request
+        data["security"] = [
+            {"Key{0}".format(k): []} for k in range(security_schemes)
+        ]
+    return data
+
+
+def make_app(
+    oas_dir: str,
+    routes: int = 50,
+    methods: Sequence[str] = ("get", "post"),
+    schemas: int = 20,
+    depth: int = 2,
+    security_schemes: int = 1,
+    validate_on_build: bool = False,
+    metrics_handler: Callable = None,
+    component_schemas: bool = False,
+    build_workers: int = 1,
+    prebuilt: bool = False,
+) -> Tuple[Flask, OpenOas]:
+    """
+    A flask app of `routes` routes, each one serving `methods` with request
+    bodies and responses described by one of the `schemas` schema classes.
+    Requests are validated, authenticated and serialized by open_oas;
+    `metrics_handler` gets the timing of each of these stages.
+    With `component_schemas`, the schemas are declared in
+    `components.schemas` too, and converted by `build_workers` processes.
+    With `prebuilt`, the spec is loaded from a previous build in `oas_dir`.
+    """
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    payload = make_payload(depth)
+
+    def view(id):
+        return dict(payload, id=id)
+
+    for i in range(routes):
+        app.add_url_rule(
+            "/items{0}/<int:id>".format(i),
+            "items{0}".format(i),
+            view,
+            methods=[m.upper() for m in methods],
+        )
+
+    schema_classes = make_schemas(max(schemas, 1), depth)
+    open_oas = OpenOas(
+        app=app,
+        oas_data=make_oas_data(
+            routes,
+            methods,
+            schema_classes,
+            security_schemes,
+            component_schemas,
+        ),
+        config_data={
+            "OAS_ROOT_DIR": oas_dir,
+            "OAS_VALIDATE_ON_BUILD": validate_on_build,
+            "OAS_CACHE_ON_BUILD": False,
+            "OAS_VALIDATE_REQUESTS": True,
+            "OAS_SERIALIZE_RESPONSE": True,
+            "OAS_AUTHENTICATE_REQUESTS": bool(security_schemes),
+            "OAS_IS_AUTHENTICATED_HANDLER": allow_all,
+            "OAS_METRICS_HANDLER": metrics_handler,
+            "OAS_BUILD_WORKERS": build_workers,
+            "OAS_PREBUILT": prebuilt,
+        },
+    )
+    return app, open_oas
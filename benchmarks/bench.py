@@ -0,0 +1,248 @@
+import datetime
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence
+
+from importlib.metadata import PackageNotFoundError, version
+
+from open_oas._profile import BuildProfiler
+
+from .app import make_app, make_payload
+
+RESULTS_VERSION = 1
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PARAMS = {
+    "routes": 50,
+    "methods": ["get", "post"],
+    "schemas": 20,
+    "depth": 2,
+    "security_schemes": 1,
+    "validate_on_build": False,
+    "build_repeat": 3,
+    "requests": 200,
+    "import_repeat": 5,
+}
+
+
+def stats(samples: List[float]) -> dict:
+    """Summary of `samples` durations, in seconds."""
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    return {
+        "n": len(ordered),
+        "mean": mean,
+        "min": ordered[0],
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "ops_per_sec": 1 / mean if mean else None,
+    }
+
+
+def timed(func: Callable, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def import_times(code: str = "import open_oas", cwd: str = ROOT_DIR) -> dict:
+    """
+    Cumulative import time in seconds of each module imported by running
+    `code` in a new interpreter, from `python -X importtime`.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3:
+            continue
+        try:
+            times[parts[2].strip()] = int(parts[1]) / 1e6
+        except ValueError:
+            # the header
+            continue
+    return times
+
+
+def _environment() -> dict:
+    env = {"python": platform.python_version(), "cpus": os.cpu_count()}
+    for package in ["open_oas", "flask", "marshmallow", "apispec"]:
+        try:
+            env[package] = version(package)
+        except PackageNotFoundError:
+            env[package] = None
+    return env
+
+
+def run(**params) -> dict:
+    """
+    Build a synthetic app of `params` (see `DEFAULT_PARAMS`) and measure:
+
+    - import: `import open_oas` in a new interpreter
+    - build: `OpenOas.build()`
+    - spec_json: serving the spec json route
+    - request.<method>: a request through validation, authentication and
+      serialization, and request.<method>.<stage> for each of these stages.
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    results: Dict[str, dict] = {}
+    oas_dir = tempfile.mkdtemp(prefix="open_oas_bench_")
+    stage_samples: Dict[str, List[float]] = {}
+    results["import"] = stats(
+        [import_times()["open_oas"] for _ in range(params["import_repeat"])]
+    )
+
+    def on_stage(name, endpoint, seconds, outcome):
+        stage_samples.setdefault(name, []).append(seconds)
+
+    try:
+        app, open_oas = make_app(
+            oas_dir,
+            routes=params["routes"],
+            methods=params["methods"],
+            schemas=params["schemas"],
+            depth=params["depth"],
+            security_schemes=params["security_schemes"],
+            validate_on_build=params["validate_on_build"],
+            metrics_handler=on_stage,
+        )
+        with app.app_context():
+            results["build"] = stats(
+                timed(open_oas.build, params["build_repeat"])
+            )
+
+        client = app.test_client()
+        # the first request runs the before_first_request hooks
+        client.get("/items0/1")
+
+        results["spec_json"] = stats(
+            timed(lambda: client.get("/oas/oas-json"), 20)
+        )
+
+        payload = make_payload(params["depth"])
+        routes = params["routes"]
+        for method in params["methods"]:
+            stage_samples.clear()
+            urls = [
+                "/items{0}/{1}".format(i % routes, i)
+                for i in range(params["requests"])
+            ]
+            send = getattr(client, method)
+            kwargs = {}
+            if method not in ["get", "delete", "head"]:
+                kwargs["json"] = payload
+            samples = []
+            for url in urls:
+                started = time.perf_counter()
+                res = send(url, headers={"X-Key-0": "key"}, **kwargs)
+                samples.append(time.perf_counter() - started)
+                if res.status_code >= 400:
+                    raise RuntimeError(
+                        "{0} {1}: {2}".format(method, url, res.status)
+                    )
+            results["request.{0}".format(method)] = stats(samples)
+            for stage, values in stage_samples.items():
+                results["request.{0}.{1}".format(method, stage)] = stats(
+                    values
+                )
+    finally:
+        shutil.rmtree(oas_dir, ignore_errors=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": _environment(),
+        "params": params,
+        "results": results,
+    }
+
+
+def run_build_scaling(workers: Sequence[int] = (1, 2, 4, 8), **params) -> dict:
+    """
+    Build a synthetic app of `params` declaring its schemas in
+    `components.schemas`, converted by each number of `workers`, and
+    measure:
+
+    - build.workers<n>: `OpenOas.build()`
+    - build.workers<n>.components: its schema conversion phase
+    """
+    params = {**DEFAULT_PARAMS, **params, "build_workers": list(workers)}
+    results: Dict[str, dict] = {}
+    for count in workers:
+        oas_dir = tempfile.mkdtemp(prefix="open_oas_bench_")
+        try:
+            app, open_oas = make_app(
+                oas_dir,
+                routes=params["routes"],
+                methods=params["methods"],
+                schemas=params["schemas"],
+                depth=params["depth"],
+                security_schemes=params["security_schemes"],
+                validate_on_build=params["validate_on_build"],
+                component_schemas=True,
+                build_workers=count,
+            )
+            builds, components = [], []
+            with app.app_context():
+                for _ in range(params["build_repeat"]):
+                    with BuildProfiler(memory=False) as profiler:
+                        open_oas.build()
+                    builds.append(profiler.wall)
+                    components.extend(
+                        p["wall"]
+                        for p in profiler.phases
+                        if p["name"] == "load.builder.components"
+                    )
+        finally:
+            shutil.rmtree(oas_dir, ignore_errors=True)
+        name = "build.workers{0}".format(count)
+        results[name] = stats(builds)
+        results[name + ".components"] = stats(components)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": _environment(),
+        "params": params,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> List[dict]:
+    """
+    Compare the mean durations of two `run` results. A result more than
+    `threshold` slower than the baseline is a regression.
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_results.get(name)
+        if not base or not base.get("mean"):
+            continue
+        ratio = result["mean"] / base["mean"]
+        rows.append(
+            {
+                "name": name,
+                "baseline": base["mean"],
+                "current": result["mean"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
@@ -1,9 +1,10 @@
-from copy import deepcopy
 import os
 from .builder import OasBuilder
-from typing import Any, Dict, TYPE_CHECKING, cast
+from .builder.schema_cache import SchemaCache
+from typing import Any, Dict, List, TYPE_CHECKING, cast
 
 from ._parameters import get_app_paths
+from ._profile import phase
 from ._utils import load_file, merge_recursive
 
 if TYPE_CHECKING:
@@ -20,8 +21,7 @@ def __load_overrides(open_oas: "OpenOas") -> dict:
     files.sort()
     for f in files:
         p = os.path.join(dir, f)
-        with open(p, "r") as f:
-            data = cast(dict, merge_recursive([load_file(f), data]))
+        data = cast(dict, merge_recursive([load_file(p), data]))
 
     return data
 
@@ -36,7 +36,8 @@ def __load_data(
 
     # sections_data = load_file(config.sections_file)
     # components_data = load_file(config.components_file)
-    overrides = __load_overrides(open_oas)
+    with phase("overrides"):
+        overrides = __load_overrides(open_oas)
     # snippet_files_data = editor.load_snippet_files()
     #
     data = cast(
@@ -52,41 +53,60 @@ def __load_data(
             ]
         ),
     )  # type: ignore
-    builder = OasBuilder(
-        data,
-        allowed_methods=config.allowed_methods,
-    )
-    builder_data = builder.get_data()
-    builder_data = _parse_star_method(config, builder_data)
-    data = merge_recursive(
-        [
-            overrides,
-            builder_data,
-            # snippet_files_data,
-            # sections_data,
-        ]
-    )
-    data = _clean_invalid_paths(data)
+    schema_cache = None
+    if config.schema_cache:
+        schema_cache = SchemaCache(config.schema_cache_path)
+    with phase("builder"):
+        builder = OasBuilder(
+            data,
+            allowed_methods=config.allowed_methods,
+            deferred=open_oas.deferred,
+            workers=config.build_workers,
+            schema_cache=schema_cache,
+        )
+        if schema_cache is not None:
+            schema_cache.save()
+        # get_data returns a new tree, the passes below mutate it in place
+        with phase("get_data"):
+            data = builder.get_data()
+    app_paths = open_oas.routes.paths
+    with phase("star_methods"):
+        data = _parse_star_method(config, data, app_paths)
+    if overrides:
+        data = merge_recursive(
+            [
+                overrides,
+                data,
+                # snippet_files_data,
+                # sections_data,
+            ]
+        )
+    data = _clean_invalid_paths(data, app_paths)
     data = _clean_invalid_request_bodies(data)
 
     return data
 
 
-def _clean_invalid_paths(data):
-    app_paths_list = get_app_paths()
-    data_paths = deepcopy(data.get("paths", {}))
-    keys = data.get("paths", {}).keys()
-    for path in keys:
+def _clean_invalid_paths(data, app_paths_list: Dict[str, List[str]] = None):
+    if app_paths_list is None:
+        app_paths_list = get_app_paths()
+    data_paths = data.get("paths", {})
+    for path in list(data_paths.keys()):
         if path not in app_paths_list:
             del data_paths[path]
     data["paths"] = data_paths
     return data
 
 
-def _parse_star_method(config: "OasConfig", data: Dict[str, Dict]):
+def _parse_star_method(
+    config: "OasConfig",
+    data: Dict[str, Dict],
+    app_paths_list: Dict[str, List[str]] = None,
+):
     app_allowed_methods = config.allowed_methods
-    app_paths_list = get_app_paths()
-    data_paths = deepcopy(data.get("paths", {}))
+    if app_paths_list is None:
+        app_paths_list = get_app_paths()
+    data_paths = data.get("paths", {})
     for path in data_paths:
         path_value = data_paths[path]
         keys = path_value.keys()
@@ -100,7 +120,9 @@ def _parse_star_method(config: "OasConfig", data: Dict[str, Dict]):
             for method in allowed_methods:
                 if method in keys:
                     continue
-                data_paths[path][method] = data_paths[path]["*"]
+                # each method gets its own operation dict, so removing the
+                # requestBody of get/delete/head leaves the others intact
+                data_paths[path][method] = dict(data_paths[path]["*"])
             del data_paths[path]["*"]
     data["paths"] = data_paths
     return data
@@ -1,9 +1,20 @@
+import hashlib
 import json
 import os
-from typing import TYPE_CHECKING
-
-from flask import Blueprint, current_app, jsonify, render_template, url_for
-from ._utils import load_file, cache_file
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    jsonify,
+    render_template,
+    request,
+    url_for,
+)
+from ._assets import StaticAssets
+from ._utils import load_file, load_spec
 
 if TYPE_CHECKING:
     from .open_oas import OpenOas
@@ -26,6 +37,9 @@ class __ViewManager:
         self.__authorization_handler = authorization_handler
         self.__blueprint_name = blueprint_name or self.config.blueprint_name
         self.__url_prefix = url_prefix or self.config.blueprint_url_prefix
+        # loaded once, the ui page is then rendered once per script root
+        self.__ui_config: Optional[dict] = None
+        self.__ui_pages: Dict[str, Tuple[str, str]] = {}
 
         self.__register_callback()
         self.__register_spec_blueprint()
@@ -33,19 +47,13 @@ class __ViewManager:
 
     def __auto_build(self):
         try:
-            cached_final = cache_file(
-                self.config.final_file_path,
-                self.config.oas_dir_path,
-                self.config.cache_dir_path,
-            )
-
             self.open_oas.build()
-            if cached_final and os.path.exists(cached_final):
-                os.remove(cached_final)
         except Exception as e:
             current_app.logger.warning(e, e.__traceback__)
 
     def __register_callback(self):
+        if self.config.prebuilt:
+            return
         auto_build = (
             lambda res: self.__auto_build_flag
             if self.__auto_build_flag is not None
@@ -74,49 +82,115 @@ class __ViewManager:
                 endpoint=self.config.json_endpoint or "oas_json",
             )
 
+        if self.config.register_partial_route:
+            self.blueprint.add_url_rule(
+                self.config.partial_url,
+                view_func=self.get_partial_spec_json,
+                endpoint=self.config.partial_endpoint or "oas_partial",
+            )
+
         self.ui_config_path = self.config.ui_config_path
 
         if self.config.register_ui_route:
+            self.assets = StaticAssets(
+                os.path.join(os.path.dirname(__file__), "static"),
+                self.config.ui_assets_max_age,
+            )
             self.blueprint.add_url_rule(
                 self.config.ui_url,
                 view_func=self.get_spec_ui,
                 endpoint=self.config.ui_endpoint or "oas_ui",
             )
+            self.blueprint.add_url_rule(
+                "/assets/<path:name>",
+                view_func=self.assets.response,
+                endpoint="oas_assets",
+            )
+        if self.config.register_reload_route:
+            self.blueprint.add_url_rule(
+                self.config.reload_url,
+                view_func=self.reload_spec,
+                endpoint=self.config.reload_endpoint or "oas_reload",
+                methods=["POST"],
+            )
+        if self.config.register_metrics_route:
+            self.blueprint.add_url_rule(
+                self.config.metrics_url,
+                view_func=self.get_metrics,
+                endpoint=self.config.metrics_endpoint or "oas_metrics",
+            )
         self.app.register_blueprint(self.blueprint)
 
-    def get_ui_config(self):
-        return load_file(
-            self.config.ui_config_path
-            or url_for(
-                self.__blueprint_name + ".static", filename="ui_config.yaml"
+    def __authorize_operator(self):
+        # unlike the spec routes, these are never open to anyone
+        if not self.__authorization_handler:
+            abort(403)
+        self.__authorization_handler()
+
+    def reload_spec(self):
+        self.__authorize_operator()
+        return jsonify({"version": self.open_oas.reload()})
+
+    def get_metrics(self):
+        self.__authorize_operator()
+        return Response(
+            self.open_oas.metrics.render_prometheus(),
+            mimetype="text/plain; version=0.0.4",
+        )
+
+    def __load_ui_config(self) -> dict:
+        ui_config_path = self.config.ui_config_path
+        if not ui_config_path or not os.path.exists(ui_config_path):
+            ui_config_path = os.path.join(
+                os.path.dirname(__file__), "static", "ui_config.yaml"
             )
+        return load_file(ui_config_path)
+
+    def get_ui_config(self) -> dict:
+        # yaml is imported by the first ui page, not by the app startup
+        if self.__ui_config is None:
+            self.__ui_config = self.__load_ui_config()
+        return self.__ui_config
+
+    def asset_url(self, filename: str) -> str:
+        """Fingerprinted url of the ui asset `filename`."""
+        return url_for(
+            self.blueprint.name + ".oas_assets",
+            name=self.assets.hashed_name(filename),
         )
 
     def get_spec_dict(self):
         if not self.__built:
             self.open_oas.build()
             self.__built = True
+        if self.config.prebuilt:
+            data = self.open_oas.oas_data
+            if data:
+                return data
 
-        return load_file(self.config.final_file_path)
+        return load_spec(
+            self.config.final_file_path, self.config.final_artifact_path
+        )
 
     def get_spec_json(self):
         if self.__authorization_handler:
             self.__authorization_handler()
 
+        released = self.open_oas.spec.json
+        if self.config.prebuilt and self.__built and released is not None:
+            # the data was released, its json is served as is
+            return Response(released, mimetype="application/json")
         return jsonify(self.get_spec_dict())
 
-    def get_spec_ui(self):
-        ui_config_path = self.config.ui_config_path
-        if not ui_config_path or not os.path.exists(ui_config_path):
-            ui_config_path = os.path.join(
-                os.path.dirname(__file__), "static", "ui_config.yaml"
-            )
-        return render_template(
+    def __render_ui(self) -> Tuple[str, str]:
+        html = render_template(
             "swagger-ui.html",
             blueprint_name=self.blueprint.name,
+            asset_url=self.asset_url,
             json_url=url_for(
-                self.config.json_endpoint
-                or self.__blueprint_name + ".get_spec_json"
+                self.blueprint.name
+                + "."
+                + (self.config.json_endpoint or "oas_json")
             ),
             config_url=url_for(
                 self.__blueprint_name + ".static",
@@ -124,8 +198,35 @@ class __ViewManager:
                 # self.__blueprint_name + ".static",
                 # filename="ui_config.json",
             ),
-            config_data=json.dumps(load_file(ui_config_path)),
+            config_data=json.dumps(self.get_ui_config()),
+        )
+        return html, hashlib.sha256(html.encode()).hexdigest()[:16]
+
+    def get_partial_spec_json(self):
+        if self.__authorization_handler:
+            self.__authorization_handler()
+
+        tags = request.args.getlist("tag")
+        path_prefixes = request.args.getlist("path")
+        operation_ids = request.args.getlist("operationId")
+        if not (tags or path_prefixes or operation_ids):
+            abort(400, "Filter the oas by tag, path or operationId")
+        data, etag = self.open_oas.partials.json(
+            tags, path_prefixes, operation_ids
         )
+        res = Response(data, mimetype="application/json")
+        res.set_etag(etag)
+        return res.make_conditional(request)
+
+    def get_spec_ui(self):
+        page = self.__ui_pages.get(request.script_root)
+        if page is None:
+            page = self.__ui_pages[request.script_root] = self.__render_ui()
+        html, etag = page
+        res = Response(html, mimetype="text/html")
+        res.set_etag(etag)
+        res.cache_control.no_cache = True
+        return res.make_conditional(request)
 
 
 _OpenOas__ViewManager = __ViewManager
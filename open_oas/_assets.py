@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from flask import Response, abort, request
+
+# compressing these gains nothing
+_COMPRESSED_TYPES = ("image/", "font/")
+_MIN_COMPRESS_SIZE = 1024
+
+
+def _brotli():
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        return None
+    return brotli
+
+
+class StaticAssets:
+    """
+    The files of `directory` (the Swagger UI bundle), read once and served
+    from memory under fingerprinted names: `swagger-ui.css` is served as
+    `swagger-ui.<hash>.css` with an immutable cache lifetime of `max_age`,
+    and as `swagger-ui.css` (referenced by the source map comments) to be
+    revalidated by its ETag.
+
+    The gzip variant, and the brotli one if `brotli` is installed, of each
+    text file is created on its first request and kept.
+    """
+
+    def __init__(self, directory: str, max_age: int = 31536000) -> None:
+        self.directory = directory
+        self.max_age = max_age
+        self.names = frozenset(
+            name
+            for name in os.listdir(directory)
+            if os.path.isfile(os.path.join(directory, name))
+        )
+        # filename -> hash, (filename, encoding) -> bytes
+        self._hashes: Dict[str, str] = {}
+        self._variants: Dict[Tuple[str, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def __read(self, filename: str) -> bytes:
+        key = (filename, "identity")
+        data = self._variants.get(key)
+        if data is None:
+            with open(os.path.join(self.directory, filename), "rb") as f:
+                data = self._variants[key] = f.read()
+        return data
+
+    def fingerprint(self, filename: str) -> str:
+        hash_ = self._hashes.get(filename)
+        if hash_ is None:
+            hash_ = self._hashes[filename] = hashlib.sha256(
+                self.__read(filename)
+            ).hexdigest()[:12]
+        return hash_
+
+    def hashed_name(self, filename: str) -> str:
+        """`filename` with its fingerprint before the extension."""
+        stem, ext = os.path.splitext(filename)
+        return "{0}.{1}{2}".format(stem, self.fingerprint(filename), ext)
+
+    def resolve(self, name: str) -> Tuple[Optional[str], bool]:
+        """
+        (filename, hashed) of a requested `name`, the filename is None for
+        unknown files and outdated fingerprints.
+        """
+        if name in self.names:
+            return name, False
+        parts = name.rsplit(".", 2)
+        if len(parts) != 3:
+            return None, False
+        filename = "{0}.{1}".format(parts[0], parts[2])
+        if filename in self.names and self.fingerprint(filename) == parts[1]:
+            return filename, True
+        return None, False
+
+    def __compressible(self, filename: str, mimetype: str) -> bool:
+        return not mimetype.startswith(_COMPRESSED_TYPES) and (
+            len(self.__read(filename)) >= _MIN_COMPRESS_SIZE
+        )
+
+    def variant(self, filename: str, encoding: str) -> bytes:
+        key = (filename, encoding)
+        data = self._variants.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self._variants.get(key)
+            if data is None:
+                raw = self.__read(filename)
+                if encoding == "br":
+                    data = _brotli().compress(raw)
+                elif encoding == "gzip":
+                    data = gzip.compress(raw, compresslevel=9, mtime=0)
+                else:
+                    data = raw
+                self._variants[key] = data
+        return data
+
+    def encoding(self, filename: str, mimetype: str) -> str:
+        """The best encoding of `filename` accepted by the request."""
+        if not self.__compressible(filename, mimetype):
+            return "identity"
+        accepted = request.accept_encodings
+        if accepted["br"] and _brotli() is not None:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return "identity"
+
+    def response(self, name: str) -> Response:
+        filename, hashed = self.resolve(name)
+        if filename is None:
+            abort(404)
+        mimetype = (
+            mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        )
+        encoding = self.encoding(filename, mimetype)
+        res = Response(self.variant(filename, encoding), mimetype=mimetype)
+        if encoding != "identity":
+            res.headers["Content-Encoding"] = encoding
+        if self.__compressible(filename, mimetype):
+            res.vary.add("Accept-Encoding")
+        res.set_etag(
+            self.fingerprint(filename)
+            + ("" if encoding == "identity" else "-" + encoding)
+        )
+        if hashed:
+            res.cache_control.public = True
+            res.cache_control.max_age = self.max_age
+            res.cache_control.immutable = True
+        else:
+            res.cache_control.no_cache = True
+        return res.make_conditional(request)
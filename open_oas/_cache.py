@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+from ._utils import atomic_write, file_hash, file_lock
+
+
+class SnapshotStore:
+    """
+    Content addressed store for the snapshots of the oas files.
+
+    Each snapshot is saved once as `<sha256><ext>` in `cache_dir`, taking a
+    snapshot of unchanged content only refreshes its index entry.
+    `index.json` maps every hash to its source file and timestamps, so
+    lookups never list the directory.
+
+    Args:
+      cache_dir: directory of the snapshots and the index file.
+      max_entries: keep at most this number of snapshots, oldest are removed
+        first. None means no limit.
+      max_age: remove snapshots not taken again for this number of seconds.
+        None means no limit.
+    """
+
+    index_file_name = "index.json"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.index_path = os.path.join(cache_dir, self.index_file_name)
+        self.lock_path = os.path.join(cache_dir, ".lock")
+
+    def _load_index(self) -> Dict[str, dict]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as f:
+                return json.load(f).get("entries", {})
+        except ValueError:
+            return {}
+
+    def _save_index(self, entries: Dict[str, dict]):
+        with atomic_write(self.index_path) as f:
+            json.dump({"entries": entries}, f, indent=1, sort_keys=True)
+
+    def add(self, path: str, source: str = None) -> Optional[str]:
+        """
+        Take a snapshot of `path` and return the snapshot path.
+        """
+        hash_ = file_hash(path)
+        if not hash_:
+            return None
+        with file_lock(self.lock_path):
+            entries = self._load_index()
+            now = time.time()
+            entry = entries.get(hash_)
+            snapshot = os.path.join(
+                self.cache_dir, hash_ + os.path.splitext(path)[1]
+            )
+            if not entry or not os.path.exists(snapshot):
+                with atomic_write(snapshot, "wb") as f, open(path, "rb") as src:
+                    shutil.copyfileobj(src, f)
+                entry = {
+                    "file": os.path.basename(snapshot),
+                    "source": source or os.path.basename(path),
+                    "created": now,
+                }
+            entry["used"] = now
+            entries[hash_] = entry
+            self._prune(entries, now)
+            self._save_index(entries)
+        return snapshot
+
+    def get(self, hash_: str) -> Optional[str]:
+        entry = self._load_index().get(hash_)
+        if not entry:
+            return None
+        snapshot = os.path.join(self.cache_dir, entry["file"])
+        return snapshot if os.path.exists(snapshot) else None
+
+    def remove(self, hash_: str):
+        with file_lock(self.lock_path):
+            entries = self._load_index()
+            entry = entries.pop(hash_, None)
+            if entry:
+                self._remove_file(entry)
+                self._save_index(entries)
+
+    def prune(self):
+        with file_lock(self.lock_path):
+            entries = self._load_index()
+            self._prune(entries, time.time())
+            self._save_index(entries)
+
+    def _prune(self, entries: Dict[str, dict], now: float):
+        expired = []
+        if self.max_age is not None:
+            expired = [
+                k for k, v in entries.items() if now - v["used"] > self.max_age
+            ]
+        if self.max_entries is not None:
+            by_age = sorted(
+                (k for k in entries if k not in expired),
+                key=lambda k: entries[k]["used"],
+            )
+            expired += by_age[: max(len(by_age) - self.max_entries, 0)]
+        for k in expired:
+            self._remove_file(entries.pop(k))
+
+    def _remove_file(self, entry: dict):
+        try:
+            os.remove(os.path.join(self.cache_dir, entry["file"]))
+        except FileNotFoundError:
+            pass
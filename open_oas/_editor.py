@@ -1,14 +1,13 @@
 from copy import deepcopy
 from .oas_config import OasConfig
 import click
-from flask import current_app
 from ._parameters import (
+    RouteInventory,
     extract_path_parameters,
     preserve_user_edits,
 )
 import os
 from typing import Dict, List, cast
-from ._parameters import rule_to_path
 from ._constants import (
     EXTERNALDOCS_STUB,
     INFO_STUB,
@@ -25,6 +24,7 @@ from ._constants import (
     OPERATION_STUB_SHORT,
 )
 from werkzeug.routing import Rule
+from ._profile import phase
 from ._utils import (
     load_file,
     merge_recursive,
@@ -39,7 +39,11 @@ if TYPE_CHECKING:
 #
 
 
-def make_template_data(config: "OasConfig", app_paths: Dict[str, List[str]]):
+def make_template_data(
+    config: "OasConfig",
+    app_paths: Dict[str, List[str]],
+    routes: RouteInventory = None,
+):
     INFO_STUB["title"] = config.title
     INFO_STUB["version"] = config.version
     data = {
@@ -90,6 +94,7 @@ def make_template_data(config: "OasConfig", app_paths: Dict[str, List[str]]):
     parameters: dict = extract_path_parameters(
         allowed_methods=config.allowed_methods,
         long_stub=config.use_long_stubs,
+        routes=routes,
     )
     #
     template_data = cast(
@@ -106,15 +111,21 @@ class TemplatesEditor:
         self.open_oas = open_oas
         self.config = open_oas.config
         self.app_paths = self.open_oas._app_paths
+        self.routes = self.open_oas.routes
         self.template_data: dict = template_data
+        # the path templates before the fragments are merged in
+        self.__stub_paths: dict = template_data.get("paths", {})
         self.__mk_dirs_files()
         self.__update_all()
         self.echo(echo)
 
     def __update_all(self):
-        self.__sync_sections_file()
-        self.__sync_paths_details_file()
-        self.__sync_components_file()
+        with phase("sections"):
+            self.__sync_sections_file()
+        with phase("paths"):
+            self.__sync_paths_details_file()
+        with phase("components"):
+            self.__sync_components_file()
 
     def __mk_dirs_files(self):
         try:
@@ -190,19 +201,16 @@ class TemplatesEditor:
             dict, merge_recursive([data, self.template_data])
         )
 
-    def __sync_paths_details_file(self):
-        rules = current_app.url_map._rules
-        for rule in rules:
-            path = rule_to_path(rule)
+    def __sync_paths_details_file(self, routes=None):
+        # each path is merged on its own, the rest of the tree is shared
+        paths = dict(self.template_data.get("paths", {}))
+        for route in self.routes.routes if routes is None else routes:
+            rule, path = route.rule, route.path
 
             file_path = self.__locate_oas_file(rule)
             prev = load_file(file_path, {})
             user_edited_parameters = preserve_user_edits(
-                {
-                    "paths": {
-                        path: self.template_data.get("paths", {}).get(path, {})
-                    }
-                },
+                {"paths": {path: paths.get(path, {})}},
                 prev,
                 self.config.allowed_methods,
             )
@@ -210,13 +218,7 @@ class TemplatesEditor:
                 [
                     prev,
                     user_edited_parameters,
-                    {
-                        "paths": {
-                            path: self.template_data.get("paths", {}).get(
-                                path, {}
-                            )
-                        }
-                    },
+                    {"paths": {path: paths.get(path, {})}},
                 ]
             )
             try:
@@ -225,22 +227,37 @@ class TemplatesEditor:
                 pass
 
             yaml_dump("", path_data, file_path)
-            self.template_data = cast(
-                dict,
-                merge_recursive(
-                    [
-                        {
-                            "paths": {
-                                path: path_data,
-                            }
-                        },
-                        self.template_data,
-                    ]
-                ),
-            )
+            paths[path] = merge_recursive([path_data, paths.get(path)])
+        self.template_data = {**self.template_data, "paths": paths}
+
+    def refresh(self, changed_files) -> bool:
+        """
+        Sync again the paths whose fragment file is in `changed_files`,
+        the other paths are kept from the previous sync. Returns False if
+        the sections or components files changed, which needs a new editor.
+        """
+        changed = {os.path.abspath(f) for f in changed_files}
+        if {
+            os.path.abspath(self.config.sections_file_path),
+            os.path.abspath(self.config.components_file_path),
+        } & changed:
+            return False
+        routes = [
+            route
+            for route in self.routes.routes
+            if os.path.abspath(self.__locate_oas_file(route.rule)) in changed
+        ]
+        if routes:
+            # start over from the stubs of the changed paths
+            paths = dict(self.template_data.get("paths", {}))
+            for route in routes:
+                paths[route.path] = self.__stub_paths.get(route.path, {})
+            self.template_data = {**self.template_data, "paths": paths}
+            self.__sync_paths_details_file(routes)
+        return True
 
     def __locate_oas_file(self, rule: Rule) -> str:
-        path = rule_to_path(rule)
+        path = self.routes.path_of(rule)
         file_path = None
         if self.config.oas_files_locator:
             file_path = self.config.oas_files_locator(rule=rule, path=path)
@@ -252,9 +269,8 @@ class TemplatesEditor:
 
     def load_snippet_files(self):
         data = {}
-        rules = current_app.url_map._rules
-        for rule in rules:
+        for route in self.routes.routes:
             data = merge_recursive(
-                [data, load_file(self.__locate_oas_file(rule), {})]
+                [data, load_file(self.__locate_oas_file(route.rule), {})]
             )
         return data
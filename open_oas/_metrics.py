@@ -0,0 +1,182 @@
+import bisect
+from logging import warning
+import socket
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .plugin.utils import import_by_path
+
+if TYPE_CHECKING:
+    from .oas_config import OasConfig
+
+# seconds, the request stages usually take well under a millisecond
+BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        # one count per bucket, the last one is +Inf
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class StatsdClient:
+    """Fire and forget StatsD client over UDP, send errors are ignored."""
+
+    def __init__(self, address: str, prefix: str = "open_oas") -> None:
+        host, _, port = address.rpartition(":")
+        self.address = (host or "localhost", int(port or 8125))
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def send(self, line: str):
+        try:
+            self.socket.sendto(
+                "{0}.{1}".format(self.prefix, line).encode(), self.address
+            )
+        except OSError:
+            pass
+
+    def timing(self, name: str, seconds: float):
+        self.send("{0}:{1:.3f}|ms".format(name, seconds * 1000))
+
+    def incr(self, name: str):
+        self.send("{0}:1|c".format(name))
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+class Metrics:
+    """
+    Latency histograms and outcome counters of the request stages per
+    endpoint, and hit counters of the runtime caches.
+
+    Every observation is kept in memory (see `render_prometheus`) and passed
+    to the configured sinks: a `handler(name, endpoint, seconds, outcome)`
+    callable and a StatsD client.
+    """
+
+    def __init__(
+        self,
+        handler: Callable = None,
+        statsd: StatsdClient = None,
+        prefix: str = "open_oas",
+    ) -> None:
+        self.handler = handler
+        self.statsd = statsd
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self.outcomes: Dict[Tuple[str, str, str], int] = {}
+        self.caches: Dict[Tuple[str, bool], int] = {}
+
+    @classmethod
+    def from_config(cls, config: "OasConfig") -> Optional["Metrics"]:
+        """The metrics of `config`, None if no sink is enabled."""
+        handler = config.metrics_handler
+        if isinstance(handler, str):
+            handler = import_by_path(handler)
+        statsd = None
+        if config.metrics_statsd:
+            statsd = StatsdClient(config.metrics_statsd, config.metrics_prefix)
+        if not (handler or statsd or config.register_metrics_route):
+            return None
+        return cls(handler, statsd, config.metrics_prefix)
+
+    def observe(self, name: str, endpoint: str, seconds: float, outcome="ok"):
+        endpoint = endpoint or ""
+        with self._lock:
+            histogram = self.histograms.get((name, endpoint))
+            if histogram is None:
+                histogram = self.histograms[(name, endpoint)] = _Histogram()
+            histogram.observe(seconds)
+            key = (name, endpoint, outcome)
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+        if self.handler:
+            try:
+                self.handler(name, endpoint, seconds, outcome)
+            except Exception as e:
+                warning(e)
+        if self.statsd:
+            self.statsd.timing("{0}.{1}".format(name, endpoint), seconds)
+            if outcome != "ok":
+                self.statsd.incr("{0}.{1}.{2}".format(name, endpoint, outcome))
+
+    def cache(self, name: str, hit: bool):
+        key = (name, hit)
+        # a lost increment under contention is acceptable for hit rates
+        self.caches[key] = self.caches.get(key, 0) + 1
+
+    def hit_rate(self, name: str) -> Optional[float]:
+        hits = self.caches.get((name, True), 0)
+        total = hits + self.caches.get((name, False), 0)
+        return hits / total if total else None
+
+    def render_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        p = self.prefix
+        lines: List[str] = []
+        with self._lock:
+            histograms = dict(self.histograms)
+            outcomes = dict(self.outcomes)
+        caches = dict(self.caches)
+
+        lines.append("# TYPE {0}_stage_seconds histogram".format(p))
+        for (name, endpoint), h in sorted(histograms.items()):
+            labels = 'stage="{0}",endpoint="{1}"'.format(
+                _label(name), _label(endpoint)
+            )
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), h.counts):
+                cumulative += count
+                lines.append(
+                    '{0}_stage_seconds_bucket{{{1},le="{2}"}} {3}'.format(
+                        p, labels, bound, cumulative
+                    )
+                )
+            lines.append(
+                "{0}_stage_seconds_sum{{{1}}} {2}".format(p, labels, h.sum)
+            )
+            lines.append(
+                "{0}_stage_seconds_count{{{1}}} {2}".format(p, labels, h.count)
+            )
+
+        lines.append("# TYPE {0}_stage_total counter".format(p))
+        for (name, endpoint, outcome), count in sorted(outcomes.items()):
+            lines.append(
+                '{0}_stage_total{{stage="{1}",endpoint="{2}",outcome="{3}"}} {4}'.format(
+                    p, _label(name), _label(endpoint), outcome, count
+                )
+            )
+
+        lines.append("# TYPE {0}_cache_requests_total counter".format(p))
+        for (name, hit), count in sorted(caches.items()):
+            lines.append(
+                '{0}_cache_requests_total{{cache="{1}",result="{2}"}} {3}'.format(
+                    p, _label(name), "hit" if hit else "miss", count
+                )
+            )
+        return "\n".join(lines) + "\n"
@@ -1,7 +1,7 @@
 import re
 from flask import current_app
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 
 import werkzeug.routing
 from flask import current_app
@@ -35,13 +35,7 @@ def app_path_oas_path(app_path):
 
 #
 def get_app_paths() -> Dict[str, List[str]]:
-    rules: List[Rule] = current_app.url_map._rules
-    paths: Dict[str, List[str]] = {}
-    for r in rules:
-        path = rule_to_path(r)
-        methods: List[str] = __get_valid_methods(r)
-        paths[path] = methods
-    return paths
+    return RouteInventory(current_app.url_map._rules).paths
 
 
 DEFAULT_TYPE = ("string", None)
@@ -51,7 +45,7 @@ CONVERTER_MAPPING = {
     werkzeug.routing.FloatConverter: ("number", "float"),
 }
 #
-def __rule_to_params(rule, overrides=None, long_stub=False):
+def _rule_to_params(rule, overrides=None, long_stub=False):
     overrides = overrides or {}
     result = [
         __argument_to_param(
@@ -165,7 +159,7 @@ def preserve_user_edits(
     return res
 
 
-def __get_valid_methods(rule: Rule, version=3):
+def _get_valid_methods(rule: Rule, version=3):
     excluded_methods = {"head"}
     _mthds: set = rule.methods
     methods: List[str] = []
@@ -180,18 +174,72 @@ def extract_path_parameters(
     # document_options=False,
     long_stub=False,
     allowed_methods=VALID_METHODS_OPENAPI_V3,
+    routes: "RouteInventory" = None,
 ):
     data = {}
-    rules: List[Rule] = current_app.url_map._rules
+    if routes is None:
+        routes = RouteInventory(current_app.url_map._rules)
 
-    for r in rules:
-        path = rule_to_path(r)
-        params = __rule_to_params(r, long_stub=long_stub) or []
-        methods = __get_valid_methods(r)
-        for method in methods:
-            if method.lower() not in allowed_methods:
-                continue
-        data.setdefault("paths", {}).setdefault(path, {}).setdefault(
-            "parameters", params
+    for route in routes.routes:
+        data.setdefault("paths", {}).setdefault(route.path, {}).setdefault(
+            "parameters", route.parameters(long_stub)
         )
     return data
+
+
+class Route:
+    """A url rule with its oas path, methods and path parameters."""
+
+    def __init__(self, rule: Rule) -> None:
+        self.rule = rule
+        self.path = rule_to_path(rule)
+        self.methods: List[str] = _get_valid_methods(rule)
+        self.converters = rule._converters
+        self._parameters: Dict[bool, List[dict]] = {}
+
+    def parameters(self, long_stub=False) -> List[dict]:
+        """Path parameter stubs of the rule, a new list on each call."""
+        if long_stub not in self._parameters:
+            self._parameters[long_stub] = (
+                _rule_to_params(self.rule, long_stub=long_stub) or []
+            )
+        return [
+            {**p, "schema": dict(p["schema"])}
+            for p in self._parameters[long_stub]
+        ]
+
+
+class RouteInventory:
+    """
+    The routes of a flask app, collected once per build and shared by the
+    build stages and the runtime consumers.
+
+    `paths` maps each oas path to its methods, like `get_app_paths`.
+    `path_of` maps a url rule, e.g. `request.url_rule`, to its oas path by
+    identity; rules added after the inventory was built are added on the fly.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = ()) -> None:
+        self.routes: List[Route] = []
+        self.paths: Dict[str, List[str]] = {}
+        # werkzeug rules are not hashable, they are indexed by id. The rules
+        # stay referenced by `routes`, so ids are never reused.
+        self._by_rule: Dict[int, Route] = {}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: Rule) -> Route:
+        route = Route(rule)
+        self.routes.append(route)
+        self._by_rule[id(rule)] = route
+        self.paths[route.path] = route.methods
+        return route
+
+    def route(self, rule: Rule) -> Route:
+        route: Optional[Route] = self._by_rule.get(id(rule))
+        if route is None:
+            route = self.add(rule)
+        return route
+
+    def path_of(self, rule: Rule) -> str:
+        return self.route(rule).path
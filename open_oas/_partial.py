@@ -0,0 +1,82 @@
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from ._refs import RefGraph
+
+if TYPE_CHECKING:
+    from .open_oas import OpenOas
+
+# (tags, path prefixes, operation ids), each sorted
+FilterKey = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]
+
+
+class PartialSpecs:
+    """
+    Sub-documents of the current spec holding only the operations of some
+    tags, path prefixes or operationIds, and the components they refer to.
+
+    `compile` builds the `RefGraph` of the spec after a build or a load,
+    before the data can be released. Each sub-document is serialized once
+    per filter, the `max_entries` last used ones are kept. Everything is
+    dropped when the spec is swapped.
+    """
+
+    def __init__(self, open_oas: "OpenOas", max_entries: int = 128) -> None:
+        self.open_oas = open_oas
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.clear()
+        open_oas.spec.on_swap(self.clear)
+
+    def clear(self, previous: Optional[dict] = None):
+        self.graph: Optional[RefGraph] = None
+        # filter key -> (json, etag)
+        self._documents: "OrderedDict[FilterKey, Tuple[bytes, str]]" = (
+            OrderedDict()
+        )
+
+    def compile(self):
+        self.graph = RefGraph(self.open_oas.spec.document())
+
+    @staticmethod
+    def key(
+        tags: Iterable[str] = (),
+        path_prefixes: Iterable[str] = (),
+        operation_ids: Iterable[str] = (),
+    ) -> FilterKey:
+        return (
+            tuple(sorted(set(tags))),
+            tuple(sorted(set(path_prefixes))),
+            tuple(sorted(set(operation_ids))),
+        )
+
+    def json(
+        self,
+        tags: Iterable[str] = (),
+        path_prefixes: Iterable[str] = (),
+        operation_ids: Iterable[str] = (),
+    ) -> Tuple[bytes, str]:
+        """(json, etag) of the sub-document matching the filters."""
+        key = self.key(tags, path_prefixes, operation_ids)
+        with self._lock:
+            cached = self._documents.get(key)
+            if cached is not None:
+                self._documents.move_to_end(key)
+                return cached
+        version = self.open_oas.spec.version
+        if self.graph is None:
+            self.compile()
+        graph = self.graph
+        doc = graph.partial(self.open_oas.spec.document(), graph.select(*key))
+        data = json.dumps(doc, separators=(",", ":")).encode("utf-8")
+        cached = (data, hashlib.sha256(data).hexdigest()[:16])
+        with self._lock:
+            # not cached if the spec was swapped meanwhile
+            if version == self.open_oas.spec.version:
+                self._documents[key] = cached
+                while len(self._documents) > self.max_entries:
+                    self._documents.popitem(last=False)
+        return cached
@@ -0,0 +1,179 @@
+from contextlib import contextmanager, nullcontext
+import json
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+_active: Optional["BuildProfiler"] = None
+# python < 3.9 can't reset the peak, phases then report the peak since the
+# profile started
+_reset_peak = getattr(tracemalloc, "reset_peak", None)
+
+
+class _Frame:
+    def __init__(self, name: str, base: int) -> None:
+        self.name = name
+        self.base = base
+        # highest traced memory seen by this phase and its sub phases
+        self.peak = base
+
+
+class BuildProfiler:
+    """
+    Profile of an `OpenOas.build()`: wall time, CPU time and peak traced
+    memory of each build phase, and the cost of each schema and path.
+
+    >>> with BuildProfiler() as profiler:
+    ...     open_oas.build()
+    >>> print(profiler.format())
+
+    While a profiler is active, the `phase` and `record` functions of this
+    module feed it; otherwise they do nothing.
+    """
+
+    def __init__(self, memory=True, top=10) -> None:
+        self.memory = memory
+        self.top = top
+        self.phases: List[dict] = []
+        self.costs: Dict[str, Dict[str, float]] = {}
+        self._stack: List[_Frame] = []
+        self._started_tracing = False
+        self._started = 0.0
+        self._cpu_started = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = 0
+
+    def __enter__(self) -> "BuildProfiler":
+        global _active
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active = self
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._stack.append(_Frame("", self.__traced()))
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        self.wall = time.perf_counter() - self._started
+        self.cpu = time.process_time() - self._cpu_started
+        frame = self._stack.pop()
+        if self.memory:
+            self.peak = self.__close(frame)
+            if self._started_tracing:
+                tracemalloc.stop()
+        _active = None
+        return False
+
+    def __traced(self) -> int:
+        """Current traced memory, and restart the peak tracking from it."""
+        if not self.memory:
+            return 0
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, peak)
+        if _reset_peak:
+            _reset_peak()
+        return current
+
+    def __close(self, frame: _Frame) -> int:
+        """Peak of the closed `frame` above its base, passed to its parent."""
+        absolute = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, absolute)
+        return absolute - frame.base
+
+    @contextmanager
+    def phase(self, name: str):
+        name = "{0}.{1}".format(self._stack[-1].name, name).lstrip(".")
+        frame = _Frame(name, self.__traced())
+        self._stack.append(frame)
+        record = {"name": name}
+        self.phases.append(record)
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            record["wall"] = time.perf_counter() - started
+            record["cpu"] = time.process_time() - cpu_started
+            self._stack.pop()
+            if self.memory:
+                record["peak"] = self.__close(frame)
+
+    def record(self, kind: str, name: str, seconds: float):
+        costs = self.costs.setdefault(kind, {})
+        costs[name] = costs.get(name, 0.0) + seconds
+
+    def report(self) -> dict:
+        return {
+            "wall": self.wall,
+            "cpu": self.cpu,
+            "peak": self.peak if self.memory else None,
+            # in the order the phases started
+            "phases": self.phases,
+            "top": {
+                kind: [
+                    {"name": name, "wall": seconds}
+                    for name, seconds in sorted(
+                        costs.items(), key=lambda i: i[1], reverse=True
+                    )[: self.top]
+                ]
+                for kind, costs in self.costs.items()
+            },
+        }
+
+    def dump(self, file: str):
+        with open(file, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def format(self) -> str:
+        report = self.report()
+        lines = [
+            "{0:<32} {1:>10} {2:>10} {3:>12}".format(
+                "phase", "wall (s)", "cpu (s)", "peak (KiB)"
+            )
+        ]
+
+        def row(name, item):
+            peak = item.get("peak")
+            return "{0:<32} {1:>10.4f} {2:>10.4f} {3:>12}".format(
+                name,
+                item["wall"],
+                item["cpu"],
+                "-" if peak is None else "{0:.1f}".format(peak / 1024),
+            )
+
+        for p in report["phases"]:
+            indent = "  " * p["name"].count(".")
+            lines.append(row(indent + p["name"].split(".")[-1], p))
+        lines.append(row("total", report))
+        for kind, items in report["top"].items():
+            lines.append("")
+            lines.append("top {0}:".format(kind))
+            for item in items:
+                lines.append(
+                    "  {0:<60} {1:>10.4f}".format(item["name"], item["wall"])
+                )
+        return "\n".join(lines)
+
+
+def phase(name: str):
+    """Profile the block as a phase of the active build profile."""
+    if _active is None:
+        return nullcontext()
+    return _active.phase(name)
+
+
+def is_active() -> bool:
+    return _active is not None
+
+
+def record(kind: str, name: str, seconds: float):
+    """Add `seconds` to the cost of `name` among `kind` (schemas, paths)."""
+    if _active is not None:
+        _active.record(kind, name, seconds)
@@ -0,0 +1,286 @@
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ._parameters import VALID_METHODS_OPENAPI_V3
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _escape(token: str) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def path_pointer(*tokens) -> str:
+    return "#/" + "/".join(_escape(t) for t in tokens)
+
+
+class RefIndex:
+    """
+    Index of the `$ref` targets of an oas document.
+
+    The document is walked once, every local `$ref` found is mapped to the node
+    it finally points to (chained refs are followed). Remote refs and refs
+    that can't be resolved map to None.
+
+    `deref` returns fully dereferenced views, memoized per JSON pointer so the
+    consumers resolve each operation only once per spec.
+    """
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self.refs: Dict[str, Any] = {}
+        self._views: Dict[str, Any] = {}
+        self.__index(data)
+
+    def __index(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                ref = node.get("$ref")
+                if isinstance(ref, str) and ref not in self.refs:
+                    self.refs[ref] = self.__follow(ref)
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+
+    def pointer(self, pointer: str) -> Any:
+        """Return the node at `pointer` without following refs."""
+        if not pointer.startswith("#"):
+            return None
+        node: Any = self.data
+        for token in pointer[1:].split("/")[1:]:
+            token = _unescape(token)
+            if isinstance(node, dict):
+                node = node.get(token)
+            elif isinstance(node, list) and token.isdigit():
+                node = node[int(token)] if int(token) < len(node) else None
+            else:
+                return None
+            if node is None:
+                return None
+        return node
+
+    def __follow(self, ref: str) -> Any:
+        seen = set()
+        node = None
+        while isinstance(ref, str):
+            if ref in seen:
+                return None
+            seen.add(ref)
+            node = self.pointer(ref)
+            ref = node.get("$ref") if isinstance(node, dict) else None
+        return node
+
+    def resolve(self, obj: Any) -> Any:
+        """Return `obj`, or the node its `$ref` points to."""
+        if not isinstance(obj, dict):
+            return obj
+        ref = obj.get("$ref")
+        if not isinstance(ref, str):
+            return obj
+        if ref not in self.refs:
+            self.refs[ref] = self.__follow(ref)
+        return self.refs[ref]
+
+    def deref(self, pointer: str) -> Any:
+        """
+        Return a copy of the node at `pointer` with every nested `$ref`
+        replaced by its target. Recursive refs are kept as `$ref`.
+        """
+        if pointer not in self._views:
+            self._views[pointer] = self.__deref(self.pointer(pointer), ())
+        return self._views[pointer]
+
+    def __deref(self, node: Any, stack: Tuple[str, ...]) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                if ref in stack:
+                    return node
+                return self.__deref(self.resolve(node), stack + (ref,))
+            return {k: self.__deref(v, stack) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self.__deref(v, stack) for v in node]
+        return node
+
+    def operation(self, path: str, method: str) -> Optional[dict]:
+        """Fully dereferenced operation object of `path` and `method`."""
+        return self.deref(path_pointer("paths", path, method.lower()))
+
+
+def component_pointer(ref: str) -> Optional[str]:
+    """Pointer of the component `ref` points into, None for other refs."""
+    tokens = ref[2:].split("/") if ref.startswith("#/") else []
+    if len(tokens) < 3 or tokens[0] != "components":
+        return None
+    return "#/" + "/".join(tokens[:3])
+
+
+def _component_refs(node) -> Set[str]:
+    refs = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                pointer = component_pointer(ref)
+                if pointer:
+                    refs.add(pointer)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return refs
+
+
+class GraphOperation:
+    __slots__ = ("path", "method", "tags", "operation_id", "refs")
+
+    def __init__(
+        self,
+        path: str,
+        method: str,
+        tags: Tuple[str, ...],
+        operation_id: Optional[str],
+        refs: FrozenSet[str],
+    ) -> None:
+        self.path = path
+        self.method = method
+        self.tags = tags
+        self.operation_id = operation_id
+        self.refs = refs
+
+
+class RefGraph:
+    """
+    The components each operation of an oas document refers to, and the
+    components each component refers to, as pointers
+    (`#/components/schemas/Pet`). Security schemes are referred to by the
+    security requirements of the operations, or of the document.
+
+    Only the pointers, tags and operationIds are kept, not the document.
+    """
+
+    def __init__(self, data: dict) -> None:
+        self.operations: List[GraphOperation] = []
+        self.edges: Dict[str, FrozenSet[str]] = {}
+        for type_, items in data.get("components", {}).items():
+            if not isinstance(items, dict):
+                continue
+            for name, item in items.items():
+                pointer = path_pointer("components", type_, name)
+                self.edges[pointer] = frozenset(_component_refs(item))
+        root_schemes = self.__scheme_refs(data.get("security", []))
+        self.root_refs = frozenset(root_schemes)
+        for path, path_item in data.get("paths", {}).items():
+            if not isinstance(path_item, dict):
+                continue
+            path_refs = _component_refs(path_item.get("parameters", []))
+            for method, operation in path_item.items():
+                if method not in VALID_METHODS_OPENAPI_V3 or not isinstance(
+                    operation, dict
+                ):
+                    continue
+                security = operation.get("security")
+                refs = _component_refs(operation) | path_refs
+                if security is not None:
+                    refs |= self.__scheme_refs(security)
+                self.operations.append(
+                    GraphOperation(
+                        path,
+                        method,
+                        tuple(operation.get("tags", [])),
+                        operation.get("operationId"),
+                        frozenset(refs),
+                    )
+                )
+
+    @staticmethod
+    def __scheme_refs(security: list) -> Set[str]:
+        return {
+            path_pointer("components", "securitySchemes", name)
+            for requirement in security
+            if isinstance(requirement, dict)
+            for name in requirement
+        }
+
+    def select(
+        self,
+        tags: Iterable[str] = (),
+        path_prefixes: Iterable[str] = (),
+        operation_ids: Iterable[str] = (),
+    ) -> List[GraphOperation]:
+        """
+        The operations with one of `tags`, under one of `path_prefixes` and
+        with one of `operation_ids`; an empty filter matches every operation.
+        """
+        tags = set(tags)
+        prefixes = [p.rstrip("/") for p in path_prefixes]
+        operation_ids = set(operation_ids)
+        return [
+            op
+            for op in self.operations
+            if (not tags or tags.intersection(op.tags))
+            and (
+                not prefixes
+                or any(
+                    op.path == p or op.path.startswith(p + "/")
+                    for p in prefixes
+                )
+            )
+            and (not operation_ids or op.operation_id in operation_ids)
+        ]
+
+    def closure(self, refs: Iterable[str]) -> Set[str]:
+        """`refs` and every component they refer to, transitively."""
+        found: Set[str] = set()
+        stack = list(refs)
+        while stack:
+            pointer = stack.pop()
+            if pointer in found:
+                continue
+            found.add(pointer)
+            stack.extend(self.edges.get(pointer, ()))
+        return found
+
+    def partial(self, data: dict, operations: List[GraphOperation]) -> dict:
+        """
+        The sub-document of `data` with `operations`, the components they
+        refer to and the tags they use.
+        """
+        doc = {
+            k: v
+            for k, v in data.items()
+            if k not in ["paths", "components", "tags"]
+        }
+        paths: Dict[str, dict] = {}
+        refs = set(self.root_refs)
+        tags = set()
+        for op in operations:
+            path_item = data.get("paths", {}).get(op.path)
+            if not path_item or op.method not in path_item:
+                # not in this version of the document
+                continue
+            if op.path not in paths:
+                paths[op.path] = {
+                    k: v
+                    for k, v in path_item.items()
+                    if k not in VALID_METHODS_OPENAPI_V3
+                }
+            paths[op.path][op.method] = path_item[op.method]
+            refs |= op.refs
+            tags.update(op.tags)
+        doc["paths"] = paths
+        if "tags" in data:
+            doc["tags"] = [t for t in data["tags"] if t.get("name") in tags]
+        components: Dict[str, dict] = {}
+        for pointer in sorted(self.closure(refs)):
+            _, type_, name = [_unescape(t) for t in pointer[2:].split("/")]
+            item = data.get("components", {}).get(type_, {}).get(name)
+            if item is not None:
+                components.setdefault(type_, {})[name] = item
+        if components:
+            doc["components"] = components
+        return doc
@@ -0,0 +1,68 @@
+import json
+import threading
+from typing import Callable, List, Optional
+
+from ._refs import RefIndex
+
+
+class SpecHolder:
+    """
+    Holds the current oas data of an `OpenOas` object.
+
+    `swap` replaces the data in one assignment and bumps `version`, then calls
+    the listeners registered by `on_swap` with the previous data, so they drop
+    whatever they compiled or cached from it. Readers holding the old dict keep a
+    consistent view of it until they read `data` again.
+
+    `release` drops the data once it's compiled for the consumers and keeps
+    only its serialized json; `document` parses it back when asked for.
+
+    `ref_index` is the `RefIndex` of the current data, dropped with it.
+    """
+
+    def __init__(self, data: dict = None) -> None:
+        self.data: dict = data or {}
+        self.version = 0
+        self.json: Optional[bytes] = None
+        self._index: Optional[RefIndex] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[dict], None]] = []
+
+    def on_swap(self, listener: Callable[[dict], None]):
+        self._listeners.append(listener)
+        return listener
+
+    def swap(self, data: dict) -> int:
+        with self._lock:
+            previous = self.data
+            self.data = data
+            self.json = None
+            self._index = None
+            self.version += 1
+            for listener in self._listeners:
+                listener(previous)
+            return self.version
+
+    def release(self) -> Optional[bytes]:
+        """Replace the data by its serialized json, without notifying."""
+        with self._lock:
+            if self.data:
+                self.json = json.dumps(
+                    self.data, separators=(",", ":")
+                ).encode("utf-8")
+                self.data = {}
+                self._index = None
+            return self.json
+
+    def ref_index(self) -> RefIndex:
+        """The `RefIndex` of the current data, created on first use."""
+        index = self._index
+        if index is None or index.data is not self.data:
+            index = self._index = RefIndex(self.data)
+        return index
+
+    def document(self) -> dict:
+        """The current data, parsed from its json if it was released."""
+        if not self.data and self.json is not None:
+            return json.loads(self.json)
+        return self.data
@@ -1,11 +1,20 @@
+from contextlib import contextmanager
 from copy import deepcopy
+import gc
+import hashlib
+import json
 import os
+import tempfile
+import threading
 from typing import Dict, List
 import functools
-import yaml
-from apispec.yaml_utils import dict_to_yaml
 import ntpath
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - windows
+    fcntl = None
+
 
 def merge_recursive(values):
     return functools.reduce(_merge_recursive, values, {})
@@ -30,7 +39,7 @@ def _merge_recursive(child, parent):
             for key in keys
         }
     elif isinstance(child, list) and isinstance(parent, list):
-        merged = parent
+        merged = list(parent)
         for item in child:
             if item not in merged:
                 merged.append(item)
@@ -65,6 +74,8 @@ def clean_parameters_list(params: List[Dict]) -> List[Dict]:
 def load_file(path, default={}):
     data = default
     if os.path.exists(path):
+        import yaml
+
         with open(path) as f:
             data = yaml.safe_load(f) or default
     if not data:
@@ -72,32 +83,165 @@ def load_file(path, default={}):
     return data
 
 
+_locks = threading.local()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive advisory lock on `path` for the duration of the block.
+    The lock is reentrant for the current thread, so a locked build can call
+    other locked steps.
+    On platforms without `fcntl` the block runs unlocked.
+    """
+    held = getattr(_locks, "held", None)
+    if held is None:
+        held = _locks.held = {}
+    key = os.path.abspath(path)
+    if key in held:
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    os.makedirs(os.path.dirname(key), exist_ok=True)
+    with open(key, "a") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            del held[key]
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read_umask():
+    # the umask can only be read by setting it, done once at import time,
+    # before any build thread creates files
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _file_mode(file):
+    """
+    The mode `open` would give a new `file`, or the mode of the existing
+    one: mkstemp creates 0600 files, which other users can't read.
+    """
+    try:
+        return os.stat(file).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_write(file, mode="w"):
+    """
+    Open a temporary file beside `file` and rename it over `file` when the
+    block exits, so readers never see a partially written file.
+    """
+    dir = os.path.dirname(os.path.abspath(file))
+    os.makedirs(dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dir, prefix="." + ntpath.basename(file), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.chmod(tmp_path, _file_mode(file))
+        os.replace(tmp_path, file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def yaml_dump(intro="", data={}, file=None):
+    # yaml and apispec are only needed to write the spec, not to serve it
+    import yaml
+    from apispec.yaml_utils import dict_to_yaml
+
     yaml.Dumper.ignore_aliases = lambda self, data: True
-    with open(file, "w") as f:
+    with atomic_write(file) as f:
         f.write(intro)
         dict_to_yaml(data, {"stream": f, "sort_keys": False})
 
 
-def cache_file(path, oas_dir, cache_dir):
+ARTIFACT_VERSION = 1
+
+
+def file_hash(path):
     if not os.path.exists(path):
-        return
-    rel_path = os.path.relpath(path, oas_dir)
-    dir = os.path.dirname(rel_path)
-    fname = ntpath.basename(path).split(".")[0]
-    ext = os.path.splitext(path)[1]
-    count = 1
-    while True:
-        new_path = os.path.join(cache_dir, dir, fname + "_" + str(count) + ext)
-        if not os.path.exists(new_path):
-            break
-        count += 1
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def dump_artifact(data, source_path, file):
+    """
+    Write `data` as a compact json artifact next to its yaml source.
+    The artifact records the hash of `source_path`, so it is ignored once the
+    yaml file is edited by hand.
+    """
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "source_hash": file_hash(source_path),
+        "data": data,
+    }
+    with atomic_write(file) as f:
+        json.dump(artifact, f, separators=(",", ":"), default=str)
+
+
+def load_artifact(file, source_path=None):
+    """
+    Return the data stored in the json artifact, or None if the artifact
+    is missing, was written by another format version or is stale
+    compared to `source_path`.
+    """
+    if not os.path.exists(file):
+        return None
     try:
-        os.makedirs(os.path.dirname(new_path))
-    except Exception as e:
-        pass
+        with open(file) as f:
+            artifact = json.load(f)
+    except ValueError:
+        return None
+    if not isinstance(artifact, dict):
+        return None
+    if artifact.get("version") != ARTIFACT_VERSION:
+        return None
+    if source_path and artifact.get("source_hash") != file_hash(source_path):
+        return None
+    return artifact.get("data")
+
+
+def load_spec(source_path, artifact_path=None, default={}):
+    """
+    Load the final oas data, preferring the json artifact when it matches
+    the yaml file.
+    """
+    if artifact_path:
+        data = load_artifact(artifact_path, source_path)
+        if data is not None:
+            return data
+    return load_file(source_path, default)
 
-    with open(new_path, "w") as f:
 
-        f.write(open(path).read())
-    return new_path
+def freeze_objects():
+    """
+    Move every tracked object to the permanent gc generation, so the
+    collector never writes to their headers after the process forks.
+    """
+    if not hasattr(gc, "freeze"):
+        return
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from ._utils import atomic_write
+
+
+def validate_spec(data: dict):
+    # openapi_spec_validator is slow to import and only used by builds
+    from openapi_spec_validator import validate_spec as _validate_spec
+
+    return _validate_spec(data)
+
+
+def data_hash(data) -> str:
+    dumped = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(dumped.encode()).hexdigest()
+
+
+def _subtree_hashes(data: dict) -> Dict[str, str]:
+    hashes = {}
+    for path, path_item in data.get("paths", {}).items():
+        hashes["paths/" + path] = data_hash(path_item)
+    for type_, items in data.get("components", {}).items():
+        if not isinstance(items, dict):
+            continue
+        for name, item in items.items():
+            hashes["components/{0}/{1}".format(type_, name)] = data_hash(item)
+    base = {k: v for k, v in data.items() if k not in ["paths", "components"]}
+    hashes["base"] = data_hash(base)
+    return hashes
+
+
+def _load_cache(cache_path: Optional[str]) -> dict:
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def _save_cache(cache_path: Optional[str], cache: dict):
+    if not cache_path:
+        return
+    with atomic_write(cache_path) as f:
+        json.dump(cache, f)
+
+
+def validate_spec_cached(
+    data: dict, cache_path: Optional[str] = None, incremental=True
+) -> bool:
+    """
+    Validate `data` by `openapi_spec_validator`, skipping specs already known
+    to be valid.
+
+    The cache at `cache_path` stores the hash of the last valid spec and of
+    each of its path items and components. If only some path items changed,
+    the validated document holds every section and component but only the
+    changed path items. Any other change (removed components, info, servers...)
+    validates the whole document.
+
+    Returns True if a validation ran, False if the cache answered.
+    Raises the validator errors for invalid specs, nothing is cached then.
+    """
+    cache = _load_cache(cache_path)
+    full_hash = data_hash(data)
+    if cache.get("spec") == full_hash:
+        return False
+
+    hashes = _subtree_hashes(data)
+    prev_hashes: dict = cache.get("subtrees", {})
+    doc = data
+    if incremental and prev_hashes:
+        prev_components = {k for k in prev_hashes if k.startswith("components/")}
+        components = {k for k in hashes if k.startswith("components/")}
+        if (
+            hashes["base"] == prev_hashes.get("base")
+            and prev_components <= components
+        ):
+            doc = {k: v for k, v in data.items() if k != "paths"}
+            doc["paths"] = {
+                path: path_item
+                for path, path_item in data.get("paths", {}).items()
+                if hashes["paths/" + path] != prev_hashes.get("paths/" + path)
+            }
+
+    validate_spec(doc)
+    _save_cache(cache_path, {"spec": full_hash, "subtrees": hashes})
+    return True
@@ -0,0 +1,280 @@
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+WATCHED_EXTENSIONS = (".yaml", ".yml", ".json", ".py")
+# where the installed packages live, inside a virtualenv or not
+PACKAGES_DIRS = {"site-packages", "dist-packages"}
+
+
+def app_module_files(root_path: str) -> List[str]:
+    """
+    Source files of the imported modules under `root_path`, the installed
+    packages excepted (a virtualenv may live in the app's directory).
+    """
+    root = os.path.join(os.path.abspath(root_path), "")
+    files = []
+    for module in list(sys.modules.values()):
+        file_ = getattr(module, "__file__", None)
+        if not file_ or not file_.endswith(".py"):
+            continue
+        file_ = os.path.abspath(file_)
+        if file_.startswith(root) and not PACKAGES_DIRS & set(
+            file_[len(root) :].split(os.sep)
+        ):
+            files.append(file_)
+    return files
+
+
+def _iter_files(path: str):
+    path = os.path.abspath(path)
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        # hidden dirs are skipped, except those passed explicitly. Not the
+        # hidden files: the path fragments are named `.<path>.yaml`
+        dirs[:] = [
+            d for d in dirs if not d.startswith(".") and d != "__pycache__"
+        ]
+        for f in files:
+            if f.endswith(WATCHED_EXTENSIONS):
+                yield os.path.join(root, f)
+
+
+class Watcher:
+    """
+    Poll the modification times of the files under `paths` and call
+    `callback` with the set of changed files. `paths` may be a callable,
+    called on each poll, to follow a list of files that changes.
+
+    Changes are debounced: the callback runs once the files stayed unchanged
+    for `debounce` seconds, so a burst of saves triggers one rebuild.
+    Files written by the callback itself are not reported back.
+    """
+
+    def __init__(
+        self,
+        paths: Union[Iterable[str], Callable[[], Iterable[str]]],
+        callback: Callable[[Set[str]], None],
+        interval: float = 0.2,
+        debounce: float = 0.3,
+    ) -> None:
+        self.paths = paths if callable(paths) else [p for p in paths if p]
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self.stop_event = threading.Event()
+
+    def snapshot(self) -> Dict[str, int]:
+        mtimes = {}
+        paths = self.paths() if callable(self.paths) else self.paths
+        for path in paths:
+            if not path or not os.path.exists(path):
+                continue
+            for f in _iter_files(path):
+                try:
+                    mtimes[f] = os.stat(f).st_mtime_ns
+                except OSError:
+                    pass
+        return mtimes
+
+    @staticmethod
+    def diff(old: Dict[str, int], new: Dict[str, int]) -> Set[str]:
+        return {
+            f for f in set(old) | set(new) if old.get(f) != new.get(f)
+        }
+
+    def run(self):
+        mtimes = self.snapshot()
+        pending: Set[str] = set()
+        last_change = 0.0
+        while not self.stop_event.is_set():
+            self.stop_event.wait(self.interval)
+            current = self.snapshot()
+            changed = self.diff(mtimes, current)
+            mtimes = current
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            if pending and now - last_change >= self.debounce:
+                try:
+                    self.callback(pending)
+                finally:
+                    pending = set()
+                    # ignore the files written by the callback
+                    mtimes = self.snapshot()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def _route_modules(app) -> Set[str]:
+    """Modules declaring the views of `app`."""
+    return {
+        getattr(view, "__module__", None)
+        for view in getattr(app, "view_functions", {}).values()
+    } - {None}
+
+
+def _module_rules(app, name: str) -> Set[tuple]:
+    return {
+        (rule.rule, rule.endpoint, frozenset(rule.methods or ()))
+        for rule in app.url_map.iter_rules()
+        if getattr(app.view_functions.get(rule.endpoint), "__module__", None)
+        == name
+    }
+
+
+@contextmanager
+def _scratch_routes(app):
+    """
+    Redirect the routes and blueprints added to any app to a new app, the
+    views of `app` can't be overwritten. Yields the new app.
+    """
+    from flask import Flask
+
+    scratch = Flask(app.import_name, static_folder=None)
+    add_url_rule, register_blueprint = (
+        Flask.add_url_rule,
+        Flask.register_blueprint,
+    )
+    Flask.add_url_rule = lambda self, *args, **kwargs: add_url_rule(
+        scratch, *args, **kwargs
+    )
+    Flask.register_blueprint = lambda self, *args, **kwargs: (
+        register_blueprint(scratch, *args, **kwargs)
+    )
+    try:
+        yield scratch
+    finally:
+        Flask.add_url_rule = add_url_rule
+        Flask.register_blueprint = register_blueprint
+
+
+def _execute_route_module(module: ModuleType, app) -> bool:
+    """
+    Run the source of `module` again to collect its declarations, its routes
+    go to a scratch app. Returns False if they differ from those `app`
+    holds, which are kept: the app must then be recreated.
+    """
+    from flask import Blueprint
+
+    with open(module.__file__) as f:
+        code = compile(f.read(), module.__file__, "exec")
+    namespace = {
+        key: getattr(module, key)
+        for key in ("__name__", "__file__", "__package__", "__spec__")
+        if hasattr(module, key)
+    }
+    with _scratch_routes(app) as scratch:
+        exec(code, namespace)
+        for value in list(namespace.values()):
+            # blueprints are often registered by the module creating the app
+            if (
+                isinstance(value, Blueprint)
+                and value.name in app.blueprints
+                and value.name not in scratch.blueprints
+            ):
+                scratch.register_blueprint(value)
+    return _module_rules(scratch, module.__name__) == _module_rules(
+        app, module.__name__
+    )
+
+
+def _dependents(names: Set[str], registry) -> Set[str]:
+    """
+    The modules declaring to `registry` which use one of the modules
+    `names`, or an object defined there: their declarations hold the
+    objects of the previous import.
+    """
+    dependents = set()
+    for name in registry.modules() - names:
+        module = sys.modules.get(name or "")
+        for value in vars(module).values() if module else ():
+            if isinstance(value, ModuleType):
+                module_name = value.__name__
+            else:
+                try:
+                    module_name = getattr(value, "__module__", None)
+                except Exception:
+                    # context locals such as flask's request
+                    continue
+            if isinstance(module_name, str) and module_name in names:
+                dependents.add(name)
+                break
+    return dependents
+
+
+def reload_modules(
+    files: Iterable[str], registry=None, app=None
+) -> Tuple[List[str], List[str]]:
+    """
+    Reload the imported python modules of `files`, and the modules declaring
+    oas data with their objects, after dropping their declarations from
+    `registry` (default: the current deferred registry) so the reloaded
+    decorators replace them.
+
+    Flask refuses to overwrite an endpoint: the modules declaring views of
+    `app` are executed again with their routes sent to a scratch app, and
+    the module creating `app` is never reloaded. Returns the names of the
+    (reloaded, outdated) modules, `app` must be recreated when a module is
+    outdated: it's the app module or its routes changed.
+    """
+    from .decorators import Deferred
+
+    if registry is None:
+        registry = Deferred._deferred
+    views = _route_modules(app) if app is not None else set()
+    files = {os.path.abspath(f) for f in files if f.endswith(".py")}
+    names = [
+        name
+        for name, module in list(sys.modules.items())
+        if getattr(module, "__file__", None)
+        and os.path.abspath(module.__file__) in files
+    ]
+    names += sorted(_dependents(set(names), registry))
+    reloaded, outdated = [], []
+    for name in names:
+        module = sys.modules[name]
+        if app is not None and name == app.import_name:
+            outdated.append(name)
+            continue
+        registry.discard_modules([name])
+        with Deferred.scope(registry):
+            if name not in views:
+                importlib.reload(module)
+            elif not _execute_route_module(module, app):
+                outdated.append(name)
+                continue
+        reloaded.append(name)
+    return reloaded, outdated
+
+
+def restart(args: Sequence[str], app_import_path: Optional[str] = None):
+    """
+    Replace this process with `flask <args>`, which imports the app and its
+    declarations afresh.
+    """
+    env = dict(os.environ)
+    if app_import_path:
+        env["FLASK_APP"] = app_import_path
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execve(sys.executable, [sys.executable, "-m", "flask", *args], env)
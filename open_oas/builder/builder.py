@@ -1,19 +1,20 @@
-from copy import deepcopy
-from typing import Any, Literal, Optional, Union, cast
+from typing import Any, Dict, Iterable, List, Literal, Optional, Union, cast
 
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from marshmallow import Schema
 
 from .._parameters import VALID_METHODS_OPENAPI_V3
+from .._profile import phase
 from .._utils import clean_parameters_list, merge_recursive
 from ..plugin.plugin import SchemaQualPlugin
-from ..decorators import Deferred
+from ..decorators import Deferred, DeferredRegistry
 from .builder_resolver import (
     ComponentResolver,
     load_data as load_input_data,
     load_deferred_data,
 )
+from .schema_cache import SchemaCache
 from .utils import (
     _add_schema_to_components,
     _validate,
@@ -32,14 +33,25 @@ class OasBuilder:
         default_required=True,
         default_content_type="application/json",
         allowed_methods=VALID_METHODS_OPENAPI_V3,
-        #    deferred: List = [],
+        deferred: Iterable[tuple] = None,
+        workers: int = 1,
+        schema_cache: Optional[SchemaCache] = None,
     ) -> None:
-        self.input_data = deepcopy(data)
-        self.data = deepcopy(data)
+        # the builder consumes its data, the input is copied once here.
+        # merge_recursive rebuilds the dicts and lists and shares the leaves
+        # (schemas, scalars), which are never mutated.
+        self.data = cast(dict, merge_recursive([data]))
         self.default_required = default_required
         self.default_content_type = default_content_type
         self.allowed_methods = allowed_methods + ["*"]
         self.deferred_data = {}
+        # path -> method -> operation fragments, in declaration order
+        self._deferred_operations: Dict[str, Dict[str, List[dict]]] = {}
+        if deferred is None:
+            deferred = Deferred._deferred
+        if not isinstance(deferred, DeferredRegistry):
+            deferred = DeferredRegistry(deferred)
+        self.deferred = deferred
 
         self.apispec = APISpec(
             data.get("info", {}).get("title", "") or "title",
@@ -47,22 +59,55 @@ class OasBuilder:
             "3.0.2",
             plugins=[SchemaQualPlugin(), MarshmallowPlugin()],
         )
+        # processes converting the schemas of components.schemas, and the
+        # schemas converted by previous builds
         self.components_resolver = ComponentResolver(
-            self.apispec, self.data, self.allowed_methods
+            self.apispec,
+            self.data,
+            self.allowed_methods,
+            workers=workers,
+            cache=schema_cache,
         )
 
         load_input_data(self)
-        self.load_deferred()
-        load_deferred_data(self, self.deferred_data)
+        with phase("deferred"):
+            self.load_deferred()
+            self._materialize_deferred_operations()
+            load_deferred_data(self, self.deferred_data)
 
     def load_deferred(self):
-        for attr_name, args, kwargs in Deferred._deferred:
+        for attr_name, args, kwargs in self.deferred.snapshot():
             m = getattr(self, attr_name, None)
             if m:
                 m(*args, **kwargs)
             else:
                 raise ValueError(f"OasBuilder has no method named {attr_name}")
 
+    def _add_deferred_operation(self, path: str, method: str, fragment: dict):
+        self._deferred_operations.setdefault(path, {}).setdefault(
+            method, []
+        ).append(fragment)
+
+    def _materialize_deferred_operations(self):
+        """
+        Merge the indexed operation fragments into `deferred_data`.
+        Each operation merges only its own fragments, later declarations
+        win, then the whole tree is merged once.
+        """
+        if not self._deferred_operations:
+            return
+        paths = {
+            path: {
+                method: merge_recursive(list(reversed(fragments)))
+                for method, fragments in methods.items()
+            }
+            for path, methods in self._deferred_operations.items()
+        }
+        self._deferred_operations = {}
+        self.deferred_data = cast(
+            dict, merge_recursive([{"paths": paths}, self.deferred_data])
+        )
+
     def api_info(
         self,
         title,
@@ -368,35 +413,19 @@ class OasBuilder:
         """
         mthd = method.lower()
         _validate(path, mthd, schema, self.allowed_methods)
-        self.deferred_data = cast(
-            dict,
-            merge_recursive(
-                [
-                    {
-                        "paths": {
-                            path: {
-                                mthd: {
-                                    "requestBody": {
-                                        "content": {
-                                            content_type
-                                            or self.default_content_type: {
-                                                "schema": schema
-                                            }
-                                        },
-                                        "description": kwargs.get(
-                                            "description", ""
-                                        ),
-                                        "required": kwargs.get(
-                                            "required", self.default_required
-                                        ),
-                                    },
-                                },
-                            },
-                        },
+        self._add_deferred_operation(
+            path,
+            mthd,
+            {
+                "requestBody": {
+                    "content": {
+                        content_type
+                        or self.default_content_type: {"schema": schema}
                     },
-                    self.deferred_data,
-                ]
-            ),
+                    "description": kwargs.get("description", ""),
+                    "required": kwargs.get("required", self.default_required),
+                },
+            },
         )
 
     def path_response(
@@ -434,31 +463,21 @@ class OasBuilder:
         mthd = method.lower()
         _validate(path, mthd, schema, self.allowed_methods)
         content_type = content_type or self.default_content_type
-        self.deferred_data = cast(
-            dict,
-            merge_recursive(
-                [
-                    {
-                        "paths": {
-                            path: {
-                                mthd: {
-                                    "responses": {
-                                        str(code): {
-                                            "content": {
-                                                content_type: {
-                                                    "schema": schema,
-                                                }
-                                            },
-                                            "description": description,
-                                        },
-                                    },
-                                },
+        self._add_deferred_operation(
+            path,
+            mthd,
+            {
+                "responses": {
+                    str(code): {
+                        "content": {
+                            content_type: {
+                                "schema": schema,
                             }
-                        }
+                        },
+                        "description": description,
                     },
-                    self.deferred_data,
-                ]
-            ),
+                },
+            },
         )
 
     def _set_security_requirements(
@@ -651,18 +670,16 @@ class OasBuilder:
         self.data["paths"][path] = path_data
 
     def get_data(self) -> dict:
-        data = deepcopy(self.data)
-        spec_data = deepcopy(self.apispec.to_dict())
-        input_data = deepcopy(self.input_data)
-        if "servers" in input_data:
-            del input_data["servers"]
-        ret = cast(
+        """
+        Return the built spec. The result is a new tree, it shares no dict or
+        list with the builder or its apispec, so callers may mutate it.
+        """
+        return cast(
             dict,
             merge_recursive(
                 [
-                    data,
-                    spec_data,
+                    self.data,
+                    self.apispec.to_dict(),
                 ]
             ),
         )
-        return ret
@@ -1,54 +1,174 @@
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from logging import warning
+import multiprocessing
+from time import perf_counter
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 
 from .._parameters import VALID_METHODS_OPENAPI_V3
+from .._profile import is_active as profiling, phase, record
 from ..plugin.plugin import SchemaQualPlugin
+from .schema_cache import SchemaCache, schema_fingerprint
 from apispec import APISpec
-from typing import TYPE_CHECKING, Dict, cast
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, cast
 from .utils import _add_schema_to_components, _validate
 
 if TYPE_CHECKING:
     from .builder import OasBuilder
 
 
+def _schema_name(schema) -> str:
+    if isinstance(schema, str):
+        return schema
+    klass = schema if isinstance(schema, type) else type(schema)
+    return "{0}.{1}".format(klass.__module__, klass.__qualname__)
+
+
+def _create_apispec() -> APISpec:
+    return APISpec(
+        "title",
+        "1",
+        "3.0.2",
+        plugins=[SchemaQualPlugin(), MarshmallowPlugin()],
+    )
+
+
+def _set_x_schema(dict_: Dict, data):
+    x_schema = data.get("x-schema")
+    x_schema_kwargs = data.get("x-schema-kwargs")
+    schema_ref: str = data.get("schema", {}).get("$ref", "")
+    if schema_ref:
+        del data["schema"]["$ref"]
+
+    if x_schema:
+        schema_name = schema_ref.split("/")[-1]
+        schema_data = (
+            dict_.get("components", {}).get("schemas", {}).get(schema_name, {})
+        )
+        if schema_data:
+            dict_["components"]["schemas"][schema_name]["x-schema"] = x_schema
+            if x_schema_kwargs:
+                dict_["components"]["schemas"][schema_name][
+                    "x-schema-kwargs"
+                ] = x_schema_kwargs
+
+
+def convert_schema(
+    schema, schema_kwargs={}, allowed_methods=VALID_METHODS_OPENAPI_V3
+) -> Tuple[Optional[str], dict]:
+    """
+    Convert a marshmallow schema to its component name and json schema, in
+    an apispec of its own. Dict schemas are returned as (None, schema).
+
+    Nothing shared is read or written, so schemas may be converted in any
+    order or process; the caller adds the result to its components.
+    """
+    _validate(None, None, schema, allowed_methods)
+    if isinstance(schema, dict):
+        return None, schema
+
+    spec = _create_apispec()
+    spec.path(
+        "/invalid",
+        operations={
+            "get": {
+                "responses": {
+                    "default": {
+                        "content": {
+                            "application/json": {
+                                "schema": schema,
+                                "x-schema-kwargs": schema_kwargs,
+                            },
+                        }
+                    }
+                }
+            },
+        },
+    )
+    #
+    dict_ = spec.to_dict()
+    _set_x_schema(
+        dict_,
+        dict_["paths"]["/invalid"]["get"]["responses"]["default"]["content"][
+            "application/json"
+        ],
+    )
+
+    names = list(dict_.get("components", {}).get("schemas", {}).keys())
+
+    name = None
+    if len(names) > 0:
+        name = names[0]
+    data = dict_.get("components", {}).get("schemas", {}).get(name, {})
+    return name, data
+
+
+# (schema, kwargs, allowed_methods) converted by the forked workers, they
+# read it by index so the schemas are never pickled
+_pending: List[tuple] = []
+
+
+def _convert_pending(index: int) -> Tuple[Optional[str], dict, float]:
+    started = perf_counter()
+    name, data = convert_schema(*_pending[index])
+    return name, data, perf_counter() - started
+
+
 class ComponentResolver:
     def __init__(
         self,
         apispec: APISpec,
         data: Dict = {},
         allowed_methods=VALID_METHODS_OPENAPI_V3,
+        workers: int = 1,
+        cache: Optional[SchemaCache] = None,
     ) -> None:
         self.main_apispec = apispec
         self.row_data = data
         self.allowed_methods = allowed_methods
+        self.workers = workers or 1
+        self.cache = cache
 
     def create_apispec(self):
-
-        return APISpec(
-            "title",
-            "1",
-            "3.0.2",
-            plugins=[SchemaQualPlugin(), MarshmallowPlugin()],
-        )
+        return _create_apispec()
 
     def resolve_schemas(self, components_schemas: dict):
         """components_schemas = self.row_data.get("components", {}).get(
             "schemas", {}
         )"""
+        schemas = []
         for schema_name in list(components_schemas.keys()):
             kwargs = (
                 self.row_data.get("components", {})
                 .get("schemas-kwargs", {})
                 .get(schema_name, {})
             )
-            schema = components_schemas[schema_name]
+            schemas.append(
+                (schema_name, components_schemas[schema_name], kwargs)
+            )
+        # the workers only convert, the results are added in order below so
+        # the names and suffixes are the same as in a serial build
+        converted = self.__convert_misses_in_workers(
+            [
+                (i, s, k)
+                for i, (_, s, k) in enumerate(schemas)
+                if not isinstance(s, dict)
+            ]
+        )
+        for i, (schema_name, schema, kwargs) in enumerate(schemas):
             """if not kwargs and isinstance(schema, dict):
                 kwargs = schema.get("schemas-kwargs", {})"""
             if isinstance(schema, dict):
                 _add_schema_to_components(
                     self.main_apispec, schema_name, schema
                 )
+            elif i in converted:
+                name, data, seconds = converted[i]
+                if profiling():
+                    record("schemas", _schema_name(schema), seconds)
+                if name and data:
+                    _add_schema_to_components(self.main_apispec, name, data)
             else:
                 self._component_schema(
                     schema,
@@ -62,73 +182,103 @@ class ComponentResolver:
                 pass
 
     def _component_schema(self, schema, schema_kwargs={}):
-        _validate(None, None, schema, self.allowed_methods)
-        spec = self.create_apispec()
-
-        """if isinstance(schema, dict):
-            schema_kwargs = schema_kwargs or schema.get("schemas-kwargs", {})"""
-        if isinstance(schema, dict):
-            return None, schema
-
-        spec.path(
-            "/invalid",
-            operations={
-                "get": {
-                    "responses": {
-                        "default": {
-                            "content": {
-                                "application/json": {
-                                    "schema": schema,
-                                    "x-schema-kwargs": schema_kwargs,
-                                },
-                            }
-                        }
-                    }
-                },
-            },
-        )
-        #
-        dict_ = spec.to_dict()
-        self.__set_x_schema(
-            dict_,
-            dict_["paths"]["/invalid"]["get"]["responses"]["default"][
-                "content"
-            ]["application/json"],
-        )
-
-        names = list(dict_.get("components", {}).get("schemas", {}).keys())
+        started = perf_counter() if profiling() else 0.0
+        try:
+            return self.__component_schema(schema, schema_kwargs)
+        finally:
+            if started:
+                record(
+                    "schemas",
+                    _schema_name(schema),
+                    perf_counter() - started,
+                )
 
-        name = None
-        if len(names) > 0:
-            name = names[0]
-        data = dict_.get("components", {}).get("schemas", {}).get(name, {})
+    def __component_schema(self, schema, schema_kwargs={}):
+        fingerprint = None
+        cached = None
+        if self.cache is not None:
+            fingerprint = schema_fingerprint(schema, schema_kwargs)
+            cached = self.cache.get(fingerprint)
+        if cached is not None:
+            name, data = cached
+        else:
+            name, data = convert_schema(
+                schema, schema_kwargs, self.allowed_methods
+            )
+            if self.cache is not None:
+                self.cache.put(fingerprint, name, data)
         if name and data:
             _add_schema_to_components(self.main_apispec, name, data)
-
         return name, data
 
-    def __set_x_schema(self, dict_: Dict, data):
-        x_schema = data.get("x-schema")
-        x_schema_kwargs = data.get("x-schema-kwargs")
-        schema_ref: str = data.get("schema", {}).get("$ref", "")
-        if schema_ref:
-            del data["schema"]["$ref"]
-
-        if x_schema:
-            schema_name = schema_ref.split("/")[-1]
-            schema_data = (
-                dict_.get("components", {})
-                .get("schemas", {})
-                .get(schema_name, {})
+    def __convert_misses_in_workers(
+        self, schemas: List[tuple]
+    ) -> Dict[int, tuple]:
+        """
+        index -> (name, data, seconds) of the (index, schema, kwargs) of
+        `schemas` found in the cache or converted by the workers. Empty when
+        the schemas should be converted in this process.
+        """
+        if self.workers < 2:
+            return {}
+        results: Dict[int, tuple] = {}
+        misses = []
+        for i, schema, kwargs in schemas:
+            fingerprint = None
+            if self.cache is not None:
+                fingerprint = schema_fingerprint(schema, kwargs)
+                cached = self.cache.get(fingerprint)
+                if cached is not None:
+                    results[i] = (*cached, 0.0)
+                    continue
+            misses.append((i, schema, kwargs, fingerprint))
+        converted = self.__convert_in_workers(
+            [(s, k) for _, s, k, _ in misses]
+        )
+        if converted is None:
+            # the misses are converted one by one, in order
+            return results if not misses else {}
+        for (i, _, _, fingerprint), result in zip(misses, converted):
+            if self.cache is not None:
+                self.cache.put(fingerprint, result[0], result[1])
+            results[i] = result
+        return results
+
+    def __convert_in_workers(self, schemas: List[tuple]) -> Optional[list]:
+        """
+        (name, data, seconds) of each (schema, kwargs) of `schemas`, converted
+        by `workers` forked processes. None when the schemas should be
+        converted in this process.
+        """
+        if (
+            self.workers < 2
+            or len(schemas) < 2
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            return None
+        global _pending
+        _pending = [(s, k, self.allowed_methods) for s, k in schemas]
+        workers = min(self.workers, len(schemas))
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                return list(
+                    executor.map(
+                        _convert_pending,
+                        range(len(schemas)),
+                        chunksize=max(1, len(schemas) // (workers * 4)),
+                    )
+                )
+        except Exception as e:
+            warning(
+                "Can't convert the schemas in worker processes ({0}), "
+                "converting them in the build process".format(e)
             )
-            if schema_data:
-                dict_["components"]["schemas"][schema_name][
-                    "x-schema"
-                ] = x_schema
-                if x_schema_kwargs:
-                    dict_["components"]["schemas"][schema_name][
-                        "x-schema-kwargs"
-                    ] = x_schema_kwargs
+            return None
+        finally:
+            _pending = []
 
     def __add_schema_ref(self, name: str, schema: Dict, data: dict):
 
@@ -173,7 +323,7 @@ class ComponentResolver:
         )
 
         for media_type_data in response_data.get("content", {}).values():
-            self.__set_x_schema(dict_, media_type_data)
+            _set_x_schema(dict_, media_type_data)
 
         for schema_name, schema in (
             dict_.get("components", {}).get("schemas", {}).items()
@@ -218,7 +368,7 @@ class ComponentResolver:
         )
 
         for media_type_data in body_data.get("content", {}).values():
-            self.__set_x_schema(dict_, media_type_data)
+            _set_x_schema(dict_, media_type_data)
 
         for schema_name, schema in (
             dict_.get("components", {}).get("schemas", {}).items()
@@ -347,7 +497,7 @@ class ComponentResolver:
             .get("header_name", {})
         )
 
-        self.__set_x_schema(dict_, header_data)
+        _set_x_schema(dict_, header_data)
 
         for schema_name, schema in (
             dict_.get("components", {}).get("schemas", {}).items()
@@ -470,6 +620,7 @@ def load_paths(
     not_implemented_data = {}
 
     for p in paths:
+        started = perf_counter() if profiling() else 0.0
         path_data = row_data.get("paths", {}).get(p, {})
         summary = path_data.get("summary", "")
         description = path_data.get("description", "")
@@ -517,6 +668,8 @@ def load_paths(
             operations=operations,
             kwargs=kwargs,
         )
+        if started:
+            record("paths", p, perf_counter() - started)
         # data = oas_builder.apispec.to_dict()
         # oas_builder.components_resolver.resolve_schemas(data)
         # oas_builder.components_resolver.resolve_parameters(data)
@@ -541,9 +694,14 @@ def load_data(
     components_resolver = oas_builder.components_resolver
     allowed_methods = oas_builder.allowed_methods
 
-    load_components(oas_builder, row_data, components_resolver, allowed_methods)
-    load_paths(oas_builder, row_data, allowed_methods)
-    load_tags(apispec, row_data, allowed_methods)
+    with phase("components"):
+        load_components(
+            oas_builder, row_data, components_resolver, allowed_methods
+        )
+    with phase("paths"):
+        load_paths(oas_builder, row_data, allowed_methods)
+    with phase("tags"):
+        load_tags(apispec, row_data, allowed_methods)
 
 
 def load_deferred_data(oas_builder: "OasBuilder", data: dict = {}):
@@ -0,0 +1,216 @@
+import copy
+import enum
+import hashlib
+import json
+import os
+import re
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, Optional, Tuple
+
+from marshmallow import Schema, class_registry
+from marshmallow.fields import Field
+
+from .._utils import atomic_write
+from ..plugin.utils import import_by_path
+
+CACHE_VERSION = 1
+
+_address = re.compile(r" at 0x[0-9a-fA-F]+")
+_versions: Optional[Dict[str, Optional[str]]] = None
+
+
+def _package_versions() -> Dict[str, Optional[str]]:
+    global _versions
+    if _versions is None:
+        _versions = {}
+        for package in ["apispec", "marshmallow"]:
+            try:
+                _versions[package] = version(package)
+            except PackageNotFoundError:
+                _versions[package] = None
+    return _versions
+
+
+def _qualname(obj) -> str:
+    return "{0}.{1}".format(
+        getattr(obj, "__module__", ""),
+        getattr(obj, "__qualname__", type(obj).__qualname__),
+    )
+
+
+def _resolve_schema(schema):
+    if isinstance(schema, str):
+        if "." in schema:
+            return import_by_path(schema)
+        return class_registry.get_class(schema)
+    return schema
+
+
+def _describe_schema(schema, seen: set):
+    klass = schema if isinstance(schema, type) else type(schema)
+    name = _qualname(klass)
+    if klass in seen:
+        return name
+    seen = seen | {klass}
+    description = {
+        "class": name,
+        "fields": {
+            field_name: _describe(field, seen)
+            for field_name, field in klass._declared_fields.items()
+        },
+        "options": _describe(vars(klass.opts), seen),
+    }
+    if not isinstance(schema, type):
+        description["instance"] = _describe(
+            {
+                attr: getattr(schema, attr, None)
+                for attr in [
+                    "only",
+                    "exclude",
+                    "many",
+                    "load_only",
+                    "dump_only",
+                    "partial",
+                    "unknown",
+                ]
+            },
+            seen,
+        )
+    return description
+
+
+def _describe_field(field: Field, seen: set):
+    description = {"class": _qualname(type(field))}
+    for attr, value in sorted(vars(field).items()):
+        # parent, root and name are set when the field is bound to a schema
+        if attr.startswith("_") or attr in ["parent", "root", "name"]:
+            continue
+        if attr == "nested" and callable(value) and not isinstance(
+            value, type
+        ):
+            # Nested(lambda: OtherSchema())
+            value = value()
+        if attr == "nested" and isinstance(value, str) and value != "self":
+            try:
+                value = _resolve_schema(value)
+            except Exception:
+                pass
+        description[attr] = _describe(value, seen)
+    return description
+
+
+def _describe(value, seen: set):
+    """A json value describing `value`, the same in any process."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        return _qualname(type(value)) + "." + value.name
+    if isinstance(value, dict):
+        return {str(k): _describe(v, seen) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(v, seen) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(
+            (_describe(v, seen) for v in value),
+            key=lambda v: json.dumps(v, sort_keys=True),
+        )
+    if isinstance(value, Field):
+        return _describe_field(value, seen)
+    if isinstance(value, Schema) or (
+        isinstance(value, type) and issubclass(value, Schema)
+    ):
+        return _describe_schema(value, seen)
+    if isinstance(value, type) or callable(value):
+        return _qualname(value)
+    return _address.sub("", repr(value))
+
+
+def schema_fingerprint(schema, schema_kwargs: dict = {}) -> Optional[str]:
+    """
+    Hash of what the json schema of `schema` converted with `schema_kwargs`
+    depends on: the schema qualname, its fields (nested schemas included),
+    its Meta options, the options of an instance, the kwargs and the
+    apispec and marshmallow versions.
+
+    None when `schema` can't be fingerprinted (dict or unknown schemas).
+    """
+    if isinstance(schema, dict) or not schema:
+        return None
+    try:
+        resolved = _resolve_schema(schema)
+    except Exception:
+        return None
+    if not (
+        isinstance(resolved, Schema)
+        or (isinstance(resolved, type) and issubclass(resolved, Schema))
+    ):
+        return None
+    description = {
+        "version": CACHE_VERSION,
+        "packages": _package_versions(),
+        # a qualname converts like its class, but its x-schema differs
+        "schema": schema if isinstance(schema, str) else None,
+        "definition": _describe(resolved, set()),
+        "kwargs": _describe(schema_kwargs or {}, set()),
+    }
+    dumped = json.dumps(description, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(dumped.encode()).hexdigest()
+
+
+class SchemaCache:
+    """
+    Component names and json schemas of converted marshmallow schemas, by
+    `schema_fingerprint`, stored as json at `path`.
+
+    Only the entries used since the cache was loaded are saved, so the file
+    holds the schemas of the last build.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._entries: Dict[str, dict] = self.__load()
+        self._used: Dict[str, dict] = {}
+        self._added = False
+
+    def __load(self) -> Dict[str, dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                cache = json.load(f)
+        except ValueError:
+            return {}
+        if cache.get("version") != CACHE_VERSION:
+            return {}
+        return cache.get("schemas", {})
+
+    def get(self, fingerprint: Optional[str]) -> Optional[Tuple[str, dict]]:
+        entry = self._entries.get(fingerprint) if fingerprint else None
+        if entry is None:
+            return None
+        self._used[fingerprint] = entry
+        # the builder owns the returned data
+        return entry["name"], copy.deepcopy(entry["data"])
+
+    def put(self, fingerprint: Optional[str], name: Optional[str], data: dict):
+        if not fingerprint or not name:
+            return
+        try:
+            # only data read back as it is (no tuples, no objects)
+            if json.loads(json.dumps(data)) != data:
+                return
+        except (TypeError, ValueError):
+            return
+        entry = {"name": name, "data": copy.deepcopy(data)}
+        self._entries[fingerprint] = self._used[fingerprint] = entry
+        self._added = True
+
+    def save(self):
+        if not self.path:
+            return
+        if not self._added and len(self._used) == len(self._entries):
+            return
+        with atomic_write(self.path) as f:
+            json.dump({"version": CACHE_VERSION, "schemas": self._used}, f)
+        self._entries = dict(self._used)
+        self._added = False
@@ -10,9 +10,9 @@ from flask import request
 
 if TYPE_CHECKING:
     from ..open_oas import OpenOas
+    from ._pipeline import RequestContext
 
-from .._parameters import rule_to_path
-from ._utils import _resolve_oas_object, _get_row_oas, _get_request_body_data
+from ._utils import _resolve_oas_object, _get_request_body_data
 
 
 class _RequestsAuthenticator:
@@ -20,7 +20,9 @@ class _RequestsAuthenticator:
         self.open_oas = open_oas
         self.config = open_oas.config
         if self.config.authenticate_requests:
-            open_oas.app.before_request(self.__authenticate_request)
+            open_oas.pipeline.add_stage(
+                "authenticate", self.__authenticate_request
+            )
         else:
             return
 
@@ -28,7 +30,10 @@ class _RequestsAuthenticator:
             self.config.on_unauthenticated_handler
             or self._default_on_unauthenticated_handler
         )
-        self.row_oas = {}
+        open_oas.spec.on_swap(self.__clear_caches)
+
+    def __clear_caches(self, previous: dict):
+        self.__get_handler.cache_clear()
 
     def __set_on_unauthenticated_handler(self, handler):
         self.on_unauthenticated_handler = handler
@@ -39,27 +44,8 @@ class _RequestsAuthenticator:
             data["message"] = self.config.default_unauthorized_message
         return make_response(jsonify(data), HTTPStatus.UNAUTHORIZED)
 
-    def _get_root_security_scheme(self):
-        return _get_row_oas(self).get("security", [])
-
-    @lru_cache(maxsize=50)
-    def __get_path_security_requirements(self, path: str, method: str):
-        oas = _get_row_oas(self)
-        scheme = (
-            oas.get("paths", {})
-            .get(path, {})
-            .get(method.lower(), {})
-            .get("security", [])
-        )
-        if not scheme:
-            scheme = self._get_root_security_scheme()
-        scheme.sort(key=lambda s: 1 if len(s.keys()) > 1 else -1)
-        return scheme
-
-    def __authenticate_request(self):
-        path = rule_to_path(request.url_rule)
-        method = request.method
-        reqs: list = self.__get_path_security_requirements(path, method)
+    def __authenticate_request(self, context: "RequestContext"):
+        reqs: list = context.operation.security
         is_authenticated: bool = self.__is_authenticated(reqs)
         if not is_authenticated:
             return self.on_unauthenticated_handler()
@@ -95,13 +81,11 @@ class _RequestsAuthenticator:
                 res.append(self.__is_security_requirements_met(s))
             return True in res
 
+    def __get_scheme(self, scheme_name: str) -> dict:
+        return self.open_oas.operations.security_scheme(scheme_name)
+
     def __apply_scheme_handler(self, scheme_name: str):
-        scheme = (
-            _get_row_oas(self)
-            .get("components", {})
-            .get("securitySchemes", {})
-            .get(scheme_name, {})
-        )
+        scheme = self.__get_scheme(scheme_name)
         handler = self.__get_handler(scheme_name)
         if callable(handler):
             info = self.__parse_scheme_info(scheme)
@@ -116,13 +100,7 @@ class _RequestsAuthenticator:
 
     @lru_cache(maxsize=50)
     def __get_handler(self, scheme_name: str):
-        xhandler = (
-            _get_row_oas(self)
-            .get("components", {})
-            .get("securitySchemes", {})
-            .get(scheme_name, {})
-            .get("x-handler", None)
-        )
+        xhandler = self.__get_scheme(scheme_name).get("x-handler", None)
         if not xhandler:
             xhandler = self.config.is_authenticated_handler
         if isinstance(xhandler, str):
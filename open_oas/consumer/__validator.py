@@ -1,10 +1,7 @@
-from functools import lru_cache
 from http import HTTPStatus
 import json
 from logging import warning
 
-from pyrsistent import b
-from ..plugin.utils import resolve_schema_instance
 from typing import TYPE_CHECKING, Optional, cast
 from flask import abort, g, jsonify, make_response, request
 from flask.wrappers import Response
@@ -12,13 +9,9 @@ from marshmallow import Schema
 
 if TYPE_CHECKING:
     from ..open_oas import OpenOas
+    from ._pipeline import RequestContext
 
-from .._parameters import rule_to_path
-from ._utils import (
-    _resolve_oas_object,
-    _get_row_oas,
-    _get_request_body_data,
-)
+from ._utils import _get_request_body_data
 
 
 class __RequestsValidator:
@@ -26,74 +19,19 @@ class __RequestsValidator:
         self.open_oas = open_oas
         self.config = open_oas.config
         if self.config.validate_requests:
-            open_oas.app.before_request(self.__validate_request_body)
-        else:
-            return
-        self.row_oas = {}
-
-    # should have all keys to used as key for caching
-    @lru_cache(maxsize=50)
-    def __get_request_body_xschema(self, path: str, method: str, mimetype: str):
-        row_oas = _get_row_oas(self)
-
-        if method in ["get", "delete", "head"]:
-            return None, False
-        body = _resolve_oas_object(
-            row_oas,
-            (
-                row_oas.get("paths", {})
-                .get(path, {})
-                .get(method.lower(), {})
-                .get("requestBody", {})
-            ),
-            "rb",
-        )
-
-        if not body:
-            return None, False
-        is_required = body.get("required", False)
-
-        xschema = ""
-        body_content = body.get("content", {})
-        media_type_obj = {}
-
-        media_type_obj = body_content.get(mimetype, {})
-        if not media_type_obj:
-            body_content_keys = list(body_content.keys())
-            body_content_keys = [
-                k for k in body_content_keys if not k.startswith("x-")
-            ]
-            if len(body_content_keys) == 1:
-                mimetype = body_content_keys[0]
-                media_type_obj = body_content.get(mimetype, {})
-
-        """xschema_kwargs = row_oas["components"]["schemas"][schema_name][
-            "x-schema-kwargs"
-        ]"""
-        xschema = cast(
-            Schema,
-            media_type_obj.get("x-schema"),
-        )
-        if not xschema:
-            schema = body_content.get(mimetype, {}).get("schema")
-            if schema:
-                schema = _resolve_oas_object(row_oas, schema, "schema")
-                xschema = cast(
-                    Schema,
-                    body.get("content", {}).get(mimetype, {}).get("x-schema"),
-                )
-        return xschema, is_required
+            open_oas.pipeline.add_stage(
+                "validate_body", self.__validate_request_body
+            )
 
-    def __validate_request_body(self):
+    def __validate_request_body(self, context: "RequestContext"):
         if self.config.pre_validation_handler:
             self.config.pre_validation_handler()
 
         try:
             validation_errors = {}
-            xschema, is_required = self.__get_request_body_xschema(
-                rule_to_path(request.url_rule),
-                mimetype=request.mimetype,
-                method=request.method,
+            operation = context.operation
+            schema_ref, is_required = operation.request_body_schema(
+                request.mimetype
             )
             body_data = cast(dict, _get_request_body_data())
             if isinstance(
@@ -108,14 +46,14 @@ class __RequestsValidator:
                 except Exception:
                     pass
 
-            if xschema:
-                schema = resolve_schema_instance(xschema)
+            if schema_ref:
+                schema = schema_ref.instance()
 
                 validation_errors = schema.validate(
                     data=body_data,
                 )
             res = self.__post_validation(
-                xschema,
+                schema_ref,
                 is_required,
                 body_data,
                 validation_errors,
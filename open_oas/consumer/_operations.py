@@ -0,0 +1,312 @@
+import json
+import sys
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from werkzeug.routing import Rule
+
+from .._refs import RefIndex, path_pointer
+from ..plugin.utils import resolve_schema_instance
+from ._utils import _get_best_content, _get_operation
+
+if TYPE_CHECKING:
+    from ..open_oas import OpenOas
+
+
+_METHODS = frozenset(
+    ["get", "put", "post", "delete", "options", "head", "patch", "trace"]
+)
+
+
+def _intern(value) -> str:
+    return sys.intern(str(value))
+
+
+class SchemaRef:
+    """
+    The `x-schema` (qualname, class or instance) of a media type object and
+    its `x-schema-kwargs`, with the schema instance created on first use.
+    """
+
+    __slots__ = ("xschema", "kwargs", "_instance")
+
+    def __init__(self, xschema: Any, kwargs: dict = None) -> None:
+        self.xschema = _intern(xschema) if isinstance(xschema, str) else xschema
+        self.kwargs: dict = kwargs or {}
+        self._instance = None
+
+    def instance(self) -> Any:
+        if self._instance is None:
+            self._instance = resolve_schema_instance(
+                self.xschema, **self.kwargs
+            )
+        return self._instance
+
+    def __repr__(self) -> str:
+        return "SchemaRef({0!r}, {1!r})".format(self.xschema, self.kwargs)
+
+
+class _SchemaRefs:
+    """One `SchemaRef` per distinct x-schema and kwargs of a spec."""
+
+    def __init__(self) -> None:
+        self._refs: Dict[tuple, SchemaRef] = {}
+
+    def get(self, media_type_object: dict) -> Optional[SchemaRef]:
+        xschema = media_type_object.get("x-schema")
+        kwargs = media_type_object.get("x-schema-kwargs")
+        if not xschema:
+            schema = media_type_object.get("schema")
+            if isinstance(schema, dict):
+                xschema = schema.get("x-schema")
+                kwargs = kwargs or schema.get("x-schema-kwargs")
+        if not xschema:
+            return None
+        key = (
+            xschema if isinstance(xschema, str) else id(xschema),
+            json.dumps(kwargs, sort_keys=True, default=repr) if kwargs else "",
+        )
+        ref = self._refs.get(key)
+        if ref is None:
+            ref = self._refs[key] = SchemaRef(xschema, kwargs)
+        return ref
+
+    def content(self, content: Any) -> Dict[str, tuple]:
+        """
+        mimetype -> (SchemaRef or None,) of a dereferenced content object.
+        An empty media type object maps to (), so `_get_best_content` skips
+        the same entries it skips in the document.
+        """
+        if not isinstance(content, dict):
+            return {}
+        return {
+            _intern(mimetype): (self.get(obj),)
+            if isinstance(obj, dict) and obj
+            else ()
+            for mimetype, obj in content.items()
+            if not str(mimetype).startswith("x-")
+        }
+
+
+def _status_keys(status: HTTPStatus) -> Tuple[str, ...]:
+    """Response keys matching `status`, best first."""
+    code = str(int(status))
+    return (code, code[0] + "XX", code[0] + "xx", "default")
+
+
+class Parameter:
+    __slots__ = ("name", "location", "required", "schema")
+
+    def __init__(self, param: dict) -> None:
+        self.name: str = _intern(param["name"])
+        self.location: str = _intern(param.get("in", ""))
+        self.required: bool = bool(param.get("required", False))
+        self.schema: Optional[dict] = param.get("schema")
+
+    def __repr__(self) -> str:
+        return "Parameter({0!r}, {1!r})".format(self.location, self.name)
+
+
+class Operation:
+    """
+    What the consumers need about one operation of the spec, compiled once:
+    its security requirements and parameters, and the `SchemaRef` of the
+    request body and of the responses by status and media type, so a
+    request never reads the components of the document. Nothing else of the
+    document is kept, so it can be dropped once every operation is compiled
+    (see `OasConfig.keep_spec_data`).
+
+    The operations of a table share their `SchemaRef`s through `refs`.
+    """
+
+    __slots__ = (
+        "path",
+        "method",
+        "security",
+        "parameters",
+        "body_required",
+        "body_content",
+        "responses",
+    )
+
+    def __init__(
+        self,
+        oas_data: dict,
+        path: str,
+        method: str,
+        refs: _SchemaRefs = None,
+        index: RefIndex = None,
+    ) -> None:
+        self.path: str = _intern(path)
+        self.method: str = _intern(method.lower())
+        if refs is None:
+            refs = _SchemaRefs()
+        if index is None:
+            index = RefIndex(oas_data)
+        operation = _get_operation(oas_data, path, self.method, index)
+
+        security = operation.get("security") or oas_data.get("security", [])
+        # requirements with one scheme first
+        self.security: list = sorted(
+            security, key=lambda s: 1 if len(s.keys()) > 1 else -1
+        )
+        self.parameters: Tuple[Parameter, ...] = self.__compile_parameters(
+            index, operation
+        )
+
+        body = operation.get("requestBody")
+        if self.method in ["get", "delete", "head"] or not body:
+            body = {}
+        self.body_required: bool = bool(body.get("required", False))
+        self.body_content = refs.content(body.get("content"))
+
+        self.responses: Dict[str, Dict[str, tuple]] = {
+            _intern(status): refs.content(response.get("content"))
+            for status, response in operation.get("responses", {}).items()
+            if isinstance(response, dict) and response
+        }
+
+    def __compile_parameters(
+        self, index: RefIndex, operation: dict
+    ) -> Tuple[Parameter, ...]:
+        if not operation:
+            return ()
+        path_item = index.pointer(path_pointer("paths", self.path)) or {}
+        params: Dict[Tuple[str, str], Parameter] = {}
+        # the operation parameters override the path ones
+        for param in [
+            *path_item.get("parameters", []),
+            *operation.get("parameters", []),
+        ]:
+            param = index.resolve(param)
+            if isinstance(param, dict) and "name" in param:
+                compiled = Parameter(param)
+                params[(compiled.location, compiled.name)] = compiled
+        return tuple(params.values())
+
+    def request_body_schema(
+        self, mimetype: str
+    ) -> Tuple[Optional[SchemaRef], bool]:
+        """Schema of the request body for `mimetype`, and if it's required"""
+        if not self.body_content:
+            return None, False
+        entry = self.body_content.get(mimetype)
+        if not entry and len(self.body_content) == 1:
+            entry = next(iter(self.body_content.values()))
+        return (entry[0] if entry else None), self.body_required
+
+    def response_schema(
+        self, status: HTTPStatus, mimetype: str, accepts: str = ""
+    ) -> Optional[SchemaRef]:
+        """Schema of the best matching response"""
+        for key in _status_keys(status):
+            if key in self.responses:
+                entry = _get_best_content(
+                    self.responses[key], mimetype, accepts
+                )
+                return entry[0] if entry else None
+        return None
+
+
+class OperationTable:
+    """
+    `Operation` records of the current spec, keyed by url rule identity and
+    method, so a request finds its operation with one dictionary lookup.
+
+    `compile` fills the table for every operation of the spec after a build
+    or a load; the table is emptied whenever the spec is swapped.
+    """
+
+    def __init__(self, open_oas: "OpenOas") -> None:
+        self.open_oas = open_oas
+        self.clear()
+        open_oas.spec.on_swap(self.clear)
+
+    def clear(self, previous: Optional[dict] = None):
+        self._by_rule: Dict[Tuple[int, str], Operation] = {}
+        self._by_path: Dict[Tuple[str, str], Operation] = {}
+        self._refs = _SchemaRefs()
+        self._schemes: Optional[Dict[str, dict]] = None
+        # what an operation missing from the spec reads of the document,
+        # once the document is released
+        self._released: dict = {}
+
+    def operation(self, path: str, method: str) -> Operation:
+        key = (path, method.lower())
+        record = self._by_path.get(key)
+        if record is None:
+            spec = self.open_oas.spec
+            record = Operation(
+                # every operation of the spec is compiled before the
+                # document is released, the others only get its security
+                spec.data or self._released,
+                path,
+                method,
+                self._refs,
+                spec.ref_index() if spec.data else None,
+            )
+            self._by_path[key] = record
+        return record
+
+    def get(self, rule: Rule, method: str) -> Operation:
+        key = (id(rule), method)
+        record = self._by_rule.get(key)
+        metrics = self.open_oas.metrics
+        if metrics is not None:
+            metrics.cache("operations", record is not None)
+        if record is None:
+            record = self.__add(rule, method)
+        return record
+
+    def __add(self, rule: Rule, method: str) -> Operation:
+        path = self.open_oas.routes.path_of(rule)
+        record = self.operation(path, method)
+        self._by_rule[(id(rule), method)] = record
+        return record
+
+    def security_scheme(self, name: str) -> dict:
+        """The dereferenced security scheme object named `name`."""
+        if self._schemes is None:
+            self.__compile_schemes()
+        return self._schemes.get(name, {})
+
+    def __compile_schemes(self, index: RefIndex = None):
+        data = self.open_oas.spec.data
+        if index is None:
+            index = self.open_oas.spec.ref_index()
+        schemes = data.get("components", {}).get("securitySchemes", {})
+        self._schemes = {
+            _intern(k): index.resolve(v) or {} for k, v in schemes.items()
+        }
+
+    def compile(self):
+        """
+        Create the records of every operation of the spec, and index those
+        of the current routes. Routes added later find their records by
+        path, even once the document is released.
+
+        The dereferenced operations are only needed while compiling, they
+        are resolved through an index dropped afterwards.
+        """
+        data = self.open_oas.spec.data
+        index = RefIndex(data)
+        paths = data.get("paths", {})
+        for path, path_item in paths.items():
+            if not isinstance(path_item, dict):
+                continue
+            for method in path_item:
+                key = (path, method)
+                if method in _METHODS and key not in self._by_path:
+                    self._by_path[key] = Operation(
+                        data, path, method, self._refs, index
+                    )
+        for route in self.open_oas.routes.routes:
+            path_item = paths.get(route.path)
+            if not path_item:
+                continue
+            for method in route.methods:
+                if method in path_item:
+                    self.__add(route.rule, method.upper())
+        self.__compile_schemes(index)
+        if "security" in data:
+            self._released = {"security": data["security"]}
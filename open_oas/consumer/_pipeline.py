@@ -0,0 +1,95 @@
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from flask import g, request
+
+from ._operations import Operation
+
+if TYPE_CHECKING:
+    from ..open_oas import OpenOas
+
+Stage = Callable[["RequestContext"], Optional[object]]
+StageCondition = Callable[[Operation], bool]
+
+
+class RequestContext:
+    """State shared by the stages run for one request."""
+
+    def __init__(self, operation: Operation) -> None:
+        self.operation = operation
+        # stage name -> seconds
+        self.timings: Dict[str, float] = {}
+
+
+class RequestPipeline:
+    """
+    One `before_request` hook running the request stages of the consumers
+    (authentication, body validation, custom hooks) in order.
+
+    The operation of the request is looked up once and passed to each stage
+    in a `RequestContext`, also available as `g.oas_request`. A stage
+    returning something other than None ends the request with it.
+    A stage registered with `when` only runs for the operations it accepts;
+    the stages of each operation are selected once per spec.
+    The hook is only installed with the first stage.
+    """
+
+    def __init__(self, open_oas: "OpenOas") -> None:
+        self.open_oas = open_oas
+        self.stages: List[Tuple[str, Stage, Optional[StageCondition]]] = []
+        self._plans: Dict[int, List[Tuple[str, Stage]]] = {}
+        self.__installed = False
+        open_oas.spec.on_swap(self.__clear_plans)
+
+    def __clear_plans(self, previous: dict = None):
+        self._plans = {}
+
+    def add_stage(
+        self,
+        name: str,
+        stage: Stage,
+        when: StageCondition = None,
+        index: int = None,
+    ):
+        if index is None:
+            index = len(self.stages)
+        self.stages.insert(index, (name, stage, when))
+        self.__clear_plans()
+        if not self.__installed:
+            self.open_oas.app.before_request(self.run)
+            self.__installed = True
+        return stage
+
+    def plan(self, operation: Operation) -> List[Tuple[str, Stage]]:
+        key = id(operation)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = [
+                (name, stage)
+                for name, stage, when in self.stages
+                if when is None or when(operation)
+            ]
+            self._plans[key] = plan
+        return plan
+
+    def run(self):
+        rule = request.url_rule
+        if rule is None:
+            # no matching route, flask answers with the routing error
+            return None
+        operation = self.open_oas.operations.get(rule, request.method)
+        context = RequestContext(operation)
+        g.oas_request = context
+        metrics = self.open_oas.metrics
+        for name, stage in self.plan(operation):
+            started = perf_counter()
+            outcome = "error"
+            try:
+                rv = stage(context)
+                outcome = "ok" if rv is None else "rejected"
+            finally:
+                elapsed = context.timings[name] = perf_counter() - started
+                if metrics is not None:
+                    metrics.observe(name, request.endpoint, elapsed, outcome)
+            if rv is not None:
+                return rv
@@ -5,6 +5,8 @@ from werkzeug.datastructures import Headers
 
 from werkzeug.wrappers import Response as BaseResponse
 
+from .._refs import RefIndex
+
 
 def _resolve_oas_object(
     oas_data: dict,
@@ -13,27 +15,38 @@ def _resolve_oas_object(
         "schema",
         "rb",
         "response",
+        "parameter",
+        "header",
+        "example",
     ] = None,
+    index: RefIndex = None,
 ):
+    """
+    `obj`, or the object its `$ref` points to. Pass the `index` of
+    `oas_data` (`SpecHolder.ref_index`) to avoid indexing it again.
+    """
     if not type_:
         raise RuntimeError("Type should specified")
     if not obj or not isinstance(obj, dict):
         return obj
 
-    ref = obj.get("$ref", None)
-
-    if ref:
-        _map = {
-            "schema": "schemas",
-            "rb": "requestBodies",
-            "response": "responses",
-        }
-        rv = ref.split(f"#/components/{_map[type_]}/")[-1]
-        obj = oas_data.get("components", {}).get(_map[type_], {}).get(rv, {})
-        return obj
+    if obj.get("$ref", None):
+        if index is None:
+            index = RefIndex(oas_data)
+        rv = index.resolve(obj)
+        return rv if rv is not None else {}
     return obj
 
 
+def _get_operation(
+    oas_data: dict, path: str, method: str, index: RefIndex = None
+) -> dict:
+    """Dereferenced operation object, memoized by `index`."""
+    if index is None:
+        index = RefIndex(oas_data)
+    return index.operation(path, method) or {}
+
+
 def _parse_headers(headers: Union[dict, list, tuple, Headers]) -> Headers:
     """
     ``headers`` is Header or a dictionary or a list of ``(key, value)``
@@ -100,13 +113,18 @@ def _get_mimetype(content_keys: list, accepts: str) -> str:
 def _get_best_media_type_object(
     response_object: dict, mimetype: str, accepts: str = ""
 ):
+    # response object is dictionary of description, content
+    return _get_best_content(
+        response_object.get("content", {}), mimetype, accepts
+    )
+
+
+def _get_best_content(content: dict, mimetype: str, accepts: str = ""):
+    """Value of `content` (mimetype -> value) best matching the response."""
     if mimetype is None:
         mimetype = ""
     if accepts is None:
         accepts = ""
-    # response object is dictionary of description, content
-    content = response_object.get("content", {})
-    # content is dictionary of mimetype to schema
     content_keys = list(content.keys())
     if not content_keys:
         return None
@@ -125,14 +143,6 @@ def _get_best_media_type_object(
     return media_type_object
 
 
-def _get_row_oas(obj):
-    if obj.row_oas:
-        return obj.row_oas
-    else:
-        obj.row_oas = obj.open_oas.oas_data
-    return obj.row_oas
-
-
 def _parse_view_function_res(rv, response_class: Type, default_mime_type: str):
 
     if (
@@ -1,12 +1,164 @@
+from contextlib import contextmanager
 from functools import wraps
+import sys
 
 # from .builder import oas_builder
-from typing import Any, List, Literal, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Union,
+)
 from ._parameters import VALID_METHODS_OPENAPI_V3, app_path_oas_path
 
 
+def _freeze(value) -> Hashable:
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(
+                sorted(
+                    ((repr(k), _freeze(v)) for k, v in value.items()),
+                    key=lambda item: item[0],
+                )
+            ),
+        )
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_freeze(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_freeze(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+    # keep True and 1 apart
+    return (type(value).__name__, value)
+
+
+def _declaring_module() -> Optional[str]:
+    """Name of the module calling into this one."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals.get("__name__") == __name__:
+        frame = frame.f_back
+    return frame.f_globals.get("__name__") if frame is not None else None
+
+
+class DeferredRegistry:
+    """
+    Ordered registry of the deferred `OasBuilder` calls made by the decorators.
+
+    Each entry is a tuple of (builder method name, args, kwargs). Entries with
+    the same call signature are stored once, at the position of the first one,
+    so importing a module twice or building many times doesn't grow the
+    registry.
+
+    The modules declaring each entry are recorded, so `discard_modules` can
+    drop the declarations of a module before it's reloaded.
+    """
+
+    def __init__(self, entries: Iterable[tuple] = ()) -> None:
+        self._entries: Dict[Hashable, tuple] = {}
+        # entry key -> names of the modules declaring it
+        self._modules: Dict[Hashable, Set[Optional[str]]] = {}
+        self._snapshot: Optional[tuple] = None
+        self.frozen = False
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry: tuple):
+        if self.frozen:
+            raise RuntimeError(
+                "Can't add oas declarations to a frozen registry"
+            )
+        attr_name, args, kwargs = entry
+        key = (attr_name, _freeze(args), _freeze(kwargs))
+        if key not in self._entries:
+            self._entries[key] = entry
+            self._snapshot = None
+        self._modules.setdefault(key, set()).add(_declaring_module())
+
+    def modules(self) -> Set[Optional[str]]:
+        """Names of the modules declaring the entries."""
+        return set().union(*self._modules.values())
+
+    def discard_modules(self, names: Iterable[str]) -> int:
+        """
+        Drop the entries declared by the modules `names` only, return how
+        many were dropped.
+        """
+        names = set(names)
+        dropped = 0
+        for key, modules in list(self._modules.items()):
+            if not modules & names:
+                continue
+            if self.frozen:
+                raise RuntimeError(
+                    "Can't drop oas declarations from a frozen registry"
+                )
+            modules -= names
+            if not modules:
+                del self._modules[key]
+                del self._entries[key]
+                dropped += 1
+        if dropped:
+            self._snapshot = None
+        return dropped
+
+    def extend(self, entries: Iterable[tuple]):
+        for entry in entries:
+            self.append(entry)
+
+    def snapshot(self) -> tuple:
+        """Current entries, the tuple is reused until the registry changes."""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._entries.values())
+        return self._snapshot
+
+    def freeze(self) -> tuple:
+        """Reject any further declaration and return the final snapshot."""
+        self.frozen = True
+        return self.snapshot()
+
+    def clear(self):
+        self._entries.clear()
+        self._modules.clear()
+        self._snapshot = None
+        self.frozen = False
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class Deferred:
-    _deferred = []
+    """
+    Holds the registry the decorators write to. It is global by default, use
+    `scope` to collect the declarations of one app in their own registry:
+
+    >>> with Deferred.scope() as registry:
+    ...     import my_app.views
+    >>> OpenOas(app, deferred=registry)
+    """
+
+    _deferred = DeferredRegistry()
+
+    @classmethod
+    @contextmanager
+    def scope(cls, registry: DeferredRegistry = None):
+        registry = registry if registry is not None else DeferredRegistry()
+        previous = cls._deferred
+        cls._deferred = registry
+        try:
+            yield registry
+        finally:
+            cls._deferred = previous
 
 
 def api_info(
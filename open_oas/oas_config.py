@@ -1,5 +1,5 @@
 import os
-from typing import Callable, List
+from typing import Callable, List, Union
 from flask import Flask, current_app
 from ._utils import load_file, yaml_dump
 
@@ -10,9 +10,19 @@ class Defaults:
     version = "1.0.0"
     debug = False
     validate_on_build = True
+    validation_cache = True
     cache_on_build = True
+    cache_max_entries = 20
+    cache_max_age = None
+    build_workers = 1
+    schema_cache = False
     save_sections_files = True
     auto_build = False
+    prebuilt = False
+    freeze_spec = False
+    keep_spec_data = True
+    reload_signal = None
+    reload_interval = None
     #
     blueprint_name = "oas_bp"
     blueprint_url_prefix = "/oas"
@@ -20,9 +30,23 @@ class Defaults:
     register_json_route = True
     json_endpoint = "oas_json"
     json_url = "/oas-json"
+    register_partial_route = False
+    partial_endpoint = "oas_partial"
+    partial_url = "/oas-json/partial"
+    partial_cache_size = 128
     register_ui_route = True
     ui_endpoint = "oas_ui"
     ui_url = "/oas-ui"
+    ui_assets_max_age = 31536000
+    register_reload_route = False
+    reload_endpoint = "oas_reload"
+    reload_url = "/oas-reload"
+    register_metrics_route = False
+    metrics_endpoint = "oas_metrics"
+    metrics_url = "/oas-metrics"
+    metrics_handler = None
+    metrics_statsd = None
+    metrics_prefix = "open_oas"
     #
     validate_requests = False
     authenticate_requests = False
@@ -44,6 +68,7 @@ class Defaults:
 
     #
     final_file_name = "final_oas.yaml"
+    final_artifact_file_name = "final_oas.json"
     sections_file_name = "oas_sections.yaml"
     components_file_name = "oas_components.yaml"
     ##
@@ -76,9 +101,28 @@ _config_map = {
     "DEBUG": "debug",
     "OAS_VERSION": "version",
     "OAS_VALIDATE_ON_BUILD": "validate_on_build",
+    "OAS_VALIDATION_CACHE": "validation_cache",
     "OAS_CACHE_ON_BUILD": "cache_on_build",
+    "OAS_CACHE_MAX_ENTRIES": "cache_max_entries",
+    "OAS_CACHE_MAX_AGE": "cache_max_age",
+    "OAS_BUILD_WORKERS": "build_workers",
+    "OAS_SCHEMA_CACHE": "schema_cache",
     "OAS_FILE_SAVE": "save_sections_files",
     "OAS_AUTO_BUILD": "auto_build",
+    "OAS_PREBUILT": "prebuilt",
+    "OAS_FREEZE_SPEC": "freeze_spec",
+    "OAS_KEEP_SPEC_DATA": "keep_spec_data",
+    "OAS_RELOAD_SIGNAL": "reload_signal",
+    "OAS_RELOAD_INTERVAL": "reload_interval",
+    "OAS_REGISTER_RELOAD_ROUTE": "register_reload_route",
+    "OAS_RELOAD_ENDPOINT": "reload_endpoint",
+    "OAS_RELOAD_URL": "reload_url",
+    "OAS_REGISTER_METRICS_ROUTE": "register_metrics_route",
+    "OAS_METRICS_ENDPOINT": "metrics_endpoint",
+    "OAS_METRICS_URL": "metrics_url",
+    "OAS_METRICS_HANDLER": "metrics_handler",
+    "OAS_METRICS_STATSD": "metrics_statsd",
+    "OAS_METRICS_PREFIX": "metrics_prefix",
     "OAS_VALIDATE_REQUESTS": "validate_requests",
     "OAS_AUTHENTICATE_REQUESTS": "authenticate_requests",
     "OAS_IS_AUTHENTICATED_HANDLER": "is_authenticated_handler",
@@ -94,8 +138,13 @@ _config_map = {
     "OAS_REGISTER_UI_ROUTE": "register_ui_route",
     "OAS_JSON_URL": "json_url",
     "OAS_JSON_ENDPOINT": "json_endpoint",
+    "OAS_REGISTER_PARTIAL_ROUTE": "register_partial_route",
+    "OAS_PARTIAL_ENDPOINT": "partial_endpoint",
+    "OAS_PARTIAL_URL": "partial_url",
+    "OAS_PARTIAL_CACHE_SIZE": "partial_cache_size",
     "OAS_UI_ENDPOINT": "ui_endpoint",
     "OAS_UI_URL": "ui_url",
+    "OAS_UI_ASSETS_MAX_AGE": "ui_assets_max_age",
     "OAS_ROOT_DIR": "root_dir",
     "OAS_DIR": "oas_dirname",
     "OAS_FRAGMENTS_DIRNAME": "fragments_dir_name",
@@ -104,6 +153,7 @@ _config_map = {
     "OAS_COMPONENTS_FILENAME": "components_file_name",
     "OAS_PATHS_DIR": "paths_dir_name",
     "OAS_FINAL_FILENAME": "final_file_name",
+    "OAS_FINAL_ARTIFACT_FILENAME": "final_artifact_file_name",
     "OAS_OVERRIDE_FILENAME": "override_dir_name",
     "OAS_LONG_STUB": "use_long_stubs",
     "OAS_FILES_LOCATOR": "oas_files_locator",
@@ -125,10 +175,45 @@ class OasConfig:
      version: oas api version
      debug: whether to show debug options
      validate_on_build: validate the oas data , raise exception if oas data has error.
+        Set it to "background" to validate in a thread after the build, errors are logged then.
+     validation_cache: skip validating specs that were validated before, and validate only the changed
+        path items of a changed spec. The hashes are stored in the `cache` dir.
+        default: True
      cache_on_build: cache the old files of oas rather than overwriting them.
+        Snapshots are stored once per content hash in the `cache` dir.
+     cache_max_entries: maximum number of snapshots kept in the `cache` dir, None for no limit.
+        default: 20
+     cache_max_age: snapshots not taken again for this number of seconds are removed, None for no limit.
+        default: None
+     build_workers: number of processes converting the marshmallow schemas of `components.schemas`
+        at build time. The workers are forked, so the schemas don't need to be picklable; where fork
+        isn't available the schemas are converted in the build process.
+        default: 1
+     schema_cache: reuse the json schemas of the component schemas converted by previous builds, stored in
+        the `cache` dir. A schema is converted again when its fields, Meta options, kwargs or the
+        apispec/marshmallow versions change; changes to the code of custom fields aren't detected.
+        default: False
      save_sections_files: wheather to save the sections file or not, The sections file contain:
         ["openapi", "tags", "externalDocs", "servers", "info"]
      auto_build: if true, open_oas.build() method will be invoked before the first request.
+     prebuilt: if true, the oas data is loaded from the files produced by `flask oas build` when
+        the extension is initialized. Nothing is built or written at runtime and `auto_build` is ignored.
+        default: False
+     freeze_spec: if true, the loaded oas data is moved to the permanent generation of the garbage
+        collector (`gc.freeze()`). Load the app in the master process (e.g. gunicorn `preload_app`)
+        so the forked workers share the spec pages copy-on-write instead of each one touching them.
+        Only the initial prebuilt load is frozen, not the reloads.
+        default: False
+     keep_spec_data: if false, once the oas data is built or loaded and compiled for the consumers,
+        only the compiled operations and the serialized json of the spec route are kept in memory.
+        `OpenOas.oas_data` then parses the json again on each access.
+        default: True
+     reload_signal: name of a signal (e.g. "SIGUSR2") that makes the process reload the built oas data,
+        before its next request.
+        default: None
+     reload_interval: if set, the final oas file is checked for changes at most once per this number of
+        seconds, before requests. A changed file is reloaded.
+        default: None
      #
      register_blueprint: register blueprint contains 2 endpoint, one for oas json and the other
         for oas ui.
@@ -139,10 +224,39 @@ class OasConfig:
      default is True
      json_endpoint: default: oas_json
      json_url: the url for the oas json route. default: /oas-json
+     register_partial_route: register a route serving parts of the oas json: the operations matching
+        its `tag`, `path` (prefix) and `operationId` query parameters, and only the components they refer
+        to. Each parameter may be repeated, operations must match one value of each given parameter.
+        It is protected by the `authorization_handler` passed to `OpenOas` and answers 403 without one.
+        default: False
+     partial_endpoint: default: oas_partial
+     partial_url: default: /oas-json/partial
+     partial_cache_size: number of serialized parts kept in memory. default: 128
      register_ui_route: register the ui route endpoint or not.
      default is True
      ui_endpoint: The endpoint of the ui route. default: oas_ui
      ui_url: The url for the ui_endpoint default: ui_url
+     ui_assets_max_age: cache lifetime in seconds of the fingerprinted Swagger UI assets, served
+        with their hash in their name under `<blueprint_url_prefix>/assets/`.
+        default: 31536000
+     register_reload_route: register a POST route that reloads the built oas data. It is protected by the
+        `authorization_handler` passed to `OpenOas` and answers 403 without one. A POST only reloads the
+        worker process that receives it, use reload_signal or reload_interval to reload every worker.
+        default: False
+     reload_endpoint: default: oas_reload
+     reload_url: default: /oas-reload
+     register_metrics_route: register a route serving the request metrics in the Prometheus text format.
+        It is protected by the `authorization_handler` passed to `OpenOas`.
+        default: False
+     metrics_endpoint: default: oas_metrics
+     metrics_url: default: /oas-metrics
+     metrics_handler: function (or its qual name) called with (name, endpoint, seconds, outcome) after each
+        request stage (authenticate, validate_body, serialize...). outcome is one of "ok", "rejected", "error".
+        default: None
+     metrics_statsd: "host:port" of a StatsD server the stage timings and failures are sent to over UDP.
+        default: None
+     metrics_prefix: prefix of the metric names. default: open_oas
+        Metrics are only collected if one of metrics_handler, metrics_statsd or register_metrics_route is set.
      #
      validate_requests: validate incoming requests by the provided schema in `requestBody` attr
       of the corresponding `paths`:`path`:`method`
@@ -195,6 +309,9 @@ class OasConfig:
         default : oas_components.yaml
     final_file_name: The name of the file that will contain whole oas data after processing it.
     default: final_oas.yaml
+    final_artifact_file_name: The name of the json file written beside the final file. It holds the same data
+    and the hash of the final file, so the oas data can be loaded without parsing yaml.
+    default: final_oas.json
 
     use_long_stubs: use long templates instead of short ones.
     default: False
@@ -218,10 +335,20 @@ class OasConfig:
     title: str
     version: str
     debug: bool
-    validate_on_build: bool
+    validate_on_build: Union[bool, str]
+    validation_cache: bool
     cache_on_build: bool
+    cache_max_entries: int
+    cache_max_age: float
+    build_workers: int
+    schema_cache: bool
     save_sections_files: bool
     auto_build: bool
+    prebuilt: bool
+    freeze_spec: bool
+    keep_spec_data: bool
+    reload_signal: str
+    reload_interval: float
     #
     register_blueprint: bool  # = True
     blueprint_name: str  # = "spec_bp"
@@ -230,8 +357,22 @@ class OasConfig:
     register_ui_route: bool
     json_url: str
     json_endpoint: str
+    register_partial_route: bool
+    partial_endpoint: str
+    partial_url: str
+    partial_cache_size: int
     ui_endpoint: str
     ui_url: str
+    ui_assets_max_age: int
+    register_reload_route: bool
+    reload_endpoint: str
+    reload_url: str
+    register_metrics_route: bool
+    metrics_endpoint: str
+    metrics_url: str
+    metrics_handler: Union[Callable, str]
+    metrics_statsd: str
+    metrics_prefix: str
     #
     validate_requests: bool
     # TODO: on_invalid _request_handler
@@ -261,6 +402,7 @@ class OasConfig:
     paths_dir_name: str
     # paths_dir_path: str
     final_file_name: str
+    final_artifact_file_name: str
     #
     use_long_stubs: bool
     #
@@ -290,7 +432,9 @@ class OasConfig:
                 )
                 setattr(self, attr, val)
 
-            if self.validate_requests or self.serialize_response:
+            if self.prebuilt:
+                self.auto_build = False
+            elif self.validate_requests or self.serialize_response:
                 self.auto_build = True
 
             self.allowed_methods = [
@@ -307,6 +451,12 @@ class OasConfig:
         self.cache_dir_path = os.path.join(
             self.oas_dir_path, self.cache_dir_name
         )
+        self.validation_cache_path = os.path.join(
+            self.cache_dir_path, "validation.json"
+        )
+        self.schema_cache_path = os.path.join(
+            self.cache_dir_path, "schemas.json"
+        )
         self.paths_dir_path = os.path.join(
             self.fragments_dir_path, self.paths_dir_name
         )
@@ -317,6 +467,10 @@ class OasConfig:
         self.final_file_path = os.path.join(
             self.oas_dir_path, self.final_file_name
         )
+        self.lock_file_path = os.path.join(self.oas_dir_path, ".build.lock")
+        self.final_artifact_path = os.path.join(
+            self.oas_dir_path, self.final_artifact_file_name
+        )
         self.sections_file_path = os.path.join(
             self.fragments_dir_path, self.sections_file_name
         )
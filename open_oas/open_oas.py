@@ -1,12 +1,13 @@
 import os
+import signal
+import time
 from typing import Callable
 
 import click
 from flask import Flask
-from flask.cli import AppGroup
-from openapi_spec_validator import validate_spec
+from flask.cli import AppGroup, ScriptInfo
+from threading import Thread
 
-from .__loader import __load_data, _OpenOas__load_data  # noqa
 from .consumer.__serializer import (  # noqa
     __ResponseSerializer,
     _OpenOas__ResponseSerializer,
@@ -20,12 +21,36 @@ from .consumer.__authenticator import (  # noqa
 )  # noqa
 from .__view import __ViewManager, _OpenOas__ViewManager  # noqa
 from ._editor import TemplatesEditor
-from ._parameters import get_app_paths
-from ._utils import cache_file, yaml_dump
+from ._parameters import RouteInventory
+from ._utils import (
+    dump_artifact,
+    file_lock,
+    freeze_objects,
+    load_spec,
+    yaml_dump,
+)
+from ._cache import SnapshotStore
+from ._metrics import Metrics
+from ._profile import BuildProfiler, phase
+from .consumer._operations import OperationTable
+from ._partial import PartialSpecs
+from .consumer._pipeline import RequestPipeline
+from .decorators import DeferredRegistry
+from ._spec import SpecHolder
+from ._validation import validate_spec_cached
+from ._watcher import Watcher, app_module_files, reload_modules, restart
 from .oas_config import OasConfig
 from ._editor import make_template_data
 
 
+def _load_data(*args, **kwargs):
+    # the builder imports apispec and marshmallow's plugin, only needed to
+    # build: an app serving a prebuilt spec never imports them
+    from .__loader import __load_data
+
+    return __load_data(*args, **kwargs)
+
+
 def set_cli(open_oas: "OpenOas"):
     oas_cli = AppGroup(
         "oas",
@@ -40,8 +65,101 @@ def set_cli(open_oas: "OpenOas"):
     )
     @click.option("--validate", type=bool, default=True)
     @click.option("--cache", type=bool, default=True)
-    def build(validate, cache):
-        open_oas.build(validate=validate, cache=cache)
+    @click.option(
+        "--profile",
+        is_flag=True,
+        default=False,
+        help="Report the time and memory of each build phase.",
+    )
+    @click.option(
+        "--profile-output",
+        type=click.Path(dir_okay=False),
+        default=None,
+        help="Write the profile report to this JSON file.",
+    )
+    def build(validate, cache, profile, profile_output):
+        if not (profile or profile_output):
+            open_oas.build(validate=validate, cache=cache)
+            return
+        with BuildProfiler() as profiler:
+            open_oas.build(validate=validate, cache=cache)
+        click.echo(profiler.format())
+        if profile_output:
+            profiler.dump(profile_output)
+
+    @oas_cli.command(
+        "validate",
+        help="Validate the built OAS file. Use it as a separate CI step when builds run with `--validate false`.",
+    )
+    @click.option("--cache", type=bool, default=False)
+    def validate(cache):
+        open_oas.validate(open_oas.load(), use_cache=cache)
+        click.echo("{0} is valid".format(open_oas.config.final_file_path))
+
+    @oas_cli.command(
+        "watch",
+        help="Rebuild the OAS file when the overrides, the fragments or the python modules of the app change.",
+    )
+    @click.option("--interval", type=float, default=0.2)
+    @click.option("--debounce", type=float, default=0.3)
+    @click.option(
+        "--path",
+        "paths",
+        multiple=True,
+        help="Extra file or directory to watch, may be repeated.",
+    )
+    def watch(interval, debounce, paths):
+        script_info = click.get_current_context().find_object(ScriptInfo)
+
+        def rebuild(changed):
+            started = time.monotonic()
+            try:
+                _, outdated = reload_modules(
+                    changed, open_oas.deferred, open_oas.app
+                )
+                if outdated:
+                    click.echo(
+                        "Routes of {0} changed, restarting".format(
+                            ", ".join(outdated)
+                        )
+                    )
+                    args = ["oas", "watch", "--interval", str(interval)]
+                    args += ["--debounce", str(debounce)]
+                    for path in paths:
+                        args += ["--path", path]
+                    restart(
+                        args,
+                        script_info.app_import_path if script_info else None,
+                    )
+                    return
+                open_oas.build(changed_files=changed)
+            except Exception as e:
+                click.echo("Build failed: {0}".format(e), err=True)
+                return
+            click.echo(
+                "Rebuilt {0} changed file(s) in {1:.0f} ms".format(
+                    len(changed), (time.monotonic() - started) * 1000
+                )
+            )
+
+        open_oas.build()
+        # the modules imported later, by the app or a rebuild, are picked up
+        watcher = Watcher(
+            lambda: [
+                open_oas.config.overrides_dir_path,
+                open_oas.config.fragments_dir_path,
+                *app_module_files(open_oas.app.root_path),
+                *paths,
+            ],
+            rebuild,
+            interval=interval,
+            debounce=debounce,
+        )
+        click.echo("Watching for changes, press CTRL+C to quit")
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            watcher.stop()
 
     open_oas.app.cli.add_command(oas_cli)
 
@@ -57,10 +175,19 @@ class OpenOas:
         authorization_handler: Callable = None,
         config_data: dict = {},
         config_obj: OasConfig = None,
+        deferred: DeferredRegistry = None,
     ) -> None:
         self._app_paths = {}
+        self.__routes: RouteInventory = None
+        self._editor: TemplatesEditor = None
         self.input_oas_data = oas_data
-        self.oas_data = {}
+        # None: the global registry, read at build time
+        self.deferred = deferred
+        self.spec = SpecHolder()
+        self.__spec_mtime = None
+        self.__spec_checked_at = 0.0
+        # set by the reload signal handler
+        self.__reload_requested = False
 
         if app:
             self.init_app(
@@ -82,13 +209,26 @@ class OpenOas:
         authorization_handler: Callable = None,
         config_data: dict = {},
         config_obj: OasConfig = None,
+        deferred: DeferredRegistry = None,
     ):
         self.app = app
+        if deferred is not None:
+            self.deferred = deferred
         if config_obj:
             self.config: OasConfig = config_obj
         else:
             self.config: OasConfig = OasConfig(app, config_data)
         #
+        self.snapshots = SnapshotStore(
+            self.config.cache_dir_path,
+            max_entries=self.config.cache_max_entries,
+            max_age=self.config.cache_max_age,
+        )
+        # None when no metrics sink is configured
+        self.metrics = Metrics.from_config(self.config)
+        self.operations = OperationTable(self)
+        self.partials = PartialSpecs(self, self.config.partial_cache_size)
+        self.pipeline = RequestPipeline(self)
         self.__view_manager = __ViewManager(
             self,
             blueprint_name=blueprint_name,
@@ -97,46 +237,219 @@ class OpenOas:
             auto_build=auto_build,
             authorization_handler=authorization_handler,
         )
+        if self.config.reload_signal:
+            self.__install_reload_signal(self.config.reload_signal)
+            self.app.before_request(self.__reload_if_requested)
+        if self.config.reload_interval:
+            # before the consumers hooks, so they see the reloaded data
+            self.app.before_request(self.__reload_if_changed)
         if self.config.authenticate_requests:
             self.__authenticator = _RequestsAuthenticator(self)
         if self.config.validate_requests:
             __RequestsValidator(self)
         if self.config.serialize_response:
             __ResponseSerializer(self)
+        if self.config.prebuilt:
+            try:
+                self.load()
+            except RuntimeError as e:
+                # keep `flask oas build` usable before the first build
+                self.app.logger.warning(e)
+            else:
+                # only the initial load, before the workers fork: a reload
+                # would freeze a worker's own garbage for nothing
+                if self.config.freeze_spec:
+                    freeze_objects()
         #
         set_cli(self)
         self.app.extensions["open_oas"] = self
 
-    def build(self, validate=None, cache=None):
-        self._app_paths = get_app_paths()
-        template_data = make_template_data(self.config, self._app_paths)
+    @property
+    def routes(self) -> RouteInventory:
+        """The app routes, collected by the last build or on first use."""
+        if self.__routes is None:
+            self.__routes = RouteInventory(self.app.url_map._rules)
+        return self.__routes
+
+    @property
+    def oas_data(self) -> dict:
+        return self.spec.document()
+
+    @oas_data.setter
+    def oas_data(self, data: dict):
+        self.spec.swap(data)
 
-        self._editor = TemplatesEditor(self, template_data, False)
+    def build(self, validate=None, cache=None, changed_files=None):
+        """
+        Build and dump the OAS file. `changed_files`, when the routes are
+        unchanged since the previous build, limits the sync of the fragment
+        files to those changed ones.
+        """
+        # workers started together share the oas dir, build one at a time.
+        with file_lock(self.config.lock_file_path):
+            self.__build(validate, cache, changed_files)
+
+    def __build(self, validate=None, cache=None, changed_files=None):
+        if (
+            changed_files is None
+            or self._editor is None
+            or not self._editor.refresh(changed_files)
+        ):
+            with phase("routes"):
+                self.__routes = RouteInventory(self.app.url_map._rules)
+                self._app_paths = self.__routes.paths
+            with phase("template_data"):
+                template_data = make_template_data(
+                    self.config, self._app_paths, self.__routes
+                )
+            with phase("editor"):
+                self._editor = TemplatesEditor(self, template_data, False)
 
         if validate is None:
             validate = self.config.validate_on_build
-        cached_final = None
         if cache is None:
             cache = self.config.cache_on_build
-            if cache:
-                cached_final = cache_file(
-                    self.config.final_file_path,
-                    self.config.oas_dir_path,
-                    self.config.cache_dir_path,
-                )
+        if cache:
+            with phase("snapshot"):
+                self.snapshots.add(self.config.final_file_path)
 
-        data = __load_data(
-            self, self._editor.template_data, self.input_oas_data
-        )
-        if cached_final and not cache:
-            os.remove(cached_final)
-        if validate:
-            validate_spec(data)
-        yaml_dump("", data, file=self.config.final_file_path)
-        self.oas_data = data
+        with phase("load"):
+            data = _load_data(
+                self, self._editor.template_data, self.input_oas_data
+            )
+        with phase("validate"):
+            if validate == "background":
+                Thread(
+                    target=self.__validate_background,
+                    args=(data,),
+                    daemon=True,
+                ).start()
+            elif validate:
+                self.validate(data)
+        with phase("dump"):
+            yaml_dump("", data, file=self.config.final_file_path)
+            dump_artifact(
+                data,
+                self.config.final_file_path,
+                self.config.final_artifact_path,
+            )
+        with phase("compile"):
+            self.oas_data = data
+            self.operations.compile()
+            if self.config.register_partial_route:
+                self.partials.compile()
+            if not self.config.keep_spec_data:
+                self.spec.release()
         if self.config.debug:
             click.echo(self.config.final_file_path)
 
+    def validate(self, data: dict, use_cache=None):
+        """
+        Validate oas data, specs and path items already validated are skipped
+        when `use_cache` (default: config.validation_cache) is True.
+        """
+        if use_cache is None:
+            use_cache = self.config.validation_cache
+        validate_spec_cached(
+            data,
+            self.config.validation_cache_path if use_cache else None,
+        )
+
+    def __validate_background(self, data: dict):
+        try:
+            with file_lock(self.config.lock_file_path):
+                self.validate(data)
+        except Exception as e:
+            self.app.logger.error("Invalid oas data: {0}".format(e))
+
+    def load(self):
+        """
+        Load the oas data produced by a previous `build()` without writing
+        any file. Used by the `prebuilt` mode.
+        """
+        data = load_spec(
+            self.config.final_file_path, self.config.final_artifact_path
+        )
+        if not data:
+            raise RuntimeError(
+                "Can't find prebuilt oas data at {0}, run `flask oas build` first".format(
+                    self.config.final_file_path
+                )
+            )
+        self.__spec_mtime = self.__get_spec_mtime()
+        self.oas_data = data
+        self.operations.compile()
+        if self.config.register_partial_route:
+            self.partials.compile()
+        if not self.config.keep_spec_data:
+            self.spec.release()
+        return data
+
+    def reload(self) -> int:
+        """
+        Load the built oas data again and swap it in, dropping every cache
+        compiled from the previous data. Returns the new spec version.
+        """
+        self.load()
+        return self.spec.version
+
+    def __get_spec_mtime(self):
+        try:
+            return os.stat(self.config.final_file_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def __reload_if_changed(self):
+        now = time.monotonic()
+        if now - self.__spec_checked_at < self.config.reload_interval:
+            return
+        self.__spec_checked_at = now
+        mtime = self.__get_spec_mtime()
+        if mtime and mtime != self.__spec_mtime:
+            try:
+                self.reload()
+            except Exception as e:
+                self.app.logger.warning(e)
+
+    def __reload_if_requested(self):
+        if not self.__reload_requested:
+            return
+        self.__reload_requested = False
+        try:
+            self.reload()
+        except Exception as e:
+            self.app.logger.warning(e)
+
+    def __request_reload(self, *args):
+        # the handler interrupts the main thread anywhere, maybe while it
+        # holds the spec lock: the reload runs before the next request
+        self.__reload_requested = True
+
+    def __install_reload_signal(self, signal_name):
+        signum = getattr(signal, signal_name, None)
+        if signum is None:
+            raise ValueError("Unknown signal {0}".format(signal_name))
+        try:
+            signal.signal(signum, self.__request_reload)
+        except ValueError:
+            # signal handlers can be installed from the main thread only
+            self.app.logger.warning(
+                "Can't install oas reload handler for {0}".format(signal_name)
+            )
+
+    def request_stage(self, name: str = None, when: Callable = None):
+        """
+        Decorator adding a custom stage to the request pipeline, run after
+        the authentication and validation stages. The stage gets the
+        `RequestContext` of the request; returning a response ends it.
+        `when(operation)` selects the operations the stage runs for.
+        """
+
+        def decorator(stage):
+            return self.pipeline.add_stage(name or stage.__name__, stage, when)
+
+        return decorator
+
     def get_spec_dict(self):
         return self.__view_manager.get_spec_dict()
 
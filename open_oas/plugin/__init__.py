@@ -1,5 +1,16 @@
-from .plugin import SchemaQualPlugin  # noqa
 from .utils import get_schema_info  # noqa
 
+
+def __getattr__(name):
+    # the plugin imports apispec, which only the builder needs: the consumers
+    # import `plugin.utils` without it
+    if name == "SchemaQualPlugin":
+        from .plugin import SchemaQualPlugin
+
+        return SchemaQualPlugin
+    raise AttributeError(
+        "module {0!r} has no attribute {1!r}".format(__name__, name)
+    )
+
 """Apispec plugin to store the schema qualname value in the x-schema key. 
 This value will be used by response serializer later"""
@@ -4,8 +4,6 @@ from typing import Callable, cast
 import marshmallow
 from marshmallow import class_registry
 
-from deepdiff import DeepDiff
-
 
 def _import_module(mod: str):
     return importlib.import_module(mod)
@@ -37,6 +35,8 @@ def resolve_schema_instance(schema, **kwargs):
 
 
 def get_name(obj, module):
+    from deepdiff import DeepDiff
+
     name = getattr(obj, "__name__", None)
     if name:
         return name
@@ -20,6 +20,8 @@ setuptools.setup(
     author="Ahmad Yahia",
     python_requires=">=3.8.5",
     install_requires=requirements,
+    # brotli variants of the swagger ui assets
+    extras_require={"brotli": ["brotli"]},
     packages=setuptools.find_packages(),  # ["open_oas"],
     # package_dir={"open_oas": "open_oas"},
 )
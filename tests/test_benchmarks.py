@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from ..benchmarks.bench import compare, run
+
+
+class TestBenchmarks(TestCase):
+    def test_run(self):
+        results = run(
+            routes=3,
+            schemas=2,
+            depth=1,
+            build_repeat=1,
+            requests=6,
+            import_repeat=1,
+        )["results"]
+        for name in [
+            "import",
+            "build",
+            "spec_json",
+            "request.get",
+            "request.get.authenticate",
+            "request.get.validate_body",
+            "request.get.serialize",
+            "request.post",
+            "request.post.validate_body",
+        ]:
+            self.assertIn(name, results)
+        self.assertEqual(results["request.post"]["n"], 6)
+        self.assertGreater(results["request.post"]["mean"], 0)
+
+    def test_compare(self):
+        baseline = {
+            "results": {
+                "build": {"mean": 1.0},
+                "request.get": {"mean": 1.0},
+                "gone": {"mean": 1.0},
+            }
+        }
+        current = {
+            "results": {
+                "build": {"mean": 1.05},
+                "request.get": {"mean": 1.5},
+                "new": {"mean": 1.0},
+            }
+        }
+        rows = {row["name"]: row for row in compare(baseline, current, 0.1)}
+        self.assertEqual(set(rows), {"build", "request.get"})
+        self.assertFalse(rows["build"]["regression"])
+        self.assertTrue(rows["request.get"]["regression"])
+        self.assertAlmostEqual(rows["request.get"]["ratio"], 1.5)
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from flask import Flask
+
+from ..open_oas.__loader import (
+    _clean_invalid_request_bodies,
+    _parse_star_method,
+)
+from ..open_oas.builder.builder import OasBuilder
+from ..open_oas.decorators import DeferredRegistry
+from ..open_oas.oas_config import OasConfig
+
+
+class TestBuilderData(TestCase):
+    def setUp(self) -> None:
+        self.input = {
+            "info": {"title": "t", "version": "1"},
+            "tags": [{"name": "tag"}],
+            "paths": {
+                "/users": {
+                    "get": {
+                        "responses": {
+                            "200": {
+                                "description": "",
+                                "content": {
+                                    "application/json": {
+                                        "schema": {"type": "object"}
+                                    }
+                                },
+                            }
+                        }
+                    }
+                }
+            },
+        }
+
+    def test_input_untouched(self):
+        OasBuilder(self.input, deferred=DeferredRegistry()).get_data()
+        self.assertIn("/users", self.input["paths"])
+        self.assertEqual(self.input["tags"], [{"name": "tag"}])
+
+    def test_get_data_is_new_tree(self):
+        builder = OasBuilder(self.input, deferred=DeferredRegistry())
+        data = builder.get_data()
+        data["paths"]["/users"]["get"]["responses"]["200"]["x-new"] = 1
+        data["tags"].append({"name": "other"})
+        self.assertEqual(builder.get_data()["tags"], [{"name": "tag"}])
+        self.assertNotIn(
+            "x-new",
+            builder.get_data()["paths"]["/users"]["get"]["responses"]["200"],
+        )
+
+    def test_star_method_operations_isolated(self):
+        app = Flask(__name__)
+        app.add_url_rule(
+            "/users", "users", lambda: "", methods=["GET", "POST"]
+        )
+        star = {"requestBody": {"content": {}}, "responses": {}}
+        with app.app_context():
+            data = _parse_star_method(
+                OasConfig(app), {"paths": {"/users": {"*": star}}}
+            )
+            data = _clean_invalid_request_bodies(data)
+        self.assertNotIn("requestBody", data["paths"]["/users"]["get"])
+        self.assertIn("requestBody", data["paths"]["/users"]["post"])
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from ..open_oas.builder.builder import OasBuilder
+from ..open_oas.decorators import Deferred, path_request_body, path_response
+
+
+class TestDeferredPaths(TestCase):
+    def build(self):
+        with Deferred.scope() as registry:
+            path_response(
+                {"type": "object"},
+                ["/users"],
+                ["get"],
+                codes=[200, 404],
+                content_types=["application/json", "application/xml"],
+                description="first",
+            )
+            path_response(
+                {"type": "string"}, ["/users"], ["get"], codes=[404]
+            )
+            path_request_body(
+                {"type": "object"}, ["/users"], ["post"], description="body"
+            )
+            path_request_body(
+                {"type": "array"},
+                ["/users"],
+                ["post"],
+                content_types=["text/csv"],
+                required=False,
+            )
+        return OasBuilder({}, deferred=registry).get_data()
+
+    def test_responses(self):
+        responses = self.build()["paths"]["/users"]["get"]["responses"]
+        self.assertEqual(set(responses.keys()), {"200", "404"})
+        self.assertEqual(
+            set(responses["200"]["content"].keys()),
+            {"application/json", "application/xml"},
+        )
+        # later declarations win
+        self.assertEqual(
+            responses["404"]["content"]["application/json"]["schema"],
+            {"type": "string"},
+        )
+        self.assertEqual(responses["404"]["description"], "")
+        self.assertEqual(responses["200"]["description"], "first")
+
+    def test_request_body(self):
+        body = self.build()["paths"]["/users"]["post"]["requestBody"]
+        self.assertEqual(
+            set(body["content"].keys()), {"application/json", "text/csv"}
+        )
+        self.assertFalse(body["required"])
+        self.assertEqual(body["description"], "")
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+from marshmallow import Schema, fields
+
+from ..open_oas.builder.builder import OasBuilder
+from ..open_oas.decorators import DeferredRegistry
+
+
+class PetSchema(Schema):
+    id = fields.Int(required=True)
+    name = fields.Str()
+
+
+class OwnerSchema(Schema):
+    id = fields.Int(required=True)
+    emails = fields.List(fields.Email())
+
+
+def make_local_schema():
+    # can't be pickled, the workers are forked with it
+    class LocalSchema(Schema):
+        value = fields.Float()
+
+    return LocalSchema
+
+
+class TestBuilderWorkers(TestCase):
+    def setUp(self) -> None:
+        self.input = {
+            "info": {"title": "t", "version": "1"},
+            "components": {
+                "schemas": {
+                    "Pet": PetSchema,
+                    "Owner": OwnerSchema,
+                    "Local": make_local_schema(),
+                    "Raw": {"type": "object"},
+                    # same component name, other kwargs: suffixed
+                    "PetIds": PetSchema,
+                },
+                "schemas-kwargs": {"PetIds": {"only": ["id"]}},
+            },
+        }
+
+    def build(self, workers: int) -> dict:
+        return OasBuilder(
+            self.input, deferred=DeferredRegistry(), workers=workers
+        ).get_data()
+
+    def test_same_as_serial(self):
+        serial = self.build(1)
+        self.assertIn("Pet1", serial["components"]["schemas"])
+        for workers in [2, 3]:
+            data = self.build(workers)
+            self.assertEqual(
+                list(data["components"]["schemas"]),
+                list(serial["components"]["schemas"]),
+            )
+            self.assertEqual(data, serial)
@@ -0,0 +1,80 @@
+import os
+import shutil
+import time
+from threading import Thread
+from unittest import TestCase
+
+from ..open_oas._cache import SnapshotStore
+from ..open_oas._utils import file_hash
+
+
+class TestSnapshotStore(TestCase):
+    def setUp(self) -> None:
+        self.dir = "./test_oas"
+        self.cache_dir = os.path.join(self.dir, ".cache")
+        self.path = os.path.join(self.dir, "final_oas.yaml")
+        os.makedirs(self.dir, exist_ok=True)
+        self.write("a: 1")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def write(self, content):
+        with open(self.path, "w") as f:
+            f.write(content)
+
+    def snapshots(self):
+        return [
+            f for f in os.listdir(self.cache_dir) if f.endswith(".yaml")
+        ]
+
+    def test_add(self):
+        store = SnapshotStore(self.cache_dir)
+        snapshot = store.add(self.path)
+        with open(snapshot) as f:
+            self.assertEqual(f.read(), "a: 1")
+        self.assertEqual(store.get(file_hash(self.path)), snapshot)
+
+    def test_missing_file(self):
+        store = SnapshotStore(self.cache_dir)
+        self.assertIsNone(store.add(os.path.join(self.dir, "missing.yaml")))
+
+    def test_deduplicate(self):
+        store = SnapshotStore(self.cache_dir)
+        first = store.add(self.path)
+        second = store.add(self.path)
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.snapshots()), 1)
+
+    def test_max_entries(self):
+        store = SnapshotStore(self.cache_dir, max_entries=2)
+        for i in range(4):
+            self.write("a: {0}".format(i))
+            store.add(self.path)
+        self.assertEqual(len(self.snapshots()), 2)
+        self.assertIsNotNone(store.get(file_hash(self.path)))
+
+    def test_max_age(self):
+        store = SnapshotStore(self.cache_dir, max_age=0.05)
+        old = store.add(self.path)
+        time.sleep(0.1)
+        self.write("a: 2")
+        store.add(self.path)
+        self.assertFalse(os.path.exists(old))
+        self.assertEqual(len(self.snapshots()), 1)
+
+    def test_concurrent_add(self):
+        store = SnapshotStore(self.cache_dir)
+        results = []
+        threads = [
+            Thread(target=lambda: results.append(store.add(self.path)))
+            for _ in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(len(self.snapshots()), 1)
@@ -0,0 +1,98 @@
+import os
+import shutil
+from unittest import TestCase
+from flask import Flask
+
+from ..open_oas import OpenOas
+from ..open_oas.builder.builder import OasBuilder
+from ..open_oas.decorators import (
+    Deferred,
+    DeferredRegistry,
+    api_tag,
+    path_security_requirements,
+)
+
+
+class TestDeferredRegistry(TestCase):
+    def test_deduplicate(self):
+        registry = DeferredRegistry()
+        with Deferred.scope(registry):
+            for _ in range(3):
+                api_tag("tag1", "description")
+                path_security_requirements(
+                    ["/users"], ["get"], security="BasicAuth"
+                )
+            api_tag("tag2", "description")
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(
+            [entry[0] for entry in registry],
+            ["api_tag", "path_security_requirements", "api_tag"],
+        )
+
+    def test_bool_and_int_differ(self):
+        registry = DeferredRegistry()
+        registry.append(("api_tag", ("t",), {"v": True}))
+        registry.append(("api_tag", ("t",), {"v": 1}))
+        self.assertEqual(len(registry), 2)
+
+    def test_snapshot_reused(self):
+        registry = DeferredRegistry([("api_tag", ("t",), {})])
+        snapshot = registry.snapshot()
+        self.assertIs(registry.snapshot(), snapshot)
+        registry.append(("api_tag", ("t2",), {}))
+        self.assertEqual(len(registry.snapshot()), 2)
+
+    def test_freeze(self):
+        registry = DeferredRegistry()
+        with Deferred.scope(registry):
+            api_tag("tag1")
+            registry.freeze()
+            with self.assertRaises(RuntimeError):
+                api_tag("tag2")
+        self.assertEqual(len(registry), 1)
+
+    def test_scope_restores_global(self):
+        previous = Deferred._deferred
+        with Deferred.scope() as registry:
+            self.assertIs(Deferred._deferred, registry)
+        self.assertIs(Deferred._deferred, previous)
+
+    def test_builder_uses_registry(self):
+        with Deferred.scope() as registry:
+            api_tag("scoped")
+        builder = OasBuilder({}, deferred=registry)
+        self.assertEqual(
+            [t["name"] for t in builder.get_data().get("tags", [])],
+            ["scoped"],
+        )
+
+
+class TestScopedApps(TestCase):
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def make_oas(self, registry, dirname):
+        app = Flask(__name__)
+        open_oas = OpenOas(
+            app=app,
+            deferred=registry,
+            config_data={
+                "OAS_DIR": "./test_oas/" + dirname,
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        with app.app_context():
+            open_oas.build()
+            open_oas.build()
+        return open_oas
+
+    def test_apps_isolated(self):
+        with Deferred.scope() as registry_a:
+            api_tag("a")
+        with Deferred.scope() as registry_b:
+            api_tag("b")
+        oas_a = self.make_oas(registry_a, "a")
+        oas_b = self.make_oas(registry_b, "b")
+        self.assertEqual([t["name"] for t in oas_a.oas_data["tags"]], ["a"])
+        self.assertEqual([t["name"] for t in oas_b.oas_data["tags"]], ["b"])
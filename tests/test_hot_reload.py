@@ -0,0 +1,146 @@
+from http import HTTPStatus
+import json
+import os
+import shutil
+import signal
+from marshmallow import Schema, fields
+from unittest import TestCase
+from unittest.mock import patch
+from flask import Flask
+
+from ..open_oas import OpenOas
+
+
+class NameSchema(Schema):
+    name = fields.Str(required=True)
+
+
+class EmailSchema(Schema):
+    email = fields.Str(required=True)
+
+
+def make_oas_data(schema):
+    return {
+        "paths": {
+            "/users": {
+                "post": {
+                    "requestBody": {
+                        "required": True,
+                        "content": {"application/json": {"schema": schema}},
+                    },
+                },
+            },
+        },
+    }
+
+
+def make_app():
+    app: Flask = Flask(__name__)
+    app.config["TESTING"] = True
+
+    @app.route("/users", methods=["POST"])
+    def users():
+        return ""
+
+    return app
+
+
+class TestHotReload(TestCase):
+    def setUp(self) -> None:
+        self.build(NameSchema)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def build(self, schema):
+        app = make_app()
+        builder = OpenOas(
+            app=app,
+            oas_data=make_oas_data(schema),
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        with app.app_context():
+            builder.build()
+
+    def make_worker(self, authorization_handler=None, **config_data):
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            authorization_handler=authorization_handler,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_PREBUILT": True,
+                "OAS_VALIDATE_REQUESTS": True,
+                **config_data,
+            },
+        )
+
+    def post(self, client, data):
+        return client.post(
+            "/users", data=json.dumps(data), mimetype="application/json"
+        ).status_code
+
+    def test_reload(self):
+        self.make_worker()
+        version = self.open_oas.spec.version
+        with self.app.test_client() as client:
+            self.assertEqual(self.post(client, {"name": "a"}), HTTPStatus.OK)
+            self.build(EmailSchema)
+            self.assertEqual(self.open_oas.reload(), version + 1)
+            self.assertEqual(
+                self.post(client, {"name": "a"}), HTTPStatus.BAD_REQUEST
+            )
+            self.assertEqual(self.post(client, {"email": "a"}), HTTPStatus.OK)
+
+    def test_reload_on_change(self):
+        self.make_worker(OAS_RELOAD_INTERVAL=0.001)
+        with self.app.test_client() as client:
+            self.assertEqual(self.post(client, {"name": "a"}), HTTPStatus.OK)
+            self.build(EmailSchema)
+            # force a different mtime on coarse filesystems
+            st = os.stat(self.open_oas.config.final_file_path)
+            os.utime(
+                self.open_oas.config.final_file_path,
+                ns=(st.st_atime_ns, st.st_mtime_ns + 10**9),
+            )
+            self.assertEqual(self.post(client, {"email": "a"}), HTTPStatus.OK)
+
+    def test_reload_route(self):
+        self.make_worker(OAS_REGISTER_RELOAD_ROUTE=True)
+        version = self.open_oas.spec.version
+        with self.app.test_client() as client:
+            res = client.post("/oas/oas-reload")
+            self.assertEqual(res.status_code, HTTPStatus.FORBIDDEN)
+        self.assertEqual(self.open_oas.spec.version, version)
+
+        self.make_worker(lambda: None, OAS_REGISTER_RELOAD_ROUTE=True)
+        version = self.open_oas.spec.version
+        with self.app.test_client() as client:
+            res = client.post("/oas/oas-reload")
+            self.assertEqual(res.status_code, HTTPStatus.OK)
+            self.assertEqual(res.get_json(), {"version": version + 1})
+
+    def test_reload_signal(self):
+        self.make_worker(OAS_RELOAD_SIGNAL="SIGUSR2")
+        self.addCleanup(signal.signal, signal.SIGUSR2, signal.SIG_DFL)
+        version = self.open_oas.spec.version
+        self.build(EmailSchema)
+        with patch.object(
+            self.open_oas, "reload", wraps=self.open_oas.reload
+        ) as reload:
+            os.kill(os.getpid(), signal.SIGUSR2)
+            os.kill(os.getpid(), signal.SIGUSR2)
+            # the handler only flags the reload
+            reload.assert_not_called()
+            with self.app.test_client() as client:
+                self.assertEqual(
+                    self.post(client, {"email": "a"}), HTTPStatus.OK
+                )
+                self.post(client, {"email": "a"})
+        self.assertEqual(reload.call_count, 1)
+        self.assertEqual(self.open_oas.spec.version, version + 1)
@@ -0,0 +1,78 @@
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from ..benchmarks.bench import ROOT_DIR, import_times
+
+# only needed to build the spec
+BUILD_MODULES = [
+    "apispec",
+    "openapi_spec_validator",
+    "deepdiff",
+    "yaml",
+    "pyrsistent",
+]
+
+APP = """
+from benchmarks.app import make_app
+app, open_oas = make_app(
+    {0!r}, routes=2, schemas=1, depth=1, prebuilt={1}
+)
+"""
+
+SERVE = """
+client = app.test_client()
+headers = {"X-Key-0": "key"}
+for res in [
+    client.get("/items0/1", headers=headers),
+    client.post("/items1/1", json={"id": 1, "name": "a"}, headers=headers),
+    client.get("/oas/oas-json"),
+]:
+    assert res.status_code == 200, res.status
+"""
+
+BUILD = """
+with app.app_context():
+    open_oas.build()
+"""
+
+
+class TestImportTime(TestCase):
+    def assertNotImported(self, times: dict):
+        self.assertEqual(
+            [m for m in BUILD_MODULES if m in times],
+            [],
+            "open_oas imported in {0:.1f} ms".format(
+                times.get("open_oas", 0) * 1000
+            ),
+        )
+
+    def test_import(self):
+        times = import_times("import open_oas")
+        self.assertIn("open_oas", times)
+        self.assertNotImported(times)
+
+    def test_prebuilt_worker(self):
+        oas_dir = tempfile.mkdtemp(prefix="open_oas_test_")
+        try:
+            subprocess.run(
+                [sys.executable, "-c", APP.format(oas_dir, False) + BUILD],
+                cwd=ROOT_DIR,
+                check=True,
+                capture_output=True,
+            )
+            times = import_times(APP.format(oas_dir, True) + SERVE)
+        finally:
+            shutil.rmtree(oas_dir, ignore_errors=True)
+        self.assertIn("flask", times)
+        self.assertNotImported(times)
+
+    def test_build_imports_on_use(self):
+        oas_dir = tempfile.mkdtemp(prefix="open_oas_test_")
+        try:
+            times = import_times(APP.format(oas_dir, False) + BUILD)
+        finally:
+            shutil.rmtree(oas_dir, ignore_errors=True)
+        self.assertIn("apispec", times)
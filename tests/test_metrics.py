@@ -0,0 +1,125 @@
+import shutil
+import socket
+from http import HTTPStatus
+from unittest import TestCase
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from ..open_oas import OpenOas
+from ..open_oas._metrics import Metrics, StatsdClient
+
+
+class NameSchema(Schema):
+    name = fields.Str(required=True)
+
+
+oas_data = {
+    "paths": {
+        "/users": {
+            "post": {
+                "requestBody": {
+                    "required": True,
+                    "content": {"application/json": {"schema": NameSchema}},
+                },
+            },
+        },
+    },
+}
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+
+    @app.route("/users", methods=["POST"])
+    def users():
+        return ""
+
+    return app
+
+
+class TestMetrics(TestCase):
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def make(self, authorization_handler=None, **config_data):
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            oas_data=oas_data,
+            authorization_handler=authorization_handler,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+                "OAS_VALIDATE_REQUESTS": True,
+                **config_data,
+            },
+        )
+        with self.app.app_context():
+            self.open_oas.build()
+        return self.app.test_client()
+
+    def test_disabled(self):
+        self.make()
+        self.assertIsNone(self.open_oas.metrics)
+
+    def test_handler(self):
+        events = []
+        client = self.make(
+            OAS_METRICS_HANDLER=lambda *args: events.append(args)
+        )
+        client.post("/users", json={"name": "n"})
+        client.post("/users", json={})
+        self.assertEqual(
+            [(e[0], e[1], e[3]) for e in events],
+            [
+                ("validate_body", "users", "ok"),
+                ("validate_body", "users", "rejected"),
+            ],
+        )
+        self.assertEqual(self.open_oas.metrics.hit_rate("operations"), 1.0)
+
+    def test_prometheus_route_needs_authorization(self):
+        client = self.make(OAS_REGISTER_METRICS_ROUTE=True)
+        res = client.get("/oas/oas-metrics")
+        self.assertEqual(res.status_code, HTTPStatus.FORBIDDEN)
+
+    def test_prometheus_route(self):
+        client = self.make(lambda: None, OAS_REGISTER_METRICS_ROUTE=True)
+        client.post("/users", json={})
+        with client.get("/oas/oas-metrics") as res:
+            self.assertEqual(res.status_code, HTTPStatus.OK)
+            text = res.get_data(as_text=True)
+        self.assertIn(
+            'open_oas_stage_seconds_count{stage="validate_body",endpoint="users"} 1',
+            text,
+        )
+        self.assertIn(
+            'open_oas_stage_total{stage="validate_body",endpoint="users",outcome="rejected"} 1',
+            text,
+        )
+        self.assertIn(
+            'open_oas_stage_seconds_bucket{stage="validate_body",endpoint="users",le="+Inf"} 1',
+            text,
+        )
+
+
+class TestStatsd(TestCase):
+    def test_send(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(2)
+        port = server.getsockname()[1]
+        metrics = Metrics(statsd=StatsdClient("127.0.0.1:{0}".format(port)))
+        metrics.observe("authenticate", "users", 0.002, "rejected")
+        lines = {server.recv(1024).decode() for _ in range(2)}
+        server.close()
+        self.assertEqual(
+            lines,
+            {
+                "open_oas.authenticate.users:2.000|ms",
+                "open_oas.authenticate.users.rejected:1|c",
+            },
+        )
@@ -0,0 +1,265 @@
+import shutil
+from unittest import TestCase
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from ..open_oas import OpenOas
+from ..open_oas.consumer._operations import Operation, _SchemaRefs
+
+
+class NameSchema(Schema):
+    name = fields.Str(required=True)
+
+
+oas_data = {
+    "security": [{"Root": []}],
+    "components": {
+        "securitySchemes": {"Root": {"type": "http", "scheme": "basic"}}
+    },
+    "paths": {
+        "/users": {
+            "post": {
+                "security": [{"A": [], "B": []}, {"C": []}],
+                "requestBody": {
+                    "required": True,
+                    "content": {"application/json": {"schema": NameSchema}},
+                },
+                "responses": {
+                    "200": {
+                        "description": "",
+                        "content": {
+                            "application/json": {"schema": NameSchema}
+                        },
+                    }
+                },
+            },
+            "get": {"responses": {"200": {"description": ""}}},
+            "put": {
+                "responses": {
+                    "200": {
+                        "description": "",
+                        "content": {
+                            "application/json": {
+                                "schema": NameSchema,
+                                "x-schema-kwargs": {"many": True},
+                            }
+                        },
+                    }
+                }
+            },
+        },
+    },
+}
+
+
+class TestOperationTable(TestCase):
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+
+        @self.app.route("/users", methods=["GET", "POST", "PUT"])
+        def users():
+            return ""
+
+        self.open_oas = OpenOas(
+            app=self.app,
+            oas_data=oas_data,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        with self.app.app_context():
+            self.open_oas.build()
+        self.rule = self.app.url_map._rules_by_endpoint["users"][0]
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def test_compiled(self):
+        operations = self.open_oas.operations
+        self.assertIn((id(self.rule), "POST"), operations._by_rule)
+        self.assertIn((id(self.rule), "GET"), operations._by_rule)
+        post = operations.get(self.rule, "POST")
+        self.assertIs(post, operations.operation("/users", "post"))
+        self.assertEqual(post.path, "/users")
+
+    def test_no_dereferenced_views_kept(self):
+        # the spec data is kept, the views compiled from it are not
+        self.assertIn("/users", self.open_oas.spec.data["paths"])
+        index = self.open_oas.spec._index
+        self.assertTrue(index is None or index._views == {})
+
+    def test_security(self):
+        operations = self.open_oas.operations
+        self.assertEqual(
+            operations.get(self.rule, "POST").security,
+            [{"C": []}, {"A": [], "B": []}],
+        )
+        self.assertEqual(
+            operations.get(self.rule, "GET").security, [{"Root": []}]
+        )
+
+    def test_schemas(self):
+        post = self.open_oas.operations.get(self.rule, "POST")
+        ref, required = post.request_body_schema("application/json")
+        self.assertTrue(required)
+        self.assertTrue(ref.xschema.endswith("NameSchema"))
+        self.assertIsInstance(ref.instance(), NameSchema)
+        self.assertIs(ref.instance(), ref.instance())
+        self.assertIs(post.response_schema(200, "application/json"), ref)
+        self.assertIsNone(post.response_schema(404, "application/json"))
+        get = self.open_oas.operations.get(self.rule, "GET")
+        self.assertEqual(
+            get.request_body_schema("application/json"), (None, False)
+        )
+        self.assertIsNone(get.response_schema(200, "application/json"))
+
+    def test_schema_kwargs(self):
+        put = self.open_oas.operations.get(self.rule, "PUT")
+        ref = put.response_schema(200, "application/json")
+        self.assertEqual(ref.kwargs, {"many": True})
+        self.assertTrue(ref.instance().many)
+        post = self.open_oas.operations.get(self.rule, "POST")
+        self.assertIsNot(ref, post.response_schema(200, "application/json"))
+
+    def test_cleared_on_swap(self):
+        post = self.open_oas.operations.get(self.rule, "POST")
+        self.open_oas.oas_data = {"paths": {}}
+        other = self.open_oas.operations.get(self.rule, "POST")
+        self.assertIsNot(post, other)
+        self.assertEqual(other.responses, {})
+        self.assertEqual(other.body_content, {})
+
+    def test_compact(self):
+        post = self.open_oas.operations.get(self.rule, "POST")
+        self.assertFalse(hasattr(post, "__dict__"))
+        self.assertEqual(set(post.responses), {"200", "default"})
+        self.assertEqual(list(post.body_content), ["application/json"])
+        self.assertEqual(
+            self.open_oas.operations.security_scheme("Root")["type"], "http"
+        )
+
+    def test_path_parameters(self):
+        data = {
+            "components": {
+                "parameters": {"Id": {"name": "id", "in": "path"}}
+            },
+            "paths": {
+                "/items/{id}": {
+                    "parameters": [
+                        {"$ref": "#/components/parameters/Id"},
+                        {"name": "q", "in": "query"},
+                    ],
+                    "get": {
+                        "parameters": [
+                            {"name": "q", "in": "query", "required": True}
+                        ],
+                        "responses": {},
+                    },
+                }
+            },
+        }
+        get = Operation(data, "/items/{id}", "GET")
+        self.assertEqual(
+            [(p.location, p.name, p.required) for p in get.parameters],
+            [("path", "id", False), ("query", "q", True)],
+        )
+
+    def test_shared_refs(self):
+        post = self.open_oas.operations.get(self.rule, "POST")
+        ref = post.response_schema(200, "application/json")
+        self.assertIs(post.request_body_schema("application/json")[0], ref)
+        data = {
+            "paths": {
+                "/a": {"get": {"responses": {"200": {"$ref": "#/r"}}}},
+                "/b": {"get": {"responses": {"201": {"$ref": "#/r"}}}},
+            },
+            "r": {"content": {"text/plain": {"schema": {"x-schema": "a.B"}}}},
+        }
+        refs = _SchemaRefs()
+        a = Operation(data, "/a", "get", refs)
+        b = Operation(data, "/b", "get", refs)
+        self.assertIs(
+            a.response_schema(200, "text/plain"),
+            b.response_schema(201, "text/plain"),
+        )
+
+
+class TestReleasedSpec(TestCase):
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+
+        @self.app.route("/users", methods=["GET", "POST", "PUT"])
+        def users():
+            return {"name": "name"}
+
+        config = {
+            "OAS_DIR": "./test_oas",
+            "OAS_VALIDATE_ON_BUILD": False,
+            "OAS_VALIDATE_REQUESTS": True,
+        }
+        builder = OpenOas(app=self.app, oas_data=oas_data, config_data=config)
+        with self.app.app_context():
+            builder.build()
+
+        self.users = users
+        self.config = {
+            **config,
+            "OAS_PREBUILT": True,
+            "OAS_KEEP_SPEC_DATA": False,
+        }
+        self.app = Flask(__name__)
+        self.app.add_url_rule(
+            "/users", "users", users, methods=["GET", "POST", "PUT"]
+        )
+        self.open_oas = OpenOas(app=self.app, config_data=self.config)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def test_released(self):
+        self.assertEqual(self.open_oas.spec.data, {})
+        self.assertTrue(self.open_oas.spec.json)
+        self.assertIn("/users", self.open_oas.oas_data["paths"])
+        self.assertIsNot(self.open_oas.oas_data, self.open_oas.oas_data)
+
+    def test_requests(self):
+        with self.app.test_client() as client:
+            res = client.post("/users", json={})
+            self.assertEqual(res.status_code, 400)
+            res = client.post("/users", json={"name": "name"})
+            self.assertEqual(res.status_code, 200)
+
+    def test_route_after_init(self):
+        app = Flask(__name__)
+        open_oas = OpenOas(app=app, config_data=self.config)
+        app.add_url_rule(
+            "/users", "users", self.users, methods=["GET", "POST", "PUT"]
+        )
+        self.assertEqual(open_oas.spec.data, {})
+        with app.test_client() as client:
+            res = client.post("/users", json={})
+            self.assertEqual(res.status_code, 400)
+            res = client.post("/users", json={"name": "name"})
+            self.assertEqual(res.status_code, 200)
+        rule = next(app.url_map.iter_rules("users"))
+        record = open_oas.operations.get(rule, "POST")
+        self.assertEqual(record.security, [{"C": []}, {"A": [], "B": []}])
+        self.assertIn("200", record.responses)
+        # an operation missing from the spec still gets the root security
+        self.assertEqual(
+            open_oas.operations.operation("/other", "get").security,
+            [{"Root": []}],
+        )
+
+    def test_spec_route(self):
+        with self.app.test_client() as client:
+            client.get("/oas/oas-json")
+            res = client.get("/oas/oas-json")
+            self.assertEqual(res.status_code, 200)
+            self.assertIn("/users", res.get_json()["paths"])
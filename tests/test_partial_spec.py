@@ -0,0 +1,223 @@
+from copy import deepcopy
+import json
+import shutil
+from unittest import TestCase
+
+from flask import Flask
+
+from ..open_oas import OpenOas
+from ..open_oas._refs import RefGraph
+
+
+def ref(type_, name):
+    return {"$ref": "#/components/{0}/{1}".format(type_, name)}
+
+
+def json_content(schema):
+    return {"application/json": {"schema": schema}}
+
+
+oas_data = {
+    "tags": [{"name": "pets"}, {"name": "users"}],
+    "security": [{"ApiKey": []}],
+    "paths": {
+        "/pets": {
+            "get": {
+                "tags": ["pets"],
+                "operationId": "listPets",
+                "responses": {
+                    "200": {
+                        "description": "",
+                        "content": json_content(
+                            {"type": "array", "items": ref("schemas", "Pet")}
+                        ),
+                    }
+                },
+            },
+        },
+        "/pets/{id}": {
+            "parameters": [ref("parameters", "Id")],
+            "get": {
+                "tags": ["pets"],
+                "operationId": "getPet",
+                "responses": {"200": ref("responses", "PetResponse")},
+            },
+        },
+        "/users": {
+            "get": {
+                "tags": ["users"],
+                "operationId": "listUsers",
+                "security": [{"Bearer": []}],
+                "responses": {
+                    "200": {
+                        "description": "",
+                        "content": json_content(ref("schemas", "User")),
+                    }
+                },
+            },
+        },
+    },
+    "components": {
+        "schemas": {
+            "Pet": {
+                "type": "object",
+                "properties": {"owner": ref("schemas", "Owner")},
+            },
+            "Owner": {
+                "type": "object",
+                # recursive
+                "properties": {"pets": ref("schemas", "Pet")},
+            },
+            "User": {"type": "object"},
+            "Unused": {"type": "object"},
+        },
+        "parameters": {
+            "Id": {
+                "in": "path",
+                "name": "id",
+                "required": True,
+                "schema": {"type": "integer"},
+            }
+        },
+        "responses": {
+            "PetResponse": {
+                "description": "",
+                "content": json_content(ref("schemas", "Pet")),
+            }
+        },
+        "securitySchemes": {
+            "ApiKey": {"type": "apiKey", "in": "header", "name": "X-Key"},
+            "Bearer": {"type": "http", "scheme": "bearer"},
+        },
+    },
+}
+
+
+class TestRefGraph(TestCase):
+    def setUp(self) -> None:
+        self.graph = RefGraph(oas_data)
+        return super().setUp()
+
+    def names(self, doc, type_):
+        return set(doc.get("components", {}).get(type_, {}))
+
+    def test_by_tag(self):
+        doc = self.graph.partial(oas_data, self.graph.select(tags=["pets"]))
+        self.assertEqual(list(doc["paths"]), ["/pets", "/pets/{id}"])
+        self.assertEqual(self.names(doc, "schemas"), {"Pet", "Owner"})
+        self.assertEqual(self.names(doc, "parameters"), {"Id"})
+        self.assertEqual(self.names(doc, "responses"), {"PetResponse"})
+        self.assertEqual(self.names(doc, "securitySchemes"), {"ApiKey"})
+        self.assertEqual(doc["tags"], [{"name": "pets"}])
+        self.assertEqual(doc["security"], oas_data["security"])
+
+    def test_by_path_prefix(self):
+        ops = self.graph.select(path_prefixes=["/pets/"])
+        self.assertEqual(
+            [op.operation_id for op in ops], ["listPets", "getPet"]
+        )
+        self.assertEqual(self.graph.select(path_prefixes=["/pet"]), [])
+
+    def test_by_operation_id(self):
+        doc = self.graph.partial(
+            oas_data, self.graph.select(operation_ids=["listUsers"])
+        )
+        self.assertEqual(list(doc["paths"]), ["/users"])
+        self.assertEqual(self.names(doc, "schemas"), {"User"})
+        self.assertEqual(
+            self.names(doc, "securitySchemes"), {"ApiKey", "Bearer"}
+        )
+
+    def test_filters_combined(self):
+        ops = self.graph.select(tags=["pets"], operation_ids=["listUsers"])
+        self.assertEqual(ops, [])
+
+
+# the builder doesn't resolve referenced path parameters
+built_data = deepcopy(oas_data)
+del built_data["paths"]["/pets/{id}"]["parameters"]
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+
+    @app.route("/pets")
+    def pets():
+        return ""
+
+    @app.route("/pets/<int:id>")
+    def pet(id):
+        return ""
+
+    @app.route("/users")
+    def users():
+        return ""
+
+    return app
+
+
+class TestPartialRoute(TestCase):
+    def make(self, **config_data):
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            oas_data=built_data,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+                "OAS_REGISTER_PARTIAL_ROUTE": True,
+                **config_data,
+            },
+        )
+        with self.app.app_context():
+            self.open_oas.build()
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def test_by_tag(self):
+        self.make()
+        self.assertIsNotNone(self.open_oas.partials.graph)
+        res = self.client.get("/oas/oas-json/partial?tag=users")
+        self.assertEqual(res.status_code, 200)
+        doc = json.loads(res.data)
+        self.assertEqual(list(doc["paths"]), ["/users"])
+        self.assertNotIn("Pet", doc["components"]["schemas"])
+        res = self.client.get(
+            "/oas/oas-json/partial?tag=users",
+            headers={"If-None-Match": res.headers["ETag"]},
+        )
+        self.assertEqual(res.status_code, 304)
+
+    def test_cached_per_filter(self):
+        self.make()
+        first = self.client.get("/oas/oas-json/partial?tag=pets&tag=users")
+        second = self.client.get("/oas/oas-json/partial?tag=users&tag=pets")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(self.open_oas.partials._documents), 1)
+        self.open_oas.oas_data = {}
+        self.assertEqual(len(self.open_oas.partials._documents), 0)
+        self.assertIsNone(self.open_oas.partials.graph)
+
+    def test_released_spec(self):
+        self.make(OAS_KEEP_SPEC_DATA=False)
+        self.assertEqual(self.open_oas.spec.data, {})
+        res = self.client.get("/oas/oas-json/partial?operationId=listPets")
+        doc = json.loads(res.data)
+        self.assertEqual(list(doc["paths"]), ["/pets"])
+        self.assertEqual(
+            set(doc["components"]["schemas"]), {"Pet", "Owner"}
+        )
+
+    def test_filter_required(self):
+        self.make()
+        res = self.client.get("/oas/oas-json/partial")
+        self.assertEqual(res.status_code, 400)
+
+    def test_not_registered(self):
+        self.make(OAS_REGISTER_PARTIAL_ROUTE=False)
+        res = self.client.get("/oas/oas-json/partial?tag=pets")
+        self.assertEqual(res.status_code, 404)
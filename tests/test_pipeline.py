@@ -0,0 +1,103 @@
+import shutil
+from http import HTTPStatus
+from unittest import TestCase
+
+from flask import Flask, g, jsonify
+from marshmallow import Schema, fields
+
+from ..open_oas import OpenOas
+
+
+class NameSchema(Schema):
+    name = fields.Str(required=True)
+
+
+oas_data = {
+    "paths": {
+        "/users": {
+            "post": {
+                "requestBody": {
+                    "required": True,
+                    "content": {"application/json": {"schema": NameSchema}},
+                },
+            },
+            "get": {"responses": {"200": {"description": ""}}},
+        },
+    },
+}
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+
+    @app.route("/users", methods=["GET", "POST"])
+    def users():
+        return jsonify(sorted(g.oas_request.timings.keys()))
+
+    return app
+
+
+class TestRequestPipeline(TestCase):
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def make(self, **config_data):
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            oas_data=oas_data,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+                **config_data,
+            },
+        )
+        with self.app.app_context():
+            self.open_oas.build()
+        return self.app.test_client()
+
+    def test_no_stages_no_hook(self):
+        self.make()
+        self.assertEqual(self.open_oas.pipeline.stages, [])
+        hooks = self.app.before_request_funcs.get(None, [])
+        self.assertNotIn(self.open_oas.pipeline.run, hooks)
+
+    def test_single_hook(self):
+        self.make(OAS_VALIDATE_REQUESTS=True)
+        hooks = self.app.before_request_funcs.get(None, [])
+        self.assertEqual(hooks.count(self.open_oas.pipeline.run), 1)
+
+    def test_stages_and_timings(self):
+        client = self.make(OAS_VALIDATE_REQUESTS=True)
+        calls = []
+
+        @self.open_oas.request_stage(when=lambda op: op.method == "post")
+        def audit(context):
+            calls.append(context.operation.path)
+
+        with client.post("/users", json={"name": "n"}) as res:
+            self.assertEqual(res.status_code, HTTPStatus.OK)
+            self.assertEqual(res.json, ["audit", "validate_body"])
+        with client.get("/users") as res:
+            self.assertEqual(res.json, ["validate_body"])
+        self.assertEqual(calls, ["/users"])
+
+    def test_stage_response_ends_request(self):
+        client = self.make(OAS_VALIDATE_REQUESTS=True)
+
+        @self.open_oas.request_stage("deny")
+        def deny(context):
+            return "denied", HTTPStatus.FORBIDDEN
+
+        with client.post("/users", json={}) as res:
+            # the validation stage answers first
+            self.assertEqual(res.status_code, HTTPStatus.BAD_REQUEST)
+        with client.post("/users", json={"name": "n"}) as res:
+            self.assertEqual(res.status_code, HTTPStatus.FORBIDDEN)
+
+    def test_unknown_route(self):
+        client = self.make(OAS_AUTHENTICATE_REQUESTS=True)
+        with client.get("/missing") as res:
+            self.assertEqual(res.status_code, HTTPStatus.NOT_FOUND)
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+import gc
+import json
+import os
+import shutil
+from marshmallow import Schema, fields
+from unittest import TestCase
+from unittest.mock import patch
+from flask import Flask
+
+from ..open_oas import OpenOas
+from ..open_oas import open_oas as open_oas_module
+
+
+class UserSchema(Schema):
+    name = fields.Str(required=True)
+
+
+oas_data = {
+    "paths": {
+        "/users": {
+            "post": {
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": UserSchema,
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+def make_app():
+    app: Flask = Flask(__name__)
+    app.config["TESTING"] = True
+
+    @app.route("/users", methods=["POST"])
+    def users():
+        return ""
+
+    return app
+
+
+class TestPrebuilt(TestCase):
+    def setUp(self) -> None:
+        app = make_app()
+        builder = OpenOas(
+            app=app,
+            oas_data=oas_data,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        with app.app_context():
+            builder.build()
+        self.oas_dir_path = builder.config.oas_dir_path
+        # workers must not touch the fragments
+        shutil.rmtree(builder.config.fragments_dir_path)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        if os.path.exists(self.oas_dir_path):
+            shutil.rmtree(self.oas_dir_path)
+        return super().tearDown()
+
+    def make_worker(self, **config_data):
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_PREBUILT": True,
+                "OAS_VALIDATE_REQUESTS": True,
+                **config_data,
+            },
+        )
+
+    def test_loads_on_init(self):
+        self.make_worker()
+        self.assertFalse(self.open_oas.config.auto_build)
+        self.assertIn("/users", self.open_oas.oas_data["paths"])
+
+    def test_validates_without_writes(self):
+        self.make_worker()
+        with self.app.test_client() as client:
+            res = client.post(
+                "/users",
+                data=json.dumps({}),
+                mimetype="application/json",
+            )
+            self.assertEqual(res.status_code, HTTPStatus.BAD_REQUEST)
+            res = client.post(
+                "/users",
+                data=json.dumps({"name": "ahmad"}),
+                mimetype="application/json",
+            )
+            self.assertEqual(res.status_code, HTTPStatus.OK)
+        self.assertFalse(
+            os.path.exists(self.open_oas.config.fragments_dir_path)
+        )
+
+    def test_missing_spec(self):
+        shutil.rmtree(self.oas_dir_path)
+        self.make_worker()
+        self.assertEqual(self.open_oas.oas_data, {})
+        with self.assertRaises(RuntimeError):
+            self.open_oas.load()
+
+    def test_freeze_spec(self):
+        try:
+            self.make_worker(OAS_FREEZE_SPEC=True)
+            self.assertGreater(gc.get_freeze_count(), 0)
+            with patch.object(open_oas_module, "freeze_objects") as freeze:
+                self.open_oas.reload()
+            freeze.assert_not_called()
+        finally:
+            gc.unfreeze()
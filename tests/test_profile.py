@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+from unittest import TestCase
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from ..open_oas import OpenOas
+from ..open_oas._profile import BuildProfiler, phase
+
+
+class NameSchema(Schema):
+    name = fields.Str(required=True)
+
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route("/users", methods=["POST"])
+    def users():
+        return ""
+
+    return app
+
+
+oas_data = {
+    "paths": {
+        "/users": {
+            "post": {
+                "requestBody": {
+                    "content": {"application/json": {"schema": NameSchema}},
+                },
+            },
+        },
+    },
+    "components": {"schemas": {"Name": NameSchema}},
+}
+
+
+class TestBuildProfiler(TestCase):
+    def setUp(self) -> None:
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            oas_data=oas_data,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def test_phases(self):
+        with self.app.app_context():
+            with BuildProfiler() as profiler:
+                self.open_oas.build()
+        report = profiler.report()
+        names = [p["name"] for p in report["phases"]]
+        for name in [
+            "routes",
+            "template_data",
+            "editor.sections",
+            "editor.paths",
+            "editor.components",
+            "load.overrides",
+            "load.builder.components",
+            "load.builder.paths",
+            "load.builder.deferred",
+            "load.star_methods",
+            "validate",
+            "dump",
+        ]:
+            self.assertIn(name, names)
+        builder = names.index("load.builder")
+        self.assertLess(builder, names.index("load.builder.paths"))
+        for p in report["phases"]:
+            self.assertGreaterEqual(p["peak"], 0)
+            self.assertLessEqual(p["peak"], report["peak"])
+        self.assertIn("/users", [p["name"] for p in report["top"]["paths"]])
+        self.assertIn(
+            NameSchema.__module__ + ".NameSchema",
+            [s["name"] for s in report["top"]["schemas"]],
+        )
+
+    def test_inactive(self):
+        with phase("nothing"):
+            pass
+        with BuildProfiler(memory=False) as profiler:
+            with phase("outer"):
+                with phase("inner"):
+                    pass
+        self.assertEqual(
+            [p["name"] for p in profiler.report()["phases"]],
+            ["outer", "outer.inner"],
+        )
+        self.assertIsNone(profiler.report()["peak"])
+
+    def test_cli(self):
+        output = "./test_oas/profile.json"
+        os.makedirs("./test_oas", exist_ok=True)
+        result = self.app.test_cli_runner().invoke(
+            args=["oas", "build", "--profile", "--profile-output", output]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("load.builder", json.dumps(json.load(open(output))))
+        self.assertIn("total", result.output)
@@ -0,0 +1,127 @@
+from unittest import TestCase
+
+from ..open_oas._refs import RefIndex, path_pointer
+from ..open_oas._spec import SpecHolder
+from ..open_oas.consumer._utils import _get_operation, _resolve_oas_object
+
+
+user = {"type": "object", "properties": {"id": {"type": "string"}}}
+data = {
+    "paths": {
+        "/users/{id}": {
+            "post": {
+                "parameters": [{"$ref": "#/components/parameters/Id"}],
+                "requestBody": {"$ref": "#/components/requestBodies/User"},
+                "responses": {
+                    "200": {"$ref": "#/components/responses/User"},
+                },
+            },
+        },
+    },
+    "components": {
+        "schemas": {
+            "User": user,
+            "AliasUser": {"$ref": "#/components/schemas/User"},
+            "Tree": {
+                "type": "object",
+                "properties": {
+                    "child": {"$ref": "#/components/schemas/Tree"},
+                },
+            },
+        },
+        "parameters": {
+            "Id": {"in": "path", "name": "id", "schema": {"type": "string"}},
+        },
+        "requestBodies": {
+            "User": {
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/AliasUser"},
+                    },
+                },
+            },
+        },
+        "responses": {
+            "User": {
+                "description": "OK",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/User"},
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+class TestRefIndex(TestCase):
+    def test_index(self):
+        index = RefIndex(data)
+        self.assertIs(index.refs["#/components/schemas/AliasUser"], user)
+        self.assertIs(
+            index.refs["#/components/parameters/Id"],
+            data["components"]["parameters"]["Id"],
+        )
+
+    def test_chained_ref(self):
+        index = RefIndex(data)
+        self.assertIs(
+            index.resolve({"$ref": "#/components/schemas/AliasUser"}), user
+        )
+
+    def test_missing_ref(self):
+        index = RefIndex(data)
+        self.assertIsNone(index.resolve({"$ref": "#/components/schemas/No"}))
+
+    def test_escaped_pointer(self):
+        index = RefIndex(data)
+        pointer = path_pointer("paths", "/users/{id}", "post")
+        self.assertEqual(pointer, "#/paths/~1users~1{id}/post")
+        self.assertIs(
+            index.pointer(pointer), data["paths"]["/users/{id}"]["post"]
+        )
+
+    def test_operation(self):
+        index = RefIndex(data)
+        operation = index.operation("/users/{id}", "POST")
+        self.assertEqual(operation["parameters"][0]["name"], "id")
+        self.assertEqual(
+            operation["requestBody"]["content"]["application/json"]["schema"],
+            user,
+        )
+        self.assertIs(index.operation("/users/{id}", "post"), operation)
+
+    def test_recursive_ref(self):
+        index = RefIndex(data)
+        tree = index.deref("#/components/schemas/Tree")
+        self.assertEqual(
+            tree["properties"]["child"]["properties"]["child"],
+            {"$ref": "#/components/schemas/Tree"},
+        )
+
+    def test_index_per_spec(self):
+        spec, other = SpecHolder(data), SpecHolder({"paths": {}})
+        index = spec.ref_index()
+        self.assertIs(index.data, data)
+        self.assertIsNot(other.ref_index(), index)
+        self.assertIs(spec.ref_index(), index)
+        spec.swap({"paths": {}})
+        self.assertIsNot(spec.ref_index(), index)
+        spec.release()
+        self.assertIsNone(spec._index)
+
+    def test_resolve_oas_object(self):
+        self.assertIs(
+            _resolve_oas_object(
+                data, {"$ref": "#/components/parameters/Id"}, "parameter"
+            ),
+            data["components"]["parameters"]["Id"],
+        )
+        self.assertEqual(
+            _resolve_oas_object(
+                data, {"$ref": "#/components/schemas/No"}, "schema"
+            ),
+            {},
+        )
+        self.assertEqual(_get_operation(data, "/no", "get"), {})
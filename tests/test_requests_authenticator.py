@@ -206,42 +206,31 @@ class TestAuthenticator(TestCase):
             self.assertEqual(res.json["message"], self.default_message)  # type: ignore
 
     def test_get_root_ecurity_scheme(self):
-
-        with self.app.app_context():
-            root: dict = self.auther._get_root_security_scheme()
-            self.assertEqual(root, oas_data.get("security", {}))
+        # operations without their own security use the root one
+        operation = self.open_oas.operations.operation("/root_security", "post")
+        self.assertEqual(operation.security, oas_data.get("security", {}))
 
     def test_get_security_schemes(self):
-        with self.app.test_request_context():
-            sec: dict = self.auther._RequestsAuthenticator__get_path_security_requirements(
-                "/one_schema", "post"
-            )
-            self.assertEqual(
-                sec,
-                oas_data.get("paths", {})
-                .get("/one_schema", {})
-                .get("post", {})
-                .get("security"),
-            )
-
-            sec: dict = self.auther._RequestsAuthenticator__get_path_security_requirements(
-                "/root_security", "post"
-            )
-            self.assertEqual(sec, oas_data.get("security"))
-            #
-            sec: dict = self.auther._RequestsAuthenticator__get_path_security_requirements(
-                "/many_or_one", "post"
-            )
-
-            self.assertEqual(
-                sec,
-                [
-                    {
-                        "CookieApiKey": [],
-                    },
-                    {"HeaderApiKey": [], "BearerAuth": []},
-                ],
-            )
+        operations = self.open_oas.operations
+        sec: list = operations.operation("/one_schema", "post").security
+        self.assertEqual(
+            sec,
+            oas_data.get("paths", {})
+            .get("/one_schema", {})
+            .get("post", {})
+            .get("security"),
+        )
+        #
+        sec = operations.operation("/many_or_one", "post").security
+        self.assertEqual(
+            sec,
+            [
+                {
+                    "CookieApiKey": [],
+                },
+                {"HeaderApiKey": [], "BearerAuth": []},
+            ],
+        )
 
 
 class TestIsRequestAuthenticated(TestCase):
@@ -410,9 +399,10 @@ class TestAuthenticateRequests(TestCase):
         )
         with self.app.app_context():
             self.open_oas.build()
+        # run the build of the first request now, it would replace the spec
+        # changed by `set_xhandler`
+        self.app.test_client().get("/oas/oas-json")
 
-        self.auther = getattr(self.open_oas, "_OpenOas__authenticator")
-        self.auther.row_oas = self.open_oas.get_spec_dict()
 
         self.schemes = [
             "CookieApiKey",
@@ -453,14 +443,16 @@ class TestAuthenticateRequests(TestCase):
     # check status for every
     def set_xhandler(self, scheme_names: List[str], xhandler):
         qualname = getattr(xhandler, "__module__", "") + "." + xhandler.__name__
-        # oas = self.open_oasget_spec_dict()
+        data = deepcopy(self.open_oas.spec.document())
         for name in scheme_names:
             orig = (
-                self.auther.row_oas.get("components", {})
+                data.get("components", {})
                 .get("securitySchemes", {})
                 .get(name, {})
             )
             orig["x-handler"] = qualname
+        # the swap drops the compiled operations and handlers
+        self.open_oas.oas_data = data
 
     def test_all_false(self):
         expected = {}
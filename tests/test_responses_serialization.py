@@ -323,6 +323,14 @@ class TestSerializer(TestCase):
             self.assertEqual(res.status_code, 200)
             self.assertEqual(res.get_json(), {"data": None})
 
+    def test_each_endpoint_keeps_its_view(self):
+        self.set_open_oas(oas_data)
+        with self.app.test_client() as client:
+            client.post("/users")
+            res = client.post("/no_response")
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.get_json(), {"data": None})
+
     def test_no_response_error(self):
         self.set_open_oas(oas_data)
         with self.assertRaises(TypeError):
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from flask import Flask
+
+from ..open_oas._parameters import (
+    RouteInventory,
+    extract_path_parameters,
+    get_app_paths,
+)
+
+
+class TestRouteInventory(TestCase):
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        self.app.add_url_rule(
+            "/users/<int:id>", "user", lambda id: "", methods=["GET", "PUT"]
+        )
+        self.app.add_url_rule("/items/<name>", "item", lambda name: "")
+
+    def test_paths(self):
+        with self.app.app_context():
+            app_paths = get_app_paths()
+        routes = RouteInventory(self.app.url_map._rules)
+        self.assertEqual(routes.paths, app_paths)
+        self.assertEqual(
+            sorted(routes.paths["/users/{id}"]), ["get", "options", "put"]
+        )
+
+    def test_path_of(self):
+        routes = RouteInventory(self.app.url_map._rules)
+        rule = self.app.url_map._rules_by_endpoint["user"][0]
+        self.assertEqual(routes.path_of(rule), "/users/{id}")
+        self.assertIs(routes.route(rule), routes.route(rule))
+
+    def test_path_of_late_rule(self):
+        routes = RouteInventory(self.app.url_map._rules)
+        self.app.add_url_rule("/late/<float:x>", "late", lambda x: "")
+        rule = self.app.url_map._rules_by_endpoint["late"][0]
+        self.assertEqual(routes.path_of(rule), "/late/{x}")
+        self.assertIn("/late/{x}", routes.paths)
+
+    def test_parameters(self):
+        routes = RouteInventory(self.app.url_map._rules)
+        with self.app.app_context():
+            self.assertEqual(
+                extract_path_parameters(routes=routes),
+                extract_path_parameters(),
+            )
+        data = extract_path_parameters(routes=routes)
+        param = data["paths"]["/users/{id}"]["parameters"][0]
+        self.assertEqual(param["schema"], {"type": "integer", "format": "int32"})
+        # callers may edit the returned stubs
+        param["schema"]["type"] = "string"
+        data = extract_path_parameters(routes=routes)
+        param = data["paths"]["/users/{id}"]["parameters"][0]
+        self.assertEqual(param["schema"]["type"], "integer")
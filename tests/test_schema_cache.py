@@ -0,0 +1,168 @@
+import os
+import shutil
+from unittest import TestCase
+from unittest.mock import patch
+
+from marshmallow import Schema, fields
+
+from ..open_oas.builder import builder_resolver
+from ..open_oas.builder.builder import OasBuilder
+from ..open_oas.builder.schema_cache import SchemaCache, schema_fingerprint
+from ..open_oas.decorators import DeferredRegistry
+
+
+class PetSchema(Schema):
+    id = fields.Int(required=True)
+    name = fields.Str()
+
+
+class TagSchema(Schema):
+    label = fields.Str()
+
+
+class LabelSchema(Schema):
+    text = fields.Str()
+
+
+class NoteSchema(Schema):
+    body = fields.Str()
+
+
+class OwnerSchema(Schema):
+    id = fields.Int(required=True)
+    pets = fields.List(fields.Nested(lambda: PetSchema()))
+
+
+def schema_class(**attrs):
+    return type("DynamicSchema", (Schema,), attrs)
+
+
+class TestSchemaFingerprint(TestCase):
+    def test_stable(self):
+        self.assertEqual(
+            schema_fingerprint(PetSchema), schema_fingerprint(PetSchema)
+        )
+        self.assertEqual(
+            schema_fingerprint(schema_class(a=fields.Str())),
+            schema_fingerprint(schema_class(a=fields.Str())),
+        )
+
+    def test_changes(self):
+        base = schema_fingerprint(schema_class(a=fields.Str()))
+        for other in [
+            schema_fingerprint(schema_class(a=fields.Int())),
+            schema_fingerprint(schema_class(a=fields.Str(required=True))),
+            schema_fingerprint(schema_class(b=fields.Str())),
+            schema_fingerprint(
+                schema_class(
+                    a=fields.Str(), Meta=type("Meta", (), {"ordered": True})
+                )
+            ),
+            schema_fingerprint(schema_class(a=fields.Str()), {"many": True}),
+        ]:
+            self.assertNotEqual(base, other)
+
+    def test_instance_options(self):
+        self.assertNotEqual(
+            schema_fingerprint(PetSchema()),
+            schema_fingerprint(PetSchema(only=["id"])),
+        )
+
+    def test_nested(self):
+        fingerprint = schema_fingerprint(OwnerSchema)
+        with patch.object(PetSchema, "_declared_fields", {}):
+            self.assertNotEqual(schema_fingerprint(OwnerSchema), fingerprint)
+
+    def test_not_fingerprinted(self):
+        self.assertIsNone(schema_fingerprint({"type": "object"}))
+        self.assertIsNone(schema_fingerprint("not.a.Schema"))
+
+
+class TestSchemaCache(TestCase):
+    def setUp(self) -> None:
+        self.dir = "./test_oas"
+        self.cache_path = os.path.join(self.dir, "schemas.json")
+        self.input = {
+            "info": {"title": "t", "version": "1"},
+            "components": {
+                "schemas": {
+                    "Pet": PetSchema,
+                    "Tag": TagSchema,
+                    "Raw": {"type": "object"},
+                    "PetIds": PetSchema,
+                },
+                "schemas-kwargs": {"PetIds": {"only": ["id"]}},
+            },
+        }
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def build(self, workers=1):
+        cache = SchemaCache(self.cache_path)
+        with patch.object(
+            builder_resolver,
+            "convert_schema",
+            wraps=builder_resolver.convert_schema,
+        ) as converter:
+            data = OasBuilder(
+                self.input,
+                deferred=DeferredRegistry(),
+                workers=workers,
+                schema_cache=cache,
+            ).get_data()
+        cache.save()
+        return data, [call.args[0] for call in converter.call_args_list]
+
+    def test_reused(self):
+        first, converted = self.build()
+        self.assertEqual(len(converted), 3)
+        self.assertTrue(os.path.exists(self.cache_path))
+        second, converted = self.build()
+        self.assertEqual(converted, [])
+        self.assertEqual(second, first)
+        self.assertEqual(
+            list(second["components"]["schemas"]),
+            list(first["components"]["schemas"]),
+        )
+
+    def test_changed_schema_converted(self):
+        self.build()
+        self.input["components"]["schemas-kwargs"]["PetIds"] = {
+            "only": ["name"]
+        }
+        _, converted = self.build()
+        self.assertEqual(converted, [PetSchema])
+
+    def test_workers(self):
+        # which of Pet and PetIds is suffixed depends on the key order of
+        # the merged input
+        del self.input["components"]["schemas"]["PetIds"]
+        self.build()
+        self.input["components"]["schemas"]["Label"] = LabelSchema
+        self.input["components"]["schemas"]["Note"] = NoteSchema
+        resolver = builder_resolver.ComponentResolver
+        with patch.object(
+            resolver,
+            "_ComponentResolver__convert_in_workers",
+            autospec=True,
+            side_effect=resolver._ComponentResolver__convert_in_workers,
+        ) as in_workers:
+            data, _ = self.build(workers=2)
+        # only the new schemas are sent to the workers
+        self.assertEqual(
+            {s for s, _ in in_workers.call_args.args[1]},
+            {LabelSchema, NoteSchema},
+        )
+        uncached = OasBuilder(self.input, deferred=DeferredRegistry())
+        self.assertEqual(data, uncached.get_data())
+
+    def test_unused_entries_dropped(self):
+        self.build()
+        del self.input["components"]["schemas"]["Tag"]
+        self.build()
+        self.input["components"]["schemas"]["Tag"] = TagSchema
+        _, converted = self.build()
+        self.assertEqual(converted, [TagSchema])
@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+from unittest import TestCase
+from flask import Flask
+
+from ..open_oas import OpenOas
+from ..open_oas._utils import ARTIFACT_VERSION, load_artifact, load_spec
+
+
+def make_app():
+    app: Flask = Flask(__name__)
+
+    @app.route("/users", methods=["POST"])
+    def users():
+        return ""
+
+    return app
+
+
+class TestSpecArtifact(TestCase):
+    def setUp(self) -> None:
+        self.app = make_app()
+        self.open_oas = OpenOas(
+            app=self.app,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        with self.app.app_context():
+            self.open_oas.build()
+        self.config = self.open_oas.config
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        try:
+            file_path = self.open_oas.config.oas_dir_path
+            if os.path.exists(file_path):
+                shutil.rmtree(file_path)
+        except:
+            pass
+
+        return super().tearDown()
+
+    def test_build_writes_artifact(self):
+        self.assertTrue(os.path.exists(self.config.final_artifact_path))
+        with open(self.config.final_artifact_path) as f:
+            artifact = json.load(f)
+        self.assertEqual(artifact["version"], ARTIFACT_VERSION)
+        self.assertIn("/users", artifact["data"]["paths"])
+
+    def test_load_prefers_artifact(self):
+        with open(self.config.final_artifact_path) as f:
+            artifact = json.load(f)
+        artifact["data"]["info"]["title"] = "From Artifact"
+        with open(self.config.final_artifact_path, "w") as f:
+            json.dump(artifact, f)
+
+        data = load_spec(
+            self.config.final_file_path, self.config.final_artifact_path
+        )
+        self.assertEqual(data["info"]["title"], "From Artifact")
+
+    def test_stale_artifact_ignored(self):
+        with open(self.config.final_file_path, "a") as f:
+            f.write("\nx-edited: true\n")
+
+        self.assertIsNone(
+            load_artifact(
+                self.config.final_artifact_path, self.config.final_file_path
+            )
+        )
+        data = load_spec(
+            self.config.final_file_path, self.config.final_artifact_path
+        )
+        self.assertTrue(data["x-edited"])
@@ -0,0 +1,124 @@
+import gzip
+import os
+import re
+import shutil
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from flask import Flask
+
+from ..open_oas import OpenOas, _assets
+from ..open_oas import __view
+
+# __view can't be named in a class body
+view_module = __view
+
+STATIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "open_oas", "static"
+)
+
+
+def read_static(filename: str) -> bytes:
+    with open(os.path.join(STATIC_DIR, filename), "rb") as f:
+        return f.read()
+
+
+class TestUiAssets(TestCase):
+    def setUp(self) -> None:
+        self.app = Flask(__name__)
+        self.app.config["TESTING"] = True
+        self.open_oas = OpenOas(
+            app=self.app,
+            config_data={
+                "OAS_DIR": "./test_oas",
+                "OAS_VALIDATE_ON_BUILD": False,
+            },
+        )
+        self.client = self.app.test_client()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree("./test_oas", ignore_errors=True)
+        return super().tearDown()
+
+    def asset_urls(self) -> dict:
+        html = self.client.get("/oas/oas-ui").data.decode()
+        return {
+            re.sub(r"\.[0-9a-f]{12}\.", ".", url.split("/")[-1]): url
+            for url in re.findall(r'"(/oas/assets/[^"]+)"', html)
+        }
+
+    def test_ui_page(self):
+        res = self.client.get("/oas/oas-ui")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(b'url: "/oas/oas-json"', res.data)
+        self.assertIn("swagger-ui-bundle.js", self.asset_urls())
+        res = self.client.get(
+            "/oas/oas-ui", headers={"If-None-Match": res.headers["ETag"]}
+        )
+        self.assertEqual(res.status_code, 304)
+
+    def test_ui_rendered_once(self):
+        self.client.get("/oas/oas-ui")
+        with patch.object(
+            view_module, "render_template"
+        ) as render, patch.object(view_module, "load_file") as load:
+            res = self.client.get("/oas/oas-ui")
+        self.assertEqual(res.status_code, 200)
+        render.assert_not_called()
+        load.assert_not_called()
+
+    def test_hashed_asset(self):
+        url = self.asset_urls()["swagger-ui-bundle.js"]
+        res = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res.headers["Vary"])
+        self.assertIn("immutable", res.headers["Cache-Control"])
+        self.assertIn("max-age=31536000", res.headers["Cache-Control"])
+        self.assertEqual(
+            gzip.decompress(res.data), read_static("swagger-ui-bundle.js")
+        )
+        res = self.client.get(
+            url,
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": res.headers["ETag"],
+            },
+        )
+        self.assertEqual(res.status_code, 304)
+
+    def test_brotli(self):
+        url = self.asset_urls()["swagger-ui.css"]
+        brotli = SimpleNamespace(compress=lambda data: b"br" + data[:8])
+        with patch.object(_assets, "_brotli", return_value=brotli):
+            res = self.client.get(
+                url, headers={"Accept-Encoding": "gzip, br"}
+            )
+        self.assertEqual(res.headers["Content-Encoding"], "br")
+        self.assertEqual(res.data, b"br" + read_static("swagger-ui.css")[:8])
+
+    def test_identity(self):
+        url = self.asset_urls()["swagger-ui.css"]
+        res = self.client.get(url, headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertEqual(res.data, read_static("swagger-ui.css"))
+
+    def test_images_not_compressed(self):
+        url = self.asset_urls()["favicon-32x32.png"]
+        res = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertEqual(res.mimetype, "image/png")
+
+    def test_unhashed_revalidated(self):
+        res = self.client.get("/oas/assets/swagger-ui.css.map")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("no-cache", res.headers["Cache-Control"])
+        self.assertIn("ETag", res.headers)
+
+    def test_unknown(self):
+        for name in ["missing.js", "swagger-ui.000000000000.css", "../x.py"]:
+            res = self.client.get("/oas/assets/" + name)
+            self.assertEqual(res.status_code, 404, name)
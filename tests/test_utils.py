@@ -1,5 +1,14 @@
+import os
+import shutil
 from unittest import TestCase
-from ..open_oas._utils import merge_recursive
+from unittest.mock import patch
+
+from ..open_oas import _utils
+from ..open_oas._utils import (
+    atomic_write,
+    file_lock,
+    merge_recursive,
+)
 
 
 class mergeDicts(TestCase):
@@ -49,3 +58,66 @@ class mergeDicts(TestCase):
         self.assertEqual(
             merge_recursive([d1, d2]), {1: {11: [111, 11], 12: [122, 12]}}
         )
+
+    def test_inputs_untouched(self):
+        d1 = {1: [4, 5], 2: {21: 1}}
+        d2 = {1: [1, 2, 3]}
+        merged = merge_recursive([d1, d2])
+        self.assertEqual(d2, {1: [1, 2, 3]})
+        merged[2][22] = 2
+        self.assertEqual(d1, {1: [4, 5], 2: {21: 1}})
+
+
+class TestFileWrites(TestCase):
+    def setUp(self) -> None:
+        self.dir = "./test_oas"
+        os.makedirs(self.dir, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_atomic_write(self):
+        path = os.path.join(self.dir, "final.yaml")
+        with atomic_write(path) as f:
+            f.write("a: 1")
+            self.assertFalse(os.path.exists(path))
+        with open(path) as f:
+            self.assertEqual(f.read(), "a: 1")
+        self.assertEqual(os.listdir(self.dir), ["final.yaml"])
+
+    def test_atomic_write_mode(self):
+        path = os.path.join(self.dir, "final.yaml")
+        # the umask is read once, writing never changes it
+        with patch.object(_utils, "_UMASK", 0o022), patch.object(
+            os, "umask", side_effect=AssertionError
+        ):
+            with atomic_write(path) as f:
+                f.write("a: 1")
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
+            # an existing file keeps its mode
+            os.chmod(path, 0o640)
+            with atomic_write(path) as f:
+                f.write("a: 2")
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        os.remove(path)
+        with patch.object(_utils, "_UMASK", 0o027):
+            with atomic_write(path) as f:
+                f.write("a: 3")
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+
+    def test_atomic_write_error(self):
+        path = os.path.join(self.dir, "final.yaml")
+        with self.assertRaises(ValueError):
+            with atomic_write(path) as f:
+                f.write("a: 1")
+                raise ValueError()
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_file_lock_reentrant(self):
+        lock = os.path.join(self.dir, ".lock")
+        with file_lock(lock):
+            with file_lock(lock):
+                pass
+        self.assertTrue(os.path.exists(lock))
@@ -0,0 +1,69 @@
+from copy import deepcopy
+import os
+import shutil
+from unittest import TestCase
+from unittest.mock import patch
+
+from ..open_oas import _validation
+from ..open_oas._validation import validate_spec_cached
+
+
+spec = {
+    "openapi": "3.0.2",
+    "info": {"title": "Title", "version": "1.0.0"},
+    "paths": {
+        "/users": {"get": {"responses": {"200": {"description": "OK"}}}},
+        "/groups": {"get": {"responses": {"200": {"description": "OK"}}}},
+    },
+    "components": {"schemas": {"User": {"type": "object"}}},
+}
+
+
+class TestValidationCache(TestCase):
+    def setUp(self) -> None:
+        self.dir = "./test_oas"
+        self.cache_path = os.path.join(self.dir, "validation.json")
+        os.makedirs(self.dir, exist_ok=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def validate(self, data):
+        with patch.object(
+            _validation, "validate_spec", wraps=_validation.validate_spec
+        ) as validator:
+            ran = validate_spec_cached(data, self.cache_path)
+        docs = [call.args[0] for call in validator.call_args_list]
+        return ran, docs
+
+    def test_unchanged_spec_skipped(self):
+        ran, _ = self.validate(spec)
+        self.assertTrue(ran)
+        ran, docs = self.validate(deepcopy(spec))
+        self.assertFalse(ran)
+        self.assertEqual(docs, [])
+
+    def test_changed_path_only(self):
+        self.validate(spec)
+        data = deepcopy(spec)
+        data["paths"]["/users"]["get"]["summary"] = "users"
+        ran, docs = self.validate(data)
+        self.assertTrue(ran)
+        self.assertEqual(list(docs[0]["paths"].keys()), ["/users"])
+        self.assertEqual(docs[0]["components"], spec["components"])
+
+    def test_changed_base_validates_all(self):
+        self.validate(spec)
+        data = deepcopy(spec)
+        data["info"]["title"] = "Other"
+        _, docs = self.validate(data)
+        self.assertEqual(docs[0], data)
+
+    def test_invalid_not_cached(self):
+        data = deepcopy(spec)
+        del data["info"]
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                validate_spec_cached(data, self.cache_path)
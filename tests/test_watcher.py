@@ -0,0 +1,349 @@
+import importlib
+import os
+import shutil
+import sys
+import time
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import patch
+
+from flask import Flask
+
+from ..open_oas import OpenOas
+from ..open_oas import open_oas as open_oas_module
+from ..open_oas._utils import load_file, yaml_dump
+from ..open_oas._watcher import Watcher, app_module_files, reload_modules
+from ..open_oas.builder.builder import OasBuilder
+from ..open_oas.decorators import Deferred, DeferredRegistry
+
+
+class TestWatcher(TestCase):
+    def setUp(self) -> None:
+        self.dir = "./test_oas"
+        os.makedirs(os.path.join(self.dir, "paths"), exist_ok=True)
+        self.file = os.path.join(self.dir, "paths", "users.yaml")
+        self.write(self.file, "a: 1")
+        self.calls = []
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.watcher.stop()
+        self.thread.join()
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+        # coarse mtime resolution on some filesystems
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**7))
+
+    def start(self, callback=None):
+        self.watcher = Watcher(
+            [self.dir],
+            callback or self.calls.append,
+            interval=0.01,
+            debounce=0.1,
+        )
+        self.thread = Thread(target=self.watcher.run)
+        self.thread.start()
+        time.sleep(0.05)
+
+    def wait_calls(self, count, timeout=2):
+        end = time.monotonic() + timeout
+        while len(self.calls) < count and time.monotonic() < end:
+            time.sleep(0.01)
+
+    def test_debounced_changes(self):
+        self.start()
+        other = os.path.join(self.dir, "overrides.yaml")
+        self.write(self.file, "a: 2")
+        self.write(other, "b: 1")
+        self.wait_calls(1)
+        time.sleep(0.2)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(
+            self.calls[0], {os.path.abspath(self.file), os.path.abspath(other)}
+        )
+
+    def test_ignored_files(self):
+        self.start()
+        self.write(os.path.join(self.dir, "notes.txt"), "x")
+        os.makedirs(os.path.join(self.dir, ".hidden"))
+        self.write(os.path.join(self.dir, ".hidden", "a.yaml"), "x")
+        time.sleep(0.3)
+        self.assertEqual(self.calls, [])
+
+    def test_hidden_files(self):
+        self.start()
+        hidden = os.path.join(self.dir, "paths", ".users.yaml")
+        self.write(hidden, "x")
+        self.wait_calls(1)
+        self.assertEqual(self.calls, [{os.path.abspath(hidden)}])
+
+    def test_callback_writes_ignored(self):
+        def callback(changed):
+            self.calls.append(changed)
+            self.write(self.file, "written by the build")
+
+        self.start(callback)
+        self.write(self.file, "a: 2")
+        self.wait_calls(1)
+        time.sleep(0.3)
+        self.assertEqual(len(self.calls), 1)
+
+
+DECLARATIONS = """
+from marshmallow import Schema, fields
+from {package}.open_oas.decorators import path_response
+
+
+class User(Schema):
+    name = fields.Str()
+
+
+path_response(User, ["/users"], ["get"], codes=[{code}])
+"""
+
+VIEWS = """
+from flask import Blueprint
+from {package}.open_oas.decorators import path_response
+
+bp = Blueprint("watched", __name__)
+
+
+@bp.route("{rule}")
+@path_response({{"type": "string"}}, ["/users"], ["get"], codes=[{code}])
+def users():
+    return ""
+"""
+
+SCHEMAS = """
+from marshmallow import Schema, fields
+
+
+class User(Schema):
+    {field} = fields.Str()
+"""
+
+DEPENDENT = """
+from watched_schemas import User
+from {package}.open_oas.decorators import path_response
+
+path_response(User, ["/users"], ["get"], codes=[200])
+"""
+
+
+class TestReloadModules(TestCase):
+    def setUp(self) -> None:
+        self.dir = os.path.abspath("./test_oas")
+        os.makedirs(self.dir, exist_ok=True)
+        sys.path.insert(0, self.dir)
+        self.registry = DeferredRegistry()
+        self.package = __name__.split(".")[0]
+        self.mtime = 0
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.dir)
+        for name in list(sys.modules):
+            if name.startswith("watched_"):
+                del sys.modules[name]
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def write_module(self, name, template, **values):
+        path = os.path.join(self.dir, name + ".py")
+        with open(path, "w") as f:
+            f.write(template.format(package=self.package, **values))
+        # reload checks the source mtime
+        self.mtime += 1
+        st = os.stat(path)
+        os.utime(
+            path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9 * self.mtime)
+        )
+        importlib.invalidate_caches()
+        return path
+
+    def import_module(self, name):
+        with Deferred.scope(self.registry):
+            return importlib.import_module(name)
+
+    def responses(self):
+        data = OasBuilder(
+            {"info": {"title": "t", "version": "1"}}, deferred=self.registry
+        ).get_data()
+        return (
+            list(data["paths"]["/users"]["get"]["responses"]),
+            list(data.get("components", {}).get("schemas", {})),
+        )
+
+    def test_declarations_replaced(self):
+        path = self.write_module(
+            "watched_declarations", DECLARATIONS, code=200
+        )
+        self.import_module("watched_declarations")
+        self.registry.append(("api_tag", ("kept",), {}))
+        self.assertEqual(self.responses(), (["200"], ["User"]))
+
+        self.write_module("watched_declarations", DECLARATIONS, code=201)
+        reloaded, outdated = reload_modules([path], self.registry)
+        self.assertEqual((reloaded, outdated), (["watched_declarations"], []))
+        self.assertEqual(self.responses(), (["201"], ["User"]))
+        self.assertEqual(
+            [entry[0] for entry in self.registry], ["api_tag", "path_response"]
+        )
+
+    def test_dependents_reloaded(self):
+        path = self.write_module("watched_schemas", SCHEMAS, field="name")
+        self.write_module("watched_dependent", DEPENDENT, field="")
+        self.import_module("watched_dependent")
+
+        self.write_module("watched_schemas", SCHEMAS, field="email")
+        reloaded, outdated = reload_modules([path], self.registry)
+        self.assertEqual(
+            (reloaded, outdated),
+            (["watched_schemas", "watched_dependent"], []),
+        )
+        ((_, _, kwargs),) = list(self.registry)
+        self.assertIn("email", kwargs["schema"]._declared_fields)
+
+    def views_app(self):
+        self.write_module("watched_views", VIEWS, rule="/users", code=200)
+        app = Flask(__name__)
+        app.register_blueprint(self.import_module("watched_views").bp)
+        return app
+
+    def test_route_module_executed(self):
+        app = self.views_app()
+        view = app.view_functions["watched.users"]
+        path = self.write_module("watched_views", VIEWS, rule="/users", code=201)
+        reloaded, outdated = reload_modules([path], self.registry, app)
+        self.assertEqual((reloaded, outdated), (["watched_views"], []))
+        self.assertEqual(self.responses()[0], ["201"])
+        # the app keeps its views
+        self.assertIs(app.view_functions["watched.users"], view)
+        self.assertEqual(len(list(app.url_map.iter_rules())), 2)
+
+    def test_changed_routes_outdated(self):
+        app = self.views_app()
+        path = self.write_module("watched_views", VIEWS, rule="/people", code=200)
+        reloaded, outdated = reload_modules([path], self.registry, app)
+        self.assertEqual((reloaded, outdated), ([], ["watched_views"]))
+        self.assertEqual(
+            [rule.rule for rule in app.url_map.iter_rules("watched.users")],
+            ["/users"],
+        )
+
+    def test_app_module_files(self):
+        venv = os.path.join(self.dir, "myvenv", "lib", "site-packages")
+        os.makedirs(venv)
+        sys.path.insert(0, venv)
+        try:
+            self.write_module("myvenv/lib/site-packages/watched_installed", "")
+            self.write_module("watched_local", "")
+            importlib.import_module("watched_installed")
+            importlib.import_module("watched_local")
+        finally:
+            sys.path.remove(venv)
+        files = app_module_files(self.dir)
+        self.assertEqual(files, [os.path.join(self.dir, "watched_local.py")])
+
+
+class TestWatchCommand(TestCase):
+    def setUp(self) -> None:
+        self.dir = os.path.abspath("./test_oas")
+        os.makedirs(self.dir, exist_ok=True)
+        self.registry = DeferredRegistry()
+        self.app = Flask(__name__)
+
+        @self.app.route("/users")
+        def users():
+            return ""
+
+        self.open_oas = OpenOas(
+            app=self.app,
+            config_data={"OAS_DIR": self.dir, "OAS_VALIDATE_ON_BUILD": False},
+            deferred=self.registry,
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        return super().tearDown()
+
+    def watch(self, *changes):
+        test = self
+
+        class FakeWatcher:
+            def __init__(self, paths, callback, **kwargs):
+                test.watched = paths()
+                self.callback = callback
+
+            def run(self):
+                for changed in changes:
+                    self.callback(changed() if callable(changed) else changed)
+
+        with patch.object(
+            open_oas_module, "Watcher", FakeWatcher
+        ), patch.object(
+            self.open_oas, "build", wraps=self.open_oas.build
+        ) as build, patch(
+            "os.execve"
+        ) as execve:
+            result = self.app.test_cli_runner().invoke(
+                args=["oas", "watch", "--path", "extra"]
+            )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertNotIn("Build failed", result.output)
+        self.execve = execve
+        return build.call_count, execve.call_count
+
+    def test_watched_files(self):
+        self.watch()
+        self.assertIn(self.open_oas.config.overrides_dir_path, self.watched)
+        self.assertIn(os.path.abspath(__file__), self.watched)
+        self.assertIn("extra", self.watched)
+        self.assertNotIn(self.app.root_path, self.watched)
+
+    def test_rebuild_in_process(self):
+        overrides = os.path.join(self.dir, "overrides.yaml")
+        self.assertEqual(self.watch({overrides}, {overrides}), (3, 0))
+
+    def test_editor_reused(self):
+        overrides = os.path.join(self.dir, "overrides.yaml")
+        editors = []
+
+        def fragment():
+            editors.append(self.open_oas._editor)
+            file_ = os.path.join(
+                self.open_oas.config.paths_dir_path, ".users.yaml"
+            )
+            data = load_file(file_)
+            data["paths"]["/users"]["get"]["summary"] = "edited"
+            yaml_dump("", data, file_)
+            return {file_}
+
+        self.watch({overrides}, fragment)
+        editor = self.open_oas._editor
+        self.assertIs(editors[0], editor)
+        # the same templates as a full sync
+        with self.app.app_context():
+            self.open_oas.build()
+        self.assertIsNot(self.open_oas._editor, editor)
+        self.assertEqual(
+            self.open_oas._editor.template_data, editor.template_data
+        )
+
+    def test_route_module_restarts(self):
+        # this module declares the /users view
+        views = sys.modules[__name__].__file__
+        overrides = os.path.join(self.dir, "overrides.yaml")
+        self.assertEqual(self.watch({views}, {overrides}), (2, 1))
+        executable, argv, env = self.execve.call_args[0]
+        self.assertEqual(
+            argv[1:],
+            ["-m", "flask", "oas", "watch", "--interval", "0.2"]
+            + ["--debounce", "0.3", "--path", "extra"],
+        )